@@ -0,0 +1,161 @@
+# benchmarks/bench_pipeline.py
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # POSIX only; peak RSS is not reported on Windows.
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import ortools
+from src.data_manager.datasets import SAMPLE_DATA_DIR, load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.calculator.cost_calculator import calculate_fleet_costs, compute_route_metrics
+from src.calculator.schedule_generator import build_schedule_frame
+from src.optimizer.settings import DEFAULT_MAX_CLUSTER_SIZE, solve_mode
+from src.optimizer.vrp_solver import solve_routes
+
+# name -> (farms, markets, trucks); None means the bundled 16-node sample in data/. Fleets are sized so the
+# synthetic demand (about 1.5 t per market) fits.
+INSTANCES = {
+    'tiny': None,
+    'small': (4, 100, 20),
+    'medium': (10, 500, 100),
+    'large': (20, 2000, 400),
+    'xlarge': (20, 5000, 1000),
+}
+DEFAULT_INSTANCES = ['tiny', 'small', 'medium']
+DEFAULT_BUDGETS = [2, 10]
+# Timings below this many seconds are too noisy to call a regression.
+NOISE_FLOOR_SECONDS = 0.05
+# Solves run for their whole time budget, so only their objectives are compared, not their timings.
+FIXED_BUDGET_STAGE = 'solve@'
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+@contextmanager
+def stage(results, name):
+    """Records wall time and peak traced Python allocations (MB) of the enclosed block under `name`."""
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    yield
+    results[name] = {'seconds': round(time.perf_counter() - start, 4),
+                     'peak_mb': round(tracemalloc.get_traced_memory()[1] / 1e6, 2)}
+
+
+def prepare_instance(name, seed, work_dir):
+    if INSTANCES[name] is None:
+        return SAMPLE_DATA_DIR
+    num_farms, num_markets, num_trucks = INSTANCES[name]
+    out_dir = os.path.join(work_dir, name)
+    generate_dataset(out_dir, num_farms, num_markets, num_trucks, seed=seed)
+    return out_dir
+
+
+def run_instance(name, budgets, seed, work_dir):
+    """Times the path the dashboard and the service take: load_dataset, solve_routes, then route metrics,
+    fleet costs and the schedule frame."""
+    data_dir = prepare_instance(name, seed, work_dir)
+    stages = {}
+    with stage(stages, 'load'):
+        (farms, markets, trucks, road_network), config = load_dataset(data_dir)
+
+    mode = solve_mode(len(markets))
+    objectives, solution = {}, None
+    for budget in budgets:
+        time_limit = budget
+        if mode == 'clustered':
+            # The per-cluster limit is scaled so the whole solve gets the stated budget on one worker.
+            groups = -(-len(markets) // DEFAULT_MAX_CLUSTER_SIZE)
+            time_limit = max(1, budget // min(groups, len(trucks)))
+        with stage(stages, f'{FIXED_BUDGET_STAGE}{budget}s'):
+            solution = solve_routes(markets, trucks, road_network, farms, mode, time_limit, max_workers=1)
+        objectives[str(budget)] = None if solution.get('error') else round(solution['total_distance'], 2)
+
+    if solution and not solution.get('error'):
+        with stage(stages, 'costs'):
+            route_metrics = compute_route_metrics(solution, road_network)
+            calculate_fleet_costs(route_metrics, trucks, config.get_variable_costs())
+        with stage(stages, 'schedules'):
+            build_schedule_frame(solution, road_network, markets, farms)
+
+    return {'instance': name, 'num_farms': len(farms), 'num_markets': len(markets), 'num_trucks': len(trucks),
+            'mode': mode, 'stages': stages, 'objective_km': objectives}
+
+
+def compare(results, baseline, time_tolerance, objective_tolerance):
+    """Lists regressions of `results` against `baseline`: slower stages (solves excepted) and worse objectives."""
+    previous = {r['instance']: r for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        before = previous.get(result['instance'])
+        if before is None:
+            continue
+        for name, timing in result['stages'].items():
+            if name.startswith(FIXED_BUDGET_STAGE):
+                continue
+            old = before['stages'].get(name)
+            if old and timing['seconds'] - old['seconds'] > max(NOISE_FLOOR_SECONDS, old['seconds'] * time_tolerance):
+                regressions.append(f"{result['instance']}/{name}: {old['seconds']:.3f}s -> {timing['seconds']:.3f}s")
+        for budget, objective in result['objective_km'].items():
+            old = before['objective_km'].get(budget)
+            if old is not None and (objective is None or objective > old * (1 + objective_tolerance)):
+                regressions.append(f"{result['instance']}/objective@{budget}s: {old:,.2f} -> {objective} km")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time load -> solve -> costs -> schedules on synthetic instances.")
+    parser.add_argument('--instances', nargs='+', default=DEFAULT_INSTANCES, choices=list(INSTANCES))
+    parser.add_argument('--budgets', nargs='+', type=int, default=DEFAULT_BUDGETS, help="Solver time limits (s)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Results file to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help="Allowed relative slowdown per stage")
+    parser.add_argument('--objective-tolerance', type=float, default=0.02, help="Allowed relative objective increase")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    results = {
+        'meta': {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                 'numpy': np.__version__, 'ortools': ortools.__version__, 'cpu_count': os.cpu_count(),
+                 'machine': platform.machine(), 'seed': args.seed, 'budgets': args.budgets},
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='opsdash_bench_') as work_dir:
+        for name in args.instances:
+            result = run_instance(name, args.budgets, args.seed, work_dir)
+            results['results'].append(result)
+            timings = '  '.join(f"{k}={v['seconds']:.3f}s/{v['peak_mb']:.1f}MB" for k, v in result['stages'].items())
+            print(f"{name:<7} {result['num_markets']:>5} markets  {timings}  objective_km={result['objective_km']}")
+    if resource is not None:
+        results['meta']['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results -> {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline -> {args.baseline}")
+    elif os.path.exists(args.baseline):
+        regressions = compare(results, json.load(open(args.baseline)), args.time_tolerance, args.objective_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
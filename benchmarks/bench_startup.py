@@ -0,0 +1,77 @@
+# benchmarks/bench_startup.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = {
+    'home': 'src/1_Home.py',
+    'optimizer': 'src/pages/2_Transportation_Optimizer.py',
+    'inventory': 'src/pages/3_Inventory_Optimization.py',
+}
+# Heavy modules whose import is reported per page; a page that does not need one should not load it.
+HEAVY_MODULES = ['ortools', 'folium', 'scipy']
+
+
+def run_page(page, reruns):
+    """Runs `page` once cold (first script run in this process, imports included) and then `reruns` more times."""
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=300)
+    start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - start
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    rerun_times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        rerun_times.append(time.perf_counter() - start)
+    return {'cold_s': round(cold, 4), 'reruns_s': [round(t, 4) for t in rerun_times], 'heavy_imports': loaded,
+            'exceptions': [str(e.value) for e in app.exception]}
+
+
+def measure(page, processes, reruns):
+    # Every cold sample is a fresh interpreter, so module imports and process-wide caches start empty.
+    samples = []
+    for _ in range(processes):
+        output = subprocess.run([sys.executable, __file__, '--worker', page, '--reruns', str(reruns)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    reruns_s = [t for sample in samples for t in sample['reruns_s']]
+    return {'page': page, 'cold_median_s': round(statistics.median(s['cold_s'] for s in samples), 4),
+            'rerun_median_s': round(statistics.median(reruns_s), 4) if reruns_s else None,
+            'heavy_imports': samples[-1]['heavy_imports'], 'exceptions': samples[-1]['exceptions']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start and rerun latency of the Streamlit pages.")
+    parser.add_argument('--pages', nargs='+', default=list(PAGES), choices=list(PAGES))
+    parser.add_argument('--processes', type=int, default=3, help="Fresh interpreters per page (cold samples)")
+    parser.add_argument('--reruns', type=int, default=5, help="Reruns per process after the cold run")
+    parser.add_argument('--output', default=None, help="Also write the results as JSON")
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker, args.reruns)))
+        return
+
+    results = []
+    for page in args.pages:
+        result = measure(page, args.processes, args.reruns)
+        results.append(result)
+        print(f"{page:<10} cold={result['cold_median_s']:.3f}s  rerun={result['rerun_median_s'] or 0:.3f}s  "
+              f"imports={','.join(result['heavy_imports']) or '-'}  exceptions={len(result['exceptions'])}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# scripts/convert_road_network.py
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_manager.network_stream import ingest_json_network
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a JSON road network matrix into the memory-mapped binary store.")
+    parser.add_argument('input', nargs='?', default='data/road_network_matrix.json', help="Source JSON matrix")
+    parser.add_argument('output', nargs='?', default='data/road_network', help="Destination store directory")
+    args = parser.parse_args()
+
+    def report(fraction: float, message: str):
+        print(f"\r[{fraction:6.1%}] {message:<40}", end='', flush=True)
+
+    start = time.perf_counter()
+    with open(args.input, 'rb') as f:
+        network = ingest_json_network(f, out_dir=args.output, progress=report)
+    print()
+    print(f"Converted {len(network)} locations -> {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
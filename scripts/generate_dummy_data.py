@@ -1,12 +1,19 @@
 # scripts/generate_dummy_data.py
+import argparse
+import sys
 import pandas as pd
+import numpy as np
 import json
 from faker import Faker
 import random
 import os
-import math
 from datetime import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_manager.synthetic_data import generate_dataset
+from src.models.spatial_index import haversine_km
+
 print("--- Starting Dummy Data Generation ---")
 
 # --- Configuration ---
@@ -16,20 +23,8 @@ NUM_TRUCKS = 3
 DATA_DIR = 'data'
 
 # --- Setup ---
-os.makedirs(DATA_DIR, exist_ok=True)
 fake = Faker('en_US')
 
-# --- Helper Functions ---
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points on Earth in kilometers."""
-    R = 6371  # Radius of Earth
-    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
-
 # --- Data Generation Functions ---
 def generate_farms(num_farms):
     data = []
@@ -76,20 +71,14 @@ def generate_trucks(num_trucks, depot_ids):
 
 def generate_road_network_matrix(locations_df):
     ids = locations_df['id'].tolist()
-    coords = {row['id']: (row['latitude'], row['longitude']) for _, row in locations_df.iterrows()}
-    matrix = {}
-    for origin_id in ids:
-        matrix[origin_id] = {}
-        for dest_id in ids:
-            if origin_id == dest_id:
-                matrix[origin_id][dest_id] = {'distance': 0, 'time': 0}
-                continue
-            lat1, lon1 = coords[origin_id]
-            lat2, lon2 = coords[dest_id]
-            distance_km = haversine_distance(lat1, lon1, lat2, lon2) * 1.3
-            time_minutes = round((distance_km / random.uniform(50, 70)) * 60)
-            matrix[origin_id][dest_id] = {'distance': round(distance_km, 2), 'time': time_minutes}
-    return matrix
+    lat, lon = locations_df['latitude'].to_numpy(), locations_df['longitude'].to_numpy()
+    distance_km = np.round(haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :]) * 1.3, 2)
+    time_minutes = np.rint(distance_km / np.random.default_rng(random.getrandbits(32)).uniform(50, 70, distance_km.shape) * 60)
+    return {
+        origin_id: {dest_id: {'distance': float(distance_km[i, j]), 'time': int(time_minutes[i, j])}
+                    for j, dest_id in enumerate(ids)}
+        for i, origin_id in enumerate(ids)
+    }
 
 def generate_config():
     return {
@@ -98,29 +87,68 @@ def generate_config():
       "optimization_constraints": {"max_driving_hours_per_day": 10, "penalty_late_delivery_per_minute": 5.0}
     }
 
-# --- Main Execution ---
-if __name__ == "__main__":
-    farms_df = generate_farms(NUM_FARMS)
-    farms_df.to_csv(os.path.join(DATA_DIR, 'farms.csv'), index=False)
-    print(f"Generated {len(farms_df)} farms -> data/farms.csv")
+def generate_at_scale(args):
+    def report(fraction):
+        print(f"\r[{fraction:6.1%}] writing road network store", end='', flush=True)
+
+    farms_df, markets_df, trucks_df = generate_dataset(args.out_dir, args.farms, args.markets, args.trucks,
+                                                       seed=args.seed, block_rows=args.block_rows, progress=report)
+    print()
+    print(f"Generated {len(farms_df)} farms, {len(markets_df)} markets, {len(trucks_df)} trucks -> {args.out_dir}")
+    print(f"Generated binary road network store -> {os.path.join(args.out_dir, 'road_network')}")
+    write_config(args.out_dir)
+
 
-    markets_df = generate_markets(NUM_MARKETS)
-    markets_df.to_csv(os.path.join(DATA_DIR, 'markets.csv'), index=False)
-    print(f"Generated {len(markets_df)} markets -> data/markets.csv")
+def write_config(out_dir):
+    path = os.path.join(out_dir, 'config.json')
+    with open(path, 'w') as f:
+        json.dump(generate_config(), f, indent=4)
+    print(f"Generated config file -> {path}")
 
-    trucks_df = generate_trucks(NUM_TRUCKS, depot_ids=farms_df['id'].tolist())
-    trucks_df.to_csv(os.path.join(DATA_DIR, 'trucks.csv'), index=False)
-    print(f"Generated {len(trucks_df)} trucks -> data/trucks.csv")
+
+def generate_small(args):
+    out_dir = args.out_dir
+    farms_df = generate_farms(args.farms)
+    farms_df.to_csv(os.path.join(out_dir, 'farms.csv'), index=False)
+    print(f"Generated {len(farms_df)} farms -> {os.path.join(out_dir, 'farms.csv')}")
+
+    markets_df = generate_markets(args.markets)
+    markets_df.to_csv(os.path.join(out_dir, 'markets.csv'), index=False)
+    print(f"Generated {len(markets_df)} markets -> {os.path.join(out_dir, 'markets.csv')}")
+
+    trucks_df = generate_trucks(args.trucks, depot_ids=farms_df['id'].tolist())
+    trucks_df.to_csv(os.path.join(out_dir, 'trucks.csv'), index=False)
+    print(f"Generated {len(trucks_df)} trucks -> {os.path.join(out_dir, 'trucks.csv')}")
 
     all_locations_df = pd.concat([farms_df[['id', 'latitude', 'longitude']], markets_df[['id', 'latitude', 'longitude']]])
     road_network = generate_road_network_matrix(all_locations_df)
-    with open(os.path.join(DATA_DIR, 'road_network_matrix.json'), 'w') as f:
+    with open(os.path.join(out_dir, 'road_network_matrix.json'), 'w') as f:
         json.dump(road_network, f, indent=4)
-    print("Generated road network matrix -> data/road_network_matrix.json")
+    print(f"Generated road network matrix -> {os.path.join(out_dir, 'road_network_matrix.json')}")
+    write_config(out_dir)
+
 
-    config_data = generate_config()
-    with open(os.path.join(DATA_DIR, 'config.json'), 'w') as f:
-        json.dump(config_data, f, indent=4)
-    print("Generated config file -> data/config.json")
+# --- Main Execution ---
+def main():
+    parser = argparse.ArgumentParser(description="Generate sample farms, markets, trucks and a road network.")
+    parser.add_argument('--farms', type=int, default=NUM_FARMS)
+    parser.add_argument('--markets', type=int, default=NUM_MARKETS)
+    parser.add_argument('--trucks', type=int, default=NUM_TRUCKS)
+    parser.add_argument('--binary', action='store_true',
+                        help="Seeded NumPy generator that writes the road network straight to the binary store; "
+                             "use this for thousands of locations")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for --binary mode")
+    parser.add_argument('--block-rows', type=int, default=512, help="Matrix rows computed per block in --binary mode")
+    parser.add_argument('--out-dir', default=DATA_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    if args.binary:
+        generate_at_scale(args)
+    else:
+        generate_small(args)
+    print("--- Dummy Data Generation Complete! ---")
 
-    print("--- Dummy Data Generation Complete! ---")
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# scripts/route_service.py
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.data_models import MarketDelta
+from src.service.jobs import DEFAULT_MAX_QUEUED
+from src.service.pipeline import JobRequest, run_pipeline
+from src.service.server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+
+def build_request(args) -> JobRequest:
+    return JobRequest(
+        data_dir=args.data_dir if not args.dataset_id else None, dataset_id=args.dataset_id,
+        truck_ids=args.trucks, mode=args.mode, time_limit=args.time_limit,
+        enforce_time_windows=args.time_windows, include_schedules=not args.no_schedules,
+        use_cache=not args.no_cache, cost_overrides=dict(args.rate or []), delta=load_delta(args.delta),
+        demand_scenarios=args.demand_scenarios,
+    )
+
+
+def load_delta(path):
+    if not path:
+        return None
+    with open(path) as f:
+        return MarketDelta(**json.load(f))
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method='POST',
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def submit(args, request: JobRequest):
+    # Client of a running `serve`: submit, then long-poll until the job settles.
+    base = args.url.rstrip('/')
+    try:
+        job = post_json(f"{base}/jobs", request.model_dump(exclude_none=True))
+    except urllib.error.HTTPError as e:
+        sys.exit(f"Submit failed ({e.code}): {e.read().decode()}")
+    print(f"Submitted job {job['job_id']} ({job['status']})", file=sys.stderr)
+    while True:
+        with urllib.request.urlopen(f"{base}/jobs/{job['job_id']}?wait=30") as response:
+            job = json.load(response)
+        if job['status'] not in ('queued', 'running'):
+            return job
+
+
+def write_output(payload, path):
+    text = json.dumps(payload, indent=2, default=str)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text)
+        print(f"Result -> {path}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def parse_rate(value):
+    key, _, rate = value.partition('=')
+    return key, float(rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the routing pipeline without the dashboard, "
+                                                 "or serve it as a local HTTP/JSON job API.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    job_parser = argparse.ArgumentParser(add_help=False)
+    job_parser.add_argument('--data-dir', default='data', help="Directory with farms/markets/trucks CSVs and network")
+    job_parser.add_argument('--dataset-id', help="Content hash of a dataset registered with the server (submit only)")
+    job_parser.add_argument('--trucks', nargs='+', help="Active truck ids (default: all)")
+    job_parser.add_argument('--mode', choices=['auto', 'single_depot', 'multi_depot', 'clustered'], default='auto')
+    job_parser.add_argument('--time-limit', type=int, default=JobRequest.model_fields['time_limit'].default)
+    job_parser.add_argument('--time-windows', action='store_true', help="Enforce time windows and driver hours")
+    job_parser.add_argument('--rate', type=parse_rate, action='append', metavar='NAME=VALUE',
+                            help="Override a variable cost rate, e.g. fuel_cost_per_liter=1.9")
+    job_parser.add_argument('--no-schedules', action='store_true')
+    job_parser.add_argument('--no-cache', action='store_true', help="Always solve; skip the shared solution cache")
+    job_parser.add_argument('--delta', help="JSON file of intra-day market changes to repair the solution for "
+                                            '({"demand_changes": {id: kg}, "added": [markets], "removed": [ids]})')
+    job_parser.add_argument('--demand-scenarios', type=int, default=0,
+                            help="Also simulate this many random demand draws per market against the routes")
+    job_parser.add_argument('--output', help="Write the JSON result here instead of stdout")
+
+    commands.add_parser('run', parents=[job_parser], help="Run one job in this process")
+    submit_parser = commands.add_parser('submit', parents=[job_parser], help="Run one job on a running server")
+    submit_parser.add_argument('--url', default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+    serve_parser = commands.add_parser('serve', help="Start the HTTP/JSON job API")
+    serve_parser.add_argument('--host', default=DEFAULT_HOST)
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core)")
+    serve_parser.add_argument('--max-queued', type=int, default=DEFAULT_MAX_QUEUED,
+                              help="Jobs allowed to wait for a worker before submissions get HTTP 429")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    # Metrics events go to OPSDASH_METRICS_LOG when set, not to the console.
+    logging.getLogger('opsdash.metrics').propagate = False
+
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers, args.max_queued)
+        return
+    request = build_request(args)
+    start = time.perf_counter()
+    if args.command == 'run':
+        # Solves may fan out across cores here: this process is the only job.
+        result = run_pipeline(request, max_workers=None)
+    else:
+        job = submit(args, request)
+        if job['status'] != 'done':
+            sys.exit(f"Job {job['job_id']} {job['status']}: {job.get('error', '')}")
+        result = job['result']
+    solution = result['solution']
+    summary = "error: " + solution['error'] if solution.get('error') else \
+        f"{len(solution['routes'])} routes, {solution['total_distance']:,.1f} km, " \
+        f"${result['costs']['summary']['total_overall_cost']:,.2f}"
+    print(f"{result.get('mode', '-')}: {summary} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    write_output(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# scripts/run_scenario_sweep.py
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_manager import input_loader
+from src.data_manager.config_manager import ConfigManager
+from src.data_manager.network_store import is_network_store
+from src.optimizer.scenario_sweep import ScenarioGrid, run_sweep
+from src.optimizer.solution_cache import SolutionCache
+
+
+def truck_subsets(truck_ids, mode):
+    if mode == 'all':
+        return [truck_ids]
+    if mode == 'leave-one-out':
+        return [truck_ids] + [[t for t in truck_ids if t != removed] for removed in truck_ids]
+    return [list(c) for size in range(1, len(truck_ids) + 1) for c in itertools.combinations(truck_ids, size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a grid of what-if scenarios and write a Parquet table.")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--grid', help="JSON file with a ScenarioGrid; overrides the grid flags below")
+    parser.add_argument('--subsets', choices=['all', 'leave-one-out', 'power-set'], default='leave-one-out')
+    parser.add_argument('--fuel-prices', type=float, nargs='*', default=[])
+    parser.add_argument('--maintenance-rates', type=float, nargs='*', default=[])
+    parser.add_argument('--wage-rates', type=float, nargs='*', default=[])
+    parser.add_argument('--time-limits', type=int, nargs='*', default=[10])
+    parser.add_argument('--multi-depot', choices=['off', 'on', 'both'], default='off')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='data/scenario_results.parquet')
+    args = parser.parse_args()
+
+    markets = input_loader.load_markets(os.path.join(args.data_dir, 'markets.csv'))
+    trucks = input_loader.load_trucks(os.path.join(args.data_dir, 'trucks.csv'))
+    store_path = os.path.join(args.data_dir, 'road_network')
+    road_network = input_loader.load_road_network(
+        store_path if is_network_store(store_path) else os.path.join(args.data_dir, 'road_network_matrix.json'))
+    config = ConfigManager(os.path.join(args.data_dir, 'config.json'))
+
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            grid = ScenarioGrid(**json.load(f))
+    else:
+        grid = ScenarioGrid(
+            truck_subsets=truck_subsets([t.id for t in trucks], args.subsets),
+            fuel_cost_per_liter=args.fuel_prices, maintenance_cost_per_km=args.maintenance_rates,
+            driver_wage_per_hour=args.wage_rates, time_limits=args.time_limits,
+            multi_depot={'off': [False], 'on': [True], 'both': [False, True]}[args.multi_depot],
+        )
+
+    start = time.perf_counter()
+    results = run_sweep(grid, markets, trucks, road_network, config, args.workers, SolutionCache())
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    results.to_parquet(args.output, index=False)
+    print(f"Solved {len(results)} scenarios in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
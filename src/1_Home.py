@@ -1,10 +1,32 @@
 # src/1_Home.py
 import streamlit as st
-import pandas as pd
-import json
+import hashlib
+import os
+import tempfile
+from src.data_manager.network_store import is_network_store
+from src.data_manager.network_stream import ingest_json_network
+from src.data_manager.bulk_validation import validate_csv
+from src.models.data_models import Farm, Market, Truck
 
 st.set_page_config(layout="wide", page_title="OpsDash Home")
 
+NETWORK_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'opsdash_networks')
+
+
+def ingest_uploaded_network(uploaded_file) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: uploaded_file.read(1 << 20), b''):
+        digest.update(chunk)
+    out_dir = os.path.join(NETWORK_CACHE_DIR, digest.hexdigest())
+    if not is_network_store(out_dir):
+        progress_bar = st.progress(0.0, text="Ingesting road network...")
+        uploaded_file.seek(0)
+        ingest_json_network(uploaded_file, out_dir=out_dir,
+                            progress=lambda fraction, message: progress_bar.progress(fraction, text=message))
+        progress_bar.empty()
+    return out_dir
+
+
 st.title("📈 Operations & Strategy Dashboard")
 st.markdown("""
 Welcome! This tool is designed to turn raw operational data into actionable strategic insights.
@@ -28,12 +50,22 @@ uploaded_trucks = col3.file_uploader("Upload Trucks CSV", type="csv")
 uploaded_network = col4.file_uploader("Upload Road Network JSON", type="json")
 
 if uploaded_farms and uploaded_markets and uploaded_trucks and uploaded_network:
-    st.session_state['farms_df'] = pd.read_csv(uploaded_farms)
-    st.session_state['markets_df'] = pd.read_csv(uploaded_markets)
-    st.session_state['trucks_df'] = pd.read_csv(uploaded_trucks)
-    st.session_state['network_dict'] = json.load(uploaded_network)
-    st.session_state['data_loaded'] = True
-    st.success("Custom data loaded! Navigate to other pages for analysis.")
+    uploads = {'farms': (uploaded_farms, Farm), 'markets': (uploaded_markets, Market), 'trucks': (uploaded_trucks, Truck)}
+    results = {kind: validate_csv(uploaded.getvalue(), model) for kind, (uploaded, model) in uploads.items()}
+    invalid = {kind: result.errors for kind, result in results.items() if not result.errors.empty}
+    if invalid:
+        st.session_state['data_loaded'] = False
+        for kind, errors in invalid.items():
+            st.error(f"{kind.capitalize()} CSV has {len(errors)} invalid value(s); fix them and upload again.")
+            st.dataframe(errors, hide_index=True)
+    else:
+        # The validated records are kept as-is; pages reuse them instead of re-validating on every rerun.
+        for kind, result in results.items():
+            st.session_state[f'{kind}_records'] = result.records
+            st.session_state[f'{kind}_df'] = result.records.to_frame()
+        st.session_state['network_path'] = ingest_uploaded_network(uploaded_network)
+        st.session_state['data_loaded'] = True
+        st.success("Custom data loaded! Navigate to other pages for analysis.")
 
 if st.session_state['data_loaded']:
     st.info("✅ Custom data is loaded and will be used for analysis.")
@@ -1,43 +1,81 @@
 # src/calculator/cost_calculator.py
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
 from src.data_manager.config_manager import ConfigManager
 from src.models.data_models import Truck
+from src.models.compact_network import NetworkLike
+from src.calculator.route_table import RouteTable
+from src.monitoring.metrics import timed
 
 
-def calculate_all_costs(solution: Dict, trucks: List[Truck], road_network: Dict, config: ConfigManager) -> Dict:
-    all_costs = {}
-    truck_map = {t.id: t for t in trucks}
+@timed('calculator.route_metrics')
+def compute_route_metrics(solution: Dict, road_network: NetworkLike) -> RouteTable:
+    """Per-route distance (km), driving time (min) and load, gathered for all legs of all routes in one pass.
 
-    total_cost, total_fuel_cost, total_maintenance_cost, total_driver_cost = 0.0, 0.0, 0.0, 0.0
+    These only depend on the routes, so they can be computed once per solution and reused while cost
+    parameters change.
+    """
+    return RouteTable.from_solution(solution, road_network)
 
-    for truck_id, route_data in solution.get('routes', {}).items():
-        truck = truck_map.get(truck_id)
-        if not truck: continue
 
-        route_time_minutes = 0
-        for i in range(len(route_data['route']) - 1):
-            from_node, to_node = route_data['route'][i], route_data['route'][i + 1]
-            route_time_minutes += road_network.get(from_node, {}).get(to_node, {}).get('time', 0)
+@timed('calculator.fleet_costs')
+def calculate_fleet_costs(routes: RouteTable, trucks: List[Truck],
+                          rates: Optional[Dict[str, Union[float, np.ndarray]]] = None) -> pd.DataFrame:
+    """One vectorized pass over all routes: utilization and CO2, plus fuel/maintenance/driver costs if `rates`
+    is given. Rates may be scalars or per-route arrays (e.g. gathered by `routes.scenario` for a sweep)."""
+    truck_index = {t.id: i for i, t in enumerate(trucks)}
+    route_truck = np.array([truck_index.get(truck_id, -1) for truck_id in routes.truck_ids], dtype=np.int64)
+    known = route_truck >= 0
+    route_truck = route_truck[known]
 
-        distance_km = route_data['distance_m'] / 100
-        fuel_cost = (distance_km / 100) * truck.avg_fuel_consumption_L_per_100km * config.get_param('variable_costs',
-                                                                                                    'fuel_cost_per_liter')
-        maintenance_cost = distance_km * config.get_param('variable_costs', 'maintenance_cost_per_km')
-        driver_cost = (route_time_minutes / 60) * config.get_param('variable_costs', 'driver_wage_per_hour')
+    consumption = np.array([t.avg_fuel_consumption_L_per_100km for t in trucks], dtype=np.float64)[route_truck]
+    capacity = np.array([t.capacity_weight for t in trucks], dtype=np.float64)[route_truck]
+    co2_g_per_km = np.array([t.co2_emissions_g_per_km for t in trucks], dtype=np.float64)[route_truck]
+    distance_km, time_minutes = routes.distance_km[known], routes.time_minutes[known]
+    load_kg = routes.load_kg[known]
 
-        route_total_cost = fuel_cost + maintenance_cost + driver_cost
-        total_cost += route_total_cost
-        total_fuel_cost += fuel_cost
-        total_maintenance_cost += maintenance_cost
-        total_driver_cost += driver_cost
+    frame = pd.DataFrame({
+        'scenario': routes.scenario[known],
+        'truck_id': [truck_id for truck_id, ok in zip(routes.truck_ids, known) if ok],
+        'num_stops': routes.num_stops[known], 'distance_km': distance_km, 'time_minutes': time_minutes,
+        'load_kg': load_kg, 'capacity_kg': capacity, 'utilization_pct': load_kg / capacity * 100,
+        'co2_kg': distance_km * co2_g_per_km / 1000,
+    })
+    if rates is not None:
+        def route_rate(key):
+            rate = np.asarray(rates[key], dtype=np.float64)
+            return rate[known] if rate.ndim else rate
 
-        all_costs[truck_id] = {
-            'total_cost': route_total_cost, 'fuel_cost': fuel_cost, 'maintenance_cost': maintenance_cost,
-            'driver_cost': driver_cost, 'cost_per_km': route_total_cost / distance_km if distance_km > 0 else 0
-        }
+        fuel_cost = (distance_km / 100) * consumption * route_rate('fuel_cost_per_liter')
+        maintenance_cost = distance_km * route_rate('maintenance_cost_per_km')
+        driver_cost = (time_minutes / 60) * route_rate('driver_wage_per_hour')
+        total_cost = fuel_cost + maintenance_cost + driver_cost
+        frame['fuel_cost'], frame['maintenance_cost'], frame['driver_cost'] = fuel_cost, maintenance_cost, driver_cost
+        frame['total_cost'] = total_cost
+        frame['cost_per_km'] = np.divide(total_cost, distance_km, out=np.zeros_like(total_cost), where=distance_km > 0)
+    return frame
 
+
+def costs_to_dict(fleet_costs: pd.DataFrame) -> Dict:
+    """Converts a single-solution `calculate_fleet_costs` frame to the per-truck + 'summary' dict shape."""
+    cost_columns = ['total_cost', 'fuel_cost', 'maintenance_cost', 'driver_cost', 'cost_per_km']
+    all_costs = {
+        row['truck_id']: {column: float(row[column]) for column in cost_columns}
+        for row in fleet_costs[['truck_id'] + cost_columns].to_dict(orient='records')
+    }
     all_costs['summary'] = {
-        'total_overall_cost': total_cost, 'total_fuel_cost': total_fuel_cost,
-        'total_maintenance_cost': total_maintenance_cost, 'total_driver_cost': total_driver_cost,
+        'total_overall_cost': float(fleet_costs['total_cost'].sum()),
+        'total_fuel_cost': float(fleet_costs['fuel_cost'].sum()),
+        'total_maintenance_cost': float(fleet_costs['maintenance_cost'].sum()),
+        'total_driver_cost': float(fleet_costs['driver_cost'].sum()),
     }
-    return all_costs
\ No newline at end of file
+    return all_costs
+
+
+def calculate_all_costs(solution: Dict, trucks: List[Truck], road_network: NetworkLike, config: ConfigManager,
+                        cost_overrides: Optional[Dict[str, float]] = None,
+                        route_metrics: Optional[RouteTable] = None) -> Dict:
+    routes = route_metrics if route_metrics is not None else compute_route_metrics(solution, road_network)
+    rates = {**config.get_variable_costs(), **(cost_overrides or {})}
+    return costs_to_dict(calculate_fleet_costs(routes, trucks, rates))
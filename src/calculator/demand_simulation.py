@@ -0,0 +1,143 @@
+# src/calculator/demand_simulation.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.models.data_models import Market, Truck
+from src.monitoring import metrics
+from src.optimizer.solution_cache import DEFAULT_CACHE_DIR, SolutionCache, hash_payload
+
+DEFAULT_NUM_SCENARIOS = 10_000
+SIMULATION_VERSION = 1
+DEFAULT_SIMULATION_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'demand_simulations')
+# Scenario-by-stop demand draws held in memory per batch (float64, so about 16 MB).
+BATCH_ELEMENTS = 2 ** 21
+# Below this many draws in total, starting worker processes costs more than it saves.
+PARALLEL_MIN_ELEMENTS = 2 ** 25
+
+
+class RouteStops(NamedTuple):
+    """The routed markets of a solution flattened in visiting order; `route` is each stop's row in `truck_ids`."""
+    truck_ids: List[str]
+    capacity: np.ndarray
+    market_ids: List[str]
+    mean: np.ndarray
+    std: np.ndarray
+    route: np.ndarray
+
+    @classmethod
+    def from_solution(cls, solution: Dict[str, Any], markets: List[Market], trucks: List[Truck]) -> 'RouteStops':
+        market_map = {m.id: m for m in markets}
+        capacity_map = {t.id: t.capacity_weight for t in trucks}
+        truck_ids, stops, route = [], [], []
+        for truck_id, route_data in solution.get('routes', {}).items():
+            route_markets = [market_map[loc_id] for loc_id in route_data['route'] if loc_id in market_map]
+            if route_markets:
+                route.extend([len(truck_ids)] * len(route_markets))
+                truck_ids.append(truck_id)
+                stops.extend(route_markets)
+        mean = np.array([m.demand_weight for m in stops], dtype=np.float64)
+        return cls(truck_ids=truck_ids, capacity=np.array([capacity_map[t] for t in truck_ids], dtype=np.float64),
+                   market_ids=[m.id for m in stops], mean=mean,
+                   std=mean * np.array([m.demand_variability for m in stops], dtype=np.float64),
+                   route=np.array(route, dtype=np.int64))
+
+    def key(self, num_scenarios: int, seed: int) -> str:
+        """Hash of the routes and everything the simulated risk depends on."""
+        return hash_payload({
+            'version': SIMULATION_VERSION, 'truck_ids': self.truck_ids, 'capacity': self.capacity.tolist(),
+            'market_ids': self.market_ids, 'route': self.route.tolist(), 'mean': self.mean.tolist(),
+            'std': self.std.tolist(), 'num_scenarios': num_scenarios, 'seed': seed,
+        })
+
+
+def _simulate_batches(args: Tuple[RouteStops, List[np.random.SeedSequence], List[int]]) -> Dict[str, np.ndarray]:
+    """Sums of the per-route and per-stop outcomes over the given batches of scenarios."""
+    stops, seeds, sizes = args
+    num_routes = len(stops.truck_ids)
+    first = np.searchsorted(stops.route, np.arange(num_routes))
+    last = np.append(first[1:], len(stops.route)) - 1
+    stop_capacity = stops.capacity[stops.route]
+    totals = {'load_kg': np.zeros(num_routes), 'overflows': np.zeros(num_routes),
+              'overflow_kg': np.zeros(num_routes), 'stockouts': np.zeros(len(stops.route)),
+              'stockout_kg': np.zeros(len(stops.route))}
+    for seed, size in zip(seeds, sizes):
+        demand = np.random.default_rng(seed).standard_normal((size, len(stops.route)))
+        demand *= stops.std
+        demand += stops.mean
+        np.maximum(demand, 0, out=demand)
+        # Load on board each truck up to and including every stop, in visiting order.
+        carried = np.cumsum(demand, axis=1)
+        carried -= np.where(first > 0, carried[:, first - 1], 0)[:, stops.route]
+        route_load = carried[:, last]
+        totals['load_kg'] += route_load.sum(axis=0)
+        totals['overflows'] += (route_load > stops.capacity).sum(axis=0)
+        totals['overflow_kg'] += np.maximum(route_load - stops.capacity, 0).sum(axis=0)
+        # A full truck serves its stops in order until it runs empty, so a stop is short by its share of the
+        # demand beyond capacity.
+        short = np.minimum(np.maximum(carried - stop_capacity, 0), demand)
+        totals['stockouts'] += (short > 0).sum(axis=0)
+        totals['stockout_kg'] += short.sum(axis=0)
+    return totals
+
+
+def _run_batches(stops: RouteStops, num_scenarios: int, seed: int,
+                 max_workers: Optional[int]) -> Dict[str, np.ndarray]:
+    # One seed per batch, so the draws and the results do not depend on how batches are spread over workers.
+    batch_size = max(1, BATCH_ELEMENTS // len(stops.route))
+    sizes = [min(batch_size, num_scenarios - start) for start in range(0, num_scenarios, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(len(sizes), max_workers or os.cpu_count() or 1)
+    if workers <= 1 or num_scenarios * len(stops.route) < PARALLEL_MIN_ELEMENTS:
+        return _simulate_batches((stops, seeds, sizes))
+    chunks = np.array_split(np.arange(len(sizes)), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(_simulate_batches, [(stops, [seeds[i] for i in chunk], [sizes[i] for i in chunk])
+                                                     for chunk in chunks]))
+    return {name: sum(partial[name] for partial in partials) for name in partials[0]}
+
+
+@metrics.timed('simulation.demand')
+def simulate_demand(solution: Dict[str, Any], markets: List[Market], trucks: List[Truck],
+                    num_scenarios: int = DEFAULT_NUM_SCENARIOS, seed: int = 0, max_workers: Optional[int] = None,
+                    cache: Optional[SolutionCache] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Evaluates fixed routes against `num_scenarios` random demand draws per market.
+
+    Each market's demand is normal with mean `demand_weight` and standard deviation
+    `demand_weight * demand_variability` (as in the inventory policies), truncated at zero. A truck whose
+    drawn load exceeds its capacity serves its stops in route order until it runs empty.
+
+    Returns (truck_risk, market_risk): per truck, the probability and expected size of a capacity overflow;
+    per routed market, the probability and expected size of a stockout. Results are cached by `cache` under a
+    hash of the routes, demands, scenario count and seed.
+    """
+    stops = RouteStops.from_solution(solution, markets, trucks)
+    key = stops.key(num_scenarios, seed)
+    cached = cache.get(key) if cache else None
+    metrics.count('simulation.cache_hit' if cached is not None else 'simulation.cache_miss')
+    if cached is not None:
+        return pd.DataFrame(cached['trucks']), pd.DataFrame(cached['markets'])
+
+    if stops.market_ids and num_scenarios > 0:
+        totals = {name: values / num_scenarios for name, values in
+                  _run_batches(stops, num_scenarios, seed, max_workers).items()}
+    else:
+        totals = {name: np.zeros(len(stops.truck_ids)) for name in ('load_kg', 'overflows', 'overflow_kg')}
+        totals.update({name: np.zeros(len(stops.market_ids)) for name in ('stockouts', 'stockout_kg')})
+    truck_risk = pd.DataFrame({
+        'truck_id': stops.truck_ids, 'capacity_kg': stops.capacity,
+        'stops': np.bincount(stops.route, minlength=len(stops.truck_ids)),
+        'planned_load_kg': np.bincount(stops.route, weights=stops.mean, minlength=len(stops.truck_ids)),
+        'expected_load_kg': totals['load_kg'], 'overflow_probability': totals['overflows'],
+        'expected_overflow_kg': totals['overflow_kg'],
+    })
+    market_risk = pd.DataFrame({
+        'market_id': stops.market_ids, 'truck_id': [stops.truck_ids[r] for r in stops.route],
+        'demand_mean_kg': stops.mean, 'demand_std_kg': stops.std, 'stockout_probability': totals['stockouts'],
+        'expected_stockout_kg': totals['stockout_kg'],
+    })
+    if cache:
+        cache.put(key, {'trucks': truck_risk.to_dict(orient='records'),
+                        'markets': market_risk.to_dict(orient='records')})
+    return truck_risk, market_risk
@@ -0,0 +1,58 @@
+# src/calculator/inventory.py
+from typing import Dict, Sequence
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+DEFAULT_SERVICE_LEVELS = np.round(np.concatenate([np.arange(0.80, 0.99, 0.01), [0.99, 0.995, 0.999]]), 3)
+DEFAULT_HOLDING_COST_PER_KG_DAY = 0.02
+
+
+def compute_inventory_policies(avg_daily_demand: np.ndarray, demand_std: np.ndarray, lead_time_days: np.ndarray,
+                               service_levels: Sequence[float],
+                               holding_cost_per_kg_day: float = DEFAULT_HOLDING_COST_PER_KG_DAY) -> Dict[str, np.ndarray]:
+    """Safety stock, reorder point, daily holding cost of the safety stock and expected shortage per
+    replenishment cycle for every market (rows) at every service level (columns), as (n_markets, n_levels) arrays.
+
+    Uses the normal approximation of lead-time demand: sigma_L = sigma * sqrt(L), SS = z * sigma_L,
+    ROP = mean * L + SS, expected shortage = sigma_L * (pdf(z) - z * (1 - cdf(z))).
+    """
+    z = norm.ppf(np.asarray(service_levels, dtype=np.float64))[None, :]
+    lead_time = np.asarray(lead_time_days, dtype=np.float64)[:, None]
+    sigma_lead_time = np.asarray(demand_std, dtype=np.float64)[:, None] * np.sqrt(lead_time)
+    safety_stock = z * sigma_lead_time
+    return {
+        'safety_stock': safety_stock,
+        'reorder_point': np.asarray(avg_daily_demand, dtype=np.float64)[:, None] * lead_time + safety_stock,
+        'holding_cost_per_day': safety_stock * holding_cost_per_kg_day,
+        'expected_shortage': sigma_lead_time * (norm.pdf(z) - z * norm.sf(z)),
+    }
+
+
+def _market_inputs(markets: pd.DataFrame):
+    avg_demand = markets['demand_weight'].to_numpy(dtype=np.float64)
+    return avg_demand, avg_demand * markets['demand_variability'].to_numpy(dtype=np.float64), \
+        markets['lead_time_days'].to_numpy(dtype=np.float64)
+
+
+def inventory_policy_table(markets: pd.DataFrame, service_level: float,
+                           holding_cost_per_kg_day: float = DEFAULT_HOLDING_COST_PER_KG_DAY) -> pd.DataFrame:
+    """One row per market at a single service level."""
+    avg_demand, demand_std, lead_time = _market_inputs(markets)
+    policies = compute_inventory_policies(avg_demand, demand_std, lead_time, [service_level], holding_cost_per_kg_day)
+    return pd.DataFrame({
+        'market_id': markets['id'].to_numpy(), 'avg_daily_demand_kg': avg_demand, 'demand_std_kg': demand_std,
+        'lead_time_days': lead_time.astype(np.int64),
+        **{name: values[:, 0] for name, values in policies.items()},
+    })
+
+
+def service_level_tradeoff(markets: pd.DataFrame, service_levels: Sequence[float] = DEFAULT_SERVICE_LEVELS,
+                           holding_cost_per_kg_day: float = DEFAULT_HOLDING_COST_PER_KG_DAY) -> pd.DataFrame:
+    """Network-wide totals per service level: the cost of carrying more safety stock against the shortage it
+    prevents. All markets and levels are evaluated in a single broadcast."""
+    policies = compute_inventory_policies(*_market_inputs(markets), service_levels, holding_cost_per_kg_day)
+    return pd.DataFrame({
+        'service_level': np.asarray(service_levels, dtype=np.float64),
+        **{f'total_{name}': values.sum(axis=0) for name, values in policies.items() if name != 'reorder_point'},
+    })
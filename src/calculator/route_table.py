@@ -0,0 +1,63 @@
+# src/calculator/route_table.py
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from src.models.compact_network import NetworkLike, as_compact
+
+
+class RouteTable:
+    """Columnar view of one or more solutions: one row per route plus flat leg arrays.
+
+    Legs are stored as network index pairs (`leg_from`, `leg_to`) with `leg_route` pointing back to the
+    owning route, so per-route aggregates are a single `np.bincount` over all legs of all routes.
+    """
+
+    def __init__(self, truck_ids: List[str], scenario: np.ndarray, distance_km: np.ndarray, load_kg: np.ndarray,
+                 num_stops: np.ndarray, leg_from: np.ndarray, leg_to: np.ndarray, leg_route: np.ndarray,
+                 time_minutes: np.ndarray):
+        self.truck_ids = truck_ids
+        self.scenario = scenario
+        self.distance_km = distance_km
+        self.load_kg = load_kg
+        self.num_stops = num_stops
+        self.leg_from, self.leg_to, self.leg_route = leg_from, leg_to, leg_route
+        self.time_minutes = time_minutes
+
+    def __len__(self) -> int:
+        return len(self.truck_ids)
+
+    @classmethod
+    def from_solutions(cls, solutions: Iterable[Dict], road_network: Optional[NetworkLike] = None) -> 'RouteTable':
+        """Stacks the routes of several solutions; `scenario` holds each route's position in `solutions`."""
+        network = as_compact(road_network) if road_network is not None else None
+        truck_ids, scenario, routes = [], [], []
+        for position, solution in enumerate(solutions):
+            for truck_id, route_data in solution.get('routes', {}).items():
+                truck_ids.append(truck_id)
+                scenario.append(position)
+                routes.append(route_data)
+
+        lengths = np.array([len(r['route']) for r in routes], dtype=np.int64)
+        num_legs = np.maximum(lengths - 1, 0)
+        leg_route = np.repeat(np.arange(len(routes)), num_legs)
+        leg_from = leg_to = np.empty(0, dtype=np.int64)
+        time_minutes = np.zeros(len(routes), dtype=np.float64)
+
+        if network is not None and lengths.sum() > 1:
+            node_idx = network.indices(node for r in routes for node in r['route'])
+            leg_mask = np.ones(len(node_idx) - 1, dtype=bool)
+            leg_mask[np.cumsum(lengths)[:-1] - 1] = False  # no leg from one route's last stop to the next route
+            leg_from, leg_to = node_idx[:-1][leg_mask], node_idx[1:][leg_mask]
+            leg_times = network.leg_values(leg_from, leg_to, 'time')
+            time_minutes = np.bincount(leg_route, weights=leg_times, minlength=len(routes))
+
+        return cls(
+            truck_ids=truck_ids, scenario=np.array(scenario, dtype=np.int64),
+            distance_km=np.array([r['distance_m'] / 100 for r in routes], dtype=np.float64),
+            load_kg=np.array([r['load_kg'] for r in routes], dtype=np.float64),
+            num_stops=np.maximum(lengths - 2, 0), leg_from=leg_from, leg_to=leg_to, leg_route=leg_route,
+            time_minutes=time_minutes,
+        )
+
+    @classmethod
+    def from_solution(cls, solution: Dict, road_network: Optional[NetworkLike] = None) -> 'RouteTable':
+        return cls.from_solutions([solution], road_network)
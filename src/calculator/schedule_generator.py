@@ -1,31 +1,108 @@
 # src/calculator/schedule_generator.py
-from typing import Dict
-import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from src.models.compact_network import NetworkLike, as_compact
+from src.models.data_models import Farm, Market
+from src.monitoring.metrics import timed
+from src.models.time_windows import OPEN_WINDOW_END, format_minutes, parse_clock, parse_time_windows
 
+DEFAULT_START_TIME = "07:00"
+DEFAULT_SERVICE_MINUTES = 20
 
-def generate_schedules(solution: Dict, road_network: Dict) -> Dict:
-    schedules = {}
-    start_time_obj = datetime.datetime.strptime("07:00", "%H:%M")
 
-    for truck_id, route_data in solution.get('routes', {}).items():
-        schedule, current_time = [], start_time_obj
-        route_nodes = route_data['route']
+@timed('calculator.schedules')
+def build_schedule_frame(solution: Dict, road_network: NetworkLike, markets: Optional[List[Market]] = None,
+                         farms: Optional[List[Farm]] = None, start_time: str = DEFAULT_START_TIME,
+                         service_minutes: int = DEFAULT_SERVICE_MINUTES, wait_for_windows: bool = False) -> pd.DataFrame:
+    """One row per stop of every route with arrival/departure offsets (minutes from midnight) and
+    time-window lateness/slack. Times are cumulative sums over the gathered leg times; nothing is
+    formatted here, see `format_schedule`.
 
-        for i, node_id in enumerate(route_nodes):
-            arrival_time = current_time
-            activity = "Start/End Depot" if i == 0 or i == len(route_nodes) - 1 else "Deliver"
-            service_time = 0 if activity == "Start/End Depot" else 20
-            departure_time = arrival_time + datetime.timedelta(minutes=service_time)
+    Routes carrying a solver `start_min` depart at that time. With `wait_for_windows`, trucks that arrive
+    before a window opens wait for it, matching the solver's Time dimension.
+    """
+    network = as_compact(road_network)
+    routes = solution.get('routes', {})
+    truck_ids = list(routes.keys())
+    lengths = np.array([len(r['route']) for r in routes.values()], dtype=np.int64)
+    node_ids = [node for r in routes.values() for node in r['route']]
 
-            schedule.append({
-                "Stop": i + 1, "Node ID": node_id, "Activity": activity,
-                "Arrival": arrival_time.strftime("%H:%M"), "Departure": departure_time.strftime("%H:%M"),
-            })
+    route_of_stop = np.repeat(np.arange(len(truck_ids)), lengths)
+    first_stop = np.cumsum(lengths) - lengths
+    position = np.arange(len(node_ids)) - np.repeat(first_stop, lengths)
+    is_depot = (position == 0) | (position == np.repeat(lengths, lengths) - 1)
+    service = np.where(is_depot, 0, service_minutes)
 
-            if i < len(route_nodes) - 1:
-                next_node_id = route_nodes[i + 1]
-                travel_minutes = road_network.get(node_id, {}).get(next_node_id, {}).get('time', 0)
-                current_time = departure_time + datetime.timedelta(minutes=travel_minutes)
+    windows = {m.id: m.service_time_window for m in markets or []}
+    windows.update({f.id: f.loading_time_window for f in farms or []})
+    window_start, window_end = parse_time_windows([windows.get(node, '') for node in node_ids])
+    # The return to the depot closes the route; only the start is bound by the loading window.
+    is_return = is_depot & (position > 0)
+    window_start, window_end = np.where(is_return, 0, window_start), np.where(is_return, OPEN_WINDOW_END, window_end)
 
-        schedules[truck_id] = schedule
-    return schedules
\ No newline at end of file
+    node_idx = network.indices(node_ids)
+    travel_in = np.zeros(len(node_ids), dtype=np.int64)
+    if len(node_ids) > 1:
+        travel_in[1:] = network.leg_values(node_idx[:-1], node_idx[1:], 'time')
+    # Time added before reaching each stop: travel from the previous stop plus its service time.
+    increment = travel_in + np.concatenate([[0], service[:-1]])
+    increment[first_stop] = 0
+    elapsed = np.cumsum(increment)
+    elapsed -= np.repeat(elapsed[first_stop], lengths)
+    route_start = np.array([r.get('start_min', parse_clock(start_time)) for r in routes.values()], dtype=np.int64)
+    start_of_stop = np.repeat(route_start, lengths)
+
+    if wait_for_windows and len(node_ids):
+        # arrival_k = max(open_k, arrival_(k-1) + increment_k) unrolls to elapsed_k plus a running max of
+        # (open_j - elapsed_j), so waiting is a grouped cummax instead of a per-stop loop.
+        floor = np.where(position == 0, np.maximum(start_of_stop, window_start), window_start - elapsed)
+        arrival = elapsed + pd.Series(floor).groupby(route_of_stop).cummax().to_numpy()
+    else:
+        arrival = start_of_stop + elapsed
+    departure = arrival + service
+    wait = np.zeros(len(node_ids), dtype=np.int64)
+    if len(node_ids) > 1:
+        wait[1:] = arrival[1:] - (arrival[:-1] + increment[1:])
+        wait[first_stop] = 0
+
+    return pd.DataFrame({
+        'truck_id': np.array(truck_ids, dtype=object)[route_of_stop] if truck_ids else np.array([], dtype=object),
+        'stop': position + 1,
+        'node_id': node_ids,
+        'activity': np.where(is_depot, "Start/End Depot", "Deliver"),
+        'travel_minutes': travel_in * (position > 0),
+        'wait_minutes': wait,
+        'arrival_min': arrival,
+        'departure_min': departure,
+        'window_start_min': window_start,
+        'window_end_min': window_end,
+        'early_minutes': np.maximum(window_start - arrival, 0),
+        'lateness_minutes': np.maximum(arrival - window_end, 0),
+        'slack_minutes': np.maximum(window_end - arrival, 0),
+    })
+
+
+def format_schedule(schedule_frame: pd.DataFrame, truck_id: Optional[str] = None) -> pd.DataFrame:
+    """Display table for a single truck (or every row when `truck_id` is None); clock strings are only built
+    for the rows shown."""
+    rows = schedule_frame if truck_id is None else schedule_frame[schedule_frame['truck_id'] == truck_id]
+    return pd.DataFrame({
+        "Stop": rows['stop'].to_numpy(), "Node ID": rows['node_id'].to_numpy(),
+        "Activity": rows['activity'].to_numpy(),
+        "Arrival": [format_minutes(m) for m in rows['arrival_min']],
+        "Departure": [format_minutes(m) for m in rows['departure_min']],
+        "Wait (min)": rows['wait_minutes'].to_numpy(),
+        "Late (min)": rows['lateness_minutes'].to_numpy(),
+        "Slack (min)": np.where(rows['window_end_min'] >= OPEN_WINDOW_END, np.nan, rows['slack_minutes']),
+    })
+
+
+def generate_schedules(solution: Dict, road_network: NetworkLike, markets: Optional[List[Market]] = None,
+                       farms: Optional[List[Farm]] = None) -> Dict:
+    schedule_frame = build_schedule_frame(solution, road_network, markets, farms)
+    # Format all rows once and split by truck; filtering the frame per truck is quadratic in fleet size.
+    records = format_schedule(schedule_frame)[["Stop", "Node ID", "Activity", "Arrival", "Departure"]]
+    records['truck_id'] = schedule_frame['truck_id'].to_numpy()
+    return {truck_id: group.drop(columns='truck_id').to_dict(orient='records')
+            for truck_id, group in records.groupby('truck_id', sort=False)}
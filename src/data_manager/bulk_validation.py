@@ -0,0 +1,119 @@
+# src/data_manager/bulk_validation.py
+import hashlib
+import io
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Type
+import annotated_types
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from src.models.records import ModelRecords
+
+ERROR_COLUMNS = ['row', 'id', 'column', 'value', 'error']
+VALIDATION_CACHE_SIZE = 32
+_cache: 'OrderedDict[tuple, ValidationResult]' = OrderedDict()
+
+
+class ValidationResult(NamedTuple):
+    records: ModelRecords
+    errors: pd.DataFrame
+
+
+class RecordValidationError(ValueError):
+    def __init__(self, model: Type[BaseModel], errors: pd.DataFrame):
+        self.errors = errors
+        preview = '; '.join(f"row {r.row} {r.column}: {r.error}" for r in errors.head(5).itertuples())
+        super().__init__(f"{len(errors)} invalid {model.__name__} value(s): {preview}")
+
+
+def _error_frame(frame: pd.DataFrame, mask: np.ndarray, column: str, message: str) -> pd.DataFrame:
+    rows = np.flatnonzero(mask)
+    ids = frame['id'].to_numpy()[rows] if 'id' in frame.columns else np.full(len(rows), None)
+    return pd.DataFrame({'row': rows, 'id': ids, 'column': column,
+                         'value': frame[column].to_numpy()[rows], 'error': message})
+
+
+def validate_frame(frame: pd.DataFrame, model: Type[BaseModel]) -> ValidationResult:
+    """Checks every column of `frame` against the field types and `gt` constraints of `model` in one
+    vectorized pass per column. Invalid rows are reported (0-based `row`) and left out of the records."""
+    missing = [name for name in model.model_fields if name not in frame.columns]
+    if missing:
+        errors = pd.DataFrame({'row': None, 'id': None, 'column': missing, 'value': None, 'error': "missing column"})
+        return ValidationResult(ModelRecords(model, {}), errors)
+
+    columns, problems = {}, []
+    invalid = np.zeros(len(frame), dtype=bool)
+    for name, field in model.model_fields.items():
+        raw = frame[name]
+        if field.annotation in (int, float):
+            values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+            bad = np.isnan(values)
+            if bad.any():
+                problems.append(_error_frame(frame, bad, name, f"expected a number ({field.annotation.__name__})"))
+            if field.annotation is int:
+                fractional = ~bad & (values != np.round(values))
+                if fractional.any():
+                    problems.append(_error_frame(frame, fractional, name, "expected a whole number"))
+                bad |= fractional
+            for constraint in field.metadata:
+                if isinstance(constraint, annotated_types.Gt):
+                    violated = ~bad & ~(values > constraint.gt)
+                    if violated.any():
+                        problems.append(_error_frame(frame, violated, name, f"must be greater than {constraint.gt}"))
+                    bad |= violated
+            columns[name] = np.where(bad, 0, values).astype(np.int64 if field.annotation is int else np.float64)
+        else:
+            # Like the model's `str` fields: numbers are not coerced to strings.
+            values = raw.to_numpy(dtype=object)
+            bad = raw.isna().to_numpy(copy=True)
+            if bad.any():
+                problems.append(_error_frame(frame, bad, name, "missing value"))
+            if pd.api.types.infer_dtype(raw, skipna=True) != 'string':
+                not_text = ~bad & ~np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+                if not_text.any():
+                    problems.append(_error_frame(frame, not_text, name, "expected a string"))
+                bad |= not_text
+            columns[name] = values
+        invalid |= bad
+
+    errors = pd.concat(problems, ignore_index=True) if problems else pd.DataFrame(columns=ERROR_COLUMNS)
+    valid = ~invalid
+    records = ModelRecords(model, {name: values[valid] for name, values in columns.items()})
+    return ValidationResult(records, errors.sort_values(['row', 'column'], kind='stable', ignore_index=True))
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    return hashlib.sha256(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes() +
+                          ','.join(map(str, frame.columns)).encode()).hexdigest()
+
+
+def validate_cached(frame: pd.DataFrame, model: Type[BaseModel], digest: Optional[str] = None) -> ValidationResult:
+    """`validate_frame` memoized per (model, content hash), so reruns with the same file skip validation.
+    Pass the digest of the source file when known to avoid hashing the frame."""
+    key = (model.__name__, digest or frame_digest(frame))
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    result = validate_frame(frame, model)
+    _cache[key] = result
+    while len(_cache) > VALIDATION_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def validate_csv(data: bytes, model: Type[BaseModel]) -> ValidationResult:
+    """Validates raw CSV bytes; a file seen before is answered from the cache without being parsed again."""
+    digest = hashlib.sha256(data).hexdigest()
+    key = (model.__name__, digest)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    return validate_cached(pd.read_csv(io.BytesIO(data)), model, digest)
+
+
+def validate_records(frame: pd.DataFrame, model: Type[BaseModel], digest: Optional[str] = None) -> ModelRecords:
+    """Like `validate_cached` but raises `RecordValidationError` (a ValueError) if any row is invalid."""
+    records, errors = validate_cached(frame, model, digest)
+    if not errors.empty:
+        raise RecordValidationError(model, errors)
+    return records
@@ -0,0 +1,79 @@
+# src/data_manager/datasets.py
+import functools
+import hashlib
+import os
+from typing import List, NamedTuple, Tuple
+from src.data_manager import input_loader
+from src.data_manager.config_manager import ConfigManager
+from src.data_manager.network_store import MANIFEST_FILE, is_network_store
+from src.models.compact_network import CompactRoadNetwork
+from src.models.records import ModelRecords
+
+# Anchored to the repository, so the sample data and bundled config are found from any working directory.
+SAMPLE_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+CONFIG_PATH = os.path.join(SAMPLE_DATA_DIR, 'config.json')
+RECORD_LOADERS = {'farms': input_loader.load_farms, 'markets': input_loader.load_markets,
+                  'trucks': input_loader.load_trucks}
+# Digests kept for (path, mtime, size) triples seen recently; a rewritten file gets a new key.
+DIGEST_CACHE_SIZE = 1024
+
+
+class Dataset(NamedTuple):
+    farms: ModelRecords
+    markets: ModelRecords
+    trucks: ModelRecords
+    road_network: CompactRoadNetwork
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file's bytes, recomputed only when its size or mtime changes."""
+    stat = os.stat(path)
+    return _hash_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=DIGEST_CACHE_SIZE)
+def _hash_file(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(path: str) -> str:
+    if not is_network_store(path):
+        return file_digest(path)
+    # Store arrays can be gigabytes; they are identified by size and mtime next to the (hashed) manifest.
+    parts = [file_digest(os.path.join(path, MANIFEST_FILE))]
+    for name in sorted(os.listdir(path)):
+        stat = os.stat(os.path.join(path, name))
+        parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def network_path(data_dir: str) -> str:
+    store = os.path.join(data_dir, 'road_network')
+    return store if is_network_store(store) else os.path.join(data_dir, 'road_network_matrix.json')
+
+
+def config_path(data_dir: str) -> str:
+    # A dataset's own config.json (scripts/generate_dummy_data.py writes one into --out-dir) always wins;
+    # only directories without one, such as those from synthetic_data.generate_dataset, use the bundled config.
+    path = os.path.join(data_dir, 'config.json')
+    return path if os.path.isfile(path) else CONFIG_PATH
+
+
+def dataset_files(data_dir: str) -> List[str]:
+    return [os.path.join(data_dir, f"{kind}.csv") for kind in RECORD_LOADERS] + \
+        [network_path(data_dir), config_path(data_dir)]
+
+
+def dataset_digest(data_dir: str) -> str:
+    """Content hash of everything a pipeline run reads from `data_dir`; doubles as the dataset id."""
+    return hashlib.sha256('|'.join(content_digest(path) for path in dataset_files(data_dir)).encode()).hexdigest()
+
+
+def load_dataset(data_dir: str) -> Tuple[Dataset, ConfigManager]:
+    farms, markets, trucks = (loader(os.path.join(data_dir, f"{kind}.csv")) for kind, loader in RECORD_LOADERS.items())
+    road_network = input_loader.load_road_network(network_path(data_dir))
+    return Dataset(farms, markets, trucks, road_network), ConfigManager(config_path(data_dir))
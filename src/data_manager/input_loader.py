@@ -1,22 +1,34 @@
 # src/data_manager/input_loader.py
-import pandas as pd
-import json
-from typing import List
-from src.models.data_models import Farm, Market, Truck, RoadNetwork
+from src.models.data_models import Farm, Market, Truck
+from src.models.compact_network import CompactRoadNetwork
+from src.models.records import ModelRecords
+from src.data_manager.bulk_validation import RecordValidationError, validate_csv
+from src.data_manager.network_store import is_network_store, load_network_store
+from src.data_manager.network_stream import ingest_json_network
+from src.monitoring.metrics import timed
 
-def load_farms(filepath: str) -> List[Farm]:
-    df = pd.read_csv(filepath)
-    return [Farm(**row) for row in df.to_dict(orient='records')]
+def _load_records(filepath: str, model) -> ModelRecords:
+    with open(filepath, 'rb') as f:
+        records, errors = validate_csv(f.read(), model)
+    if not errors.empty:
+        raise RecordValidationError(model, errors)
+    return records
 
-def load_markets(filepath: str) -> List[Market]:
-    df = pd.read_csv(filepath)
-    return [Market(**row) for row in df.to_dict(orient='records')]
+@timed('load.farms')
+def load_farms(filepath: str) -> ModelRecords:
+    return _load_records(filepath, Farm)
 
-def load_trucks(filepath: str) -> List[Truck]:
-    df = pd.read_csv(filepath)
-    return [Truck(**row) for row in df.to_dict(orient='records')]
+@timed('load.markets')
+def load_markets(filepath: str) -> ModelRecords:
+    return _load_records(filepath, Market)
 
-def load_road_network(filepath: str) -> RoadNetwork:
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    return RoadNetwork(matrix=data)
\ No newline at end of file
+@timed('load.trucks')
+def load_trucks(filepath: str) -> ModelRecords:
+    return _load_records(filepath, Truck)
+
+@timed('load.road_network')
+def load_road_network(filepath: str) -> CompactRoadNetwork:
+    if is_network_store(filepath):
+        return load_network_store(filepath, mmap=True)
+    with open(filepath, 'rb') as f:
+        return ingest_json_network(f)
\ No newline at end of file
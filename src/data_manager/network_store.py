@@ -0,0 +1,79 @@
+# src/data_manager/network_store.py
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Iterator
+import numpy as np
+from src.models.compact_network import CompactRoadNetwork
+
+STORE_FORMAT = 'compact-road-network'
+STORE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+DISTANCE_FILE = 'distance.npy'
+TIME_FILE = 'time.npy'
+
+
+def is_network_store(path: str) -> bool:
+    return os.path.isdir(path) and os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+@contextlib.contextmanager
+def staged_store(path: str) -> Iterator[str]:
+    """Yields a scratch directory beside `path` to write a store into, then swaps it in for `path` whole.
+
+    Directories cannot be exchanged atomically: the old store is renamed aside and the new one renamed in, so
+    a reader opening `path` between the two renames finds no store, but never arrays that disagree with the
+    manifest. If the new store cannot be moved in, the old one is put back. An interrupted write only leaves
+    the scratch directory, which is removed on the way out.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}.", dir=parent)
+    try:
+        yield staging
+        _swap_into_place(staging, path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _swap_into_place(staging: str, path: str) -> None:
+    retired = None
+    if os.path.isdir(path):
+        retired = f"{staging}.old"
+        os.rename(path, retired)
+    try:
+        os.replace(staging, path)
+    except OSError:
+        # Another writer put its store in place between the two renames; keep it if it is complete.
+        if not is_network_store(path):
+            if retired:
+                os.rename(retired, path)
+            raise
+    if retired:
+        shutil.rmtree(retired, ignore_errors=True)
+
+
+def save_network_store(network: CompactRoadNetwork, path: str) -> None:
+    with staged_store(path) as staging:
+        np.save(os.path.join(staging, DISTANCE_FILE), np.ascontiguousarray(network.distance, dtype=np.float32))
+        np.save(os.path.join(staging, TIME_FILE), np.ascontiguousarray(network.time, dtype=np.int32))
+        write_manifest(staging, network.ids)
+
+
+def write_manifest(path: str, ids) -> None:
+    # Written last so a half-converted directory is never picked up as a valid store.
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump({'format': STORE_FORMAT, 'version': STORE_VERSION, 'ids': list(ids)}, f)
+
+
+def load_network_store(path: str, mmap: bool = True) -> CompactRoadNetwork:
+    with open(os.path.join(path, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != STORE_FORMAT or manifest.get('version') != STORE_VERSION:
+        raise ValueError(f"Unsupported road network store at {path}: {manifest.get('format')} v{manifest.get('version')}")
+    mmap_mode = 'r' if mmap else None
+    distance = np.load(os.path.join(path, DISTANCE_FILE), mmap_mode=mmap_mode)
+    time = np.load(os.path.join(path, TIME_FILE), mmap_mode=mmap_mode)
+    return CompactRoadNetwork(manifest['ids'], distance, time)
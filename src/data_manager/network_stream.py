@@ -0,0 +1,105 @@
+# src/data_manager/network_stream.py
+import os
+import ijson
+import numpy as np
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+from src.models.compact_network import CompactRoadNetwork
+from src.data_manager.network_store import DISTANCE_FILE, TIME_FILE, staged_store, write_manifest
+
+NetworkRecord = Tuple[str, str, float, int]
+ProgressCallback = Callable[[float, str], None]
+
+PROGRESS_EVERY_RECORDS = 50_000
+
+
+def iter_network_records(fileobj: BinaryIO) -> Iterator[NetworkRecord]:
+    """Yields (origin, dest, distance, time) from a nested JSON matrix without building the dict."""
+    depth, origin, dest, field, arc = 0, None, None, None, {}
+    for event, value in ijson.basic_parse(fileobj, use_float=True):
+        if event == 'start_map':
+            depth += 1
+            if depth == 3:
+                arc = {}
+        elif event == 'end_map':
+            if depth == 3:
+                yield origin, dest, arc.get('distance', 0.0), int(arc.get('time', 0))
+            depth -= 1
+        elif event == 'map_key':
+            if depth == 1:
+                origin = value
+            elif depth == 2:
+                dest = value
+            else:
+                field = value
+        elif depth == 3 and event == 'number':
+            arc[field] = value
+
+
+def _scan_ids(fileobj: BinaryIO, progress: Optional[Callable[[], None]]) -> List[str]:
+    ids, seen, depth = [], set(), 0
+    for count, (event, value) in enumerate(ijson.basic_parse(fileobj)):
+        if event == 'start_map':
+            depth += 1
+        elif event == 'end_map':
+            depth -= 1
+        elif event == 'map_key' and depth <= 2 and value not in seen:
+            seen.add(value)
+            ids.append(value)
+        if progress and count % PROGRESS_EVERY_RECORDS == 0:
+            progress()
+    return ids
+
+
+def _file_size(fileobj: BinaryIO) -> int:
+    position = fileobj.tell()
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(position)
+    return size
+
+
+def ingest_json_network(fileobj: BinaryIO, out_dir: Optional[str] = None,
+                        progress: Optional[ProgressCallback] = None) -> CompactRoadNetwork:
+    """Streams a JSON matrix into dense arrays in two passes (ids, then values).
+
+    With `out_dir` the arrays are written straight into a memory-mapped network store, so peak
+    memory stays bounded by the parser buffer rather than the matrix size. The store is built in a scratch
+    directory and replaces `out_dir` only once complete. `fileobj` must be seekable.
+    """
+    if out_dir:
+        with staged_store(out_dir) as staging:
+            return _ingest(fileobj, staging, progress)
+    return _ingest(fileobj, None, progress)
+
+
+def _ingest(fileobj: BinaryIO, out_dir: Optional[str], progress: Optional[ProgressCallback]) -> CompactRoadNetwork:
+    size = max(_file_size(fileobj), 1)
+
+    def report(offset: float, message: str):
+        if progress:
+            progress(min(offset + 0.5 * fileobj.tell() / size, 1.0), message)
+
+    fileobj.seek(0)
+    ids = _scan_ids(fileobj, lambda: report(0.0, "Scanning location ids"))
+    index = {loc_id: i for i, loc_id in enumerate(ids)}
+    n = len(ids)
+
+    if out_dir:
+        distance = np.lib.format.open_memmap(os.path.join(out_dir, DISTANCE_FILE), 'w+', np.float32, (n, n))
+        time = np.lib.format.open_memmap(os.path.join(out_dir, TIME_FILE), 'w+', np.int32, (n, n))
+    else:
+        distance, time = np.zeros((n, n), dtype=np.float32), np.zeros((n, n), dtype=np.int32)
+
+    fileobj.seek(0)
+    for count, (origin, dest, dist, minutes) in enumerate(iter_network_records(fileobj)):
+        i, j = index[origin], index[dest]
+        distance[i, j], time[i, j] = dist, minutes
+        if count % PROGRESS_EVERY_RECORDS == 0:
+            report(0.5, f"Ingesting arcs ({count:,} read)")
+
+    if out_dir:
+        distance.flush()
+        time.flush()
+        write_manifest(out_dir, ids)
+    if progress:
+        progress(1.0, f"Ingested {n:,} locations")
+    return CompactRoadNetwork(ids, distance, time)
@@ -0,0 +1,67 @@
+# src/data_manager/session_data.py
+import os
+from typing import Tuple
+import pandas as pd
+import streamlit as st
+from src.data_manager.config_manager import ConfigManager
+from src.data_manager.datasets import (CONFIG_PATH, RECORD_LOADERS, SAMPLE_DATA_DIR, Dataset, content_digest,
+                                       file_digest, network_path)
+from src.data_manager import input_loader
+from src.models.compact_network import CompactRoadNetwork
+from src.models.records import ModelRecords
+
+
+# The cached loaders are keyed by content digest, so every session shares one copy of a dataset and an edited
+# file is picked up on the next rerun. Their results are shared: treat them as read-only.
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _cached_records(kind: str, path: str, digest: str) -> ModelRecords:
+    return RECORD_LOADERS[kind](path)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Loading road network...")
+def _cached_network(path: str, digest: str) -> CompactRoadNetwork:
+    return input_loader.load_road_network(path)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cached_config(path: str, digest: str) -> ConfigManager:
+    return ConfigManager(path)
+
+
+def load_records(kind: str, path: str) -> ModelRecords:
+    return _cached_records(kind, path, file_digest(path))
+
+
+def load_road_network(path: str) -> CompactRoadNetwork:
+    return _cached_network(path, content_digest(path))
+
+
+def load_config(path: str = CONFIG_PATH) -> ConfigManager:
+    return _cached_config(path, file_digest(path))
+
+
+def sample_dataset(data_dir: str = SAMPLE_DATA_DIR) -> Dataset:
+    farms, markets, trucks = (load_records(kind, os.path.join(data_dir, f"{kind}.csv")) for kind in RECORD_LOADERS)
+    return Dataset(farms, markets, trucks, load_road_network(network_path(data_dir)))
+
+
+def session_dataset() -> Dataset:
+    """The datasets uploaded on the Home page if there are any, the sample data otherwise."""
+    if st.session_state.get('data_loaded', False):
+        return Dataset(st.session_state['farms_records'], st.session_state['markets_records'],
+                       st.session_state['trucks_records'], load_road_network(st.session_state['network_path']))
+    return sample_dataset()
+
+
+def session_markets_frame() -> pd.DataFrame:
+    if st.session_state.get('data_loaded', False):
+        return st.session_state['markets_df']
+    return load_records('markets', os.path.join(SAMPLE_DATA_DIR, 'markets.csv')).to_frame()
+
+
+def session_fleet() -> Tuple[ModelRecords, ModelRecords]:
+    """Markets and trucks of the session's dataset, without loading the road network."""
+    if st.session_state.get('data_loaded', False):
+        return st.session_state['markets_records'], st.session_state['trucks_records']
+    return (load_records('markets', os.path.join(SAMPLE_DATA_DIR, 'markets.csv')),
+            load_records('trucks', os.path.join(SAMPLE_DATA_DIR, 'trucks.csv')))
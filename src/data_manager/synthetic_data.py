@@ -0,0 +1,112 @@
+# src/data_manager/synthetic_data.py
+import os
+from typing import Callable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.data_manager.network_store import DISTANCE_FILE, TIME_FILE, staged_store, write_manifest
+from src.models.spatial_index import SpatialIndex, haversine_km
+
+# (min_lat, max_lat, min_lon, max_lon) the locations are drawn from.
+DEFAULT_REGION = (30.0, 48.0, -120.0, -75.0)
+ROAD_DETOUR_FACTOR = 1.3
+SPEED_RANGE_KMH = (50.0, 70.0)
+DEFAULT_BLOCK_ROWS = 512
+
+
+def _hour_windows(start_hours: np.ndarray, width_hours: int) -> np.ndarray:
+    start = pd.Series(start_hours).map('{:02d}:00'.format)
+    end = pd.Series(start_hours + width_hours).map('{:02d}:00'.format)
+    return (start + '-' + end).to_numpy()
+
+
+def _coordinates(rng: np.random.Generator, n: int, region: Tuple[float, float, float, float]):
+    min_lat, max_lat, min_lon, max_lon = region
+    return np.round(rng.uniform(min_lat, max_lat, n), 6), np.round(rng.uniform(min_lon, max_lon, n), 6)
+
+
+def generate_farms(rng: np.random.Generator, num_farms: int, region=DEFAULT_REGION) -> pd.DataFrame:
+    latitude, longitude = _coordinates(rng, num_farms, region)
+    return pd.DataFrame({
+        'id': [f"FARM_{i + 1:0{max(2, len(str(num_farms)))}d}" for i in range(num_farms)],
+        'latitude': latitude, 'longitude': longitude,
+        'inventory_weight': np.round(rng.uniform(2000, 8000, num_farms), 2),
+        'loading_time_window': _hour_windows(rng.integers(6, 10, num_farms), 4),
+    })
+
+
+def generate_markets(rng: np.random.Generator, num_markets: int, region=DEFAULT_REGION) -> pd.DataFrame:
+    latitude, longitude = _coordinates(rng, num_markets, region)
+    return pd.DataFrame({
+        'id': [f"MARKET_{i + 1:0{max(2, len(str(num_markets)))}d}" for i in range(num_markets)],
+        'latitude': latitude, 'longitude': longitude,
+        'demand_weight': np.round(rng.uniform(500, 2500, num_markets), 2),
+        'service_time_window': _hour_windows(rng.integers(9, 15, num_markets), 2),
+        'demand_variability': np.round(rng.uniform(0.1, 0.4, num_markets), 2),
+        'lead_time_days': rng.integers(2, 8, num_markets),
+    })
+
+
+def generate_trucks(rng: np.random.Generator, num_trucks: int, farms: pd.DataFrame,
+                    markets: pd.DataFrame) -> pd.DataFrame:
+    """Trucks are based at farms in proportion to how many markets each farm is the nearest depot for."""
+    index = SpatialIndex(farms['id'].tolist(), farms['latitude'].to_numpy(), farms['longitude'].to_numpy(),
+                         depot_ids=farms['id'])
+    nearest, _ = index.nearest_depot(markets['latitude'].to_numpy(), markets['longitude'].to_numpy())
+    share = pd.Series(nearest).value_counts().reindex(farms['id'], fill_value=0).to_numpy() + 1.0
+    return pd.DataFrame({
+        'id': [f"TRUCK_{i + 1:0{max(2, len(str(num_trucks)))}d}" for i in range(num_trucks)],
+        'capacity_weight': rng.choice([8000.0, 10000.0, 12000.0], num_trucks),
+        'capacity_volume': rng.choice([30.0, 40.0, 50.0], num_trucks),
+        'fuel_type': "Diesel",
+        'avg_fuel_consumption_L_per_100km': np.round(rng.uniform(25, 35, num_trucks), 1),
+        'driver_hours_limit': 10.0,
+        'home_depot_id': rng.choice(farms['id'].to_numpy(), num_trucks, p=share / share.sum()),
+        'co2_emissions_g_per_km': np.round(rng.uniform(700, 950, num_trucks), 1),
+    })
+
+
+def write_synthetic_network(locations: pd.DataFrame, out_dir: str, rng: np.random.Generator,
+                            block_rows: int = DEFAULT_BLOCK_ROWS,
+                            progress: Optional[Callable[[float], None]] = None) -> None:
+    """Writes an all-pairs distance/time store computed in row blocks, so peak memory is one
+    (block_rows x n) block rather than the whole matrix."""
+    ids = locations['id'].tolist()
+    latitude, longitude = locations['latitude'].to_numpy(), locations['longitude'].to_numpy()
+    n = len(ids)
+    with staged_store(out_dir) as staging:
+        distance = np.lib.format.open_memmap(os.path.join(staging, DISTANCE_FILE), 'w+', np.float32, (n, n))
+        time = np.lib.format.open_memmap(os.path.join(staging, TIME_FILE), 'w+', np.int32, (n, n))
+        for start in range(0, n, block_rows):
+            rows = slice(start, min(start + block_rows, n))
+            block_km = haversine_km(latitude[rows, None], longitude[rows, None], latitude[None, :], longitude[None, :])
+            block_km = np.round(block_km * ROAD_DETOUR_FACTOR, 2)
+            speed = rng.uniform(*SPEED_RANGE_KMH, size=block_km.shape)
+            distance[rows] = block_km
+            time[rows] = np.rint(block_km / speed * 60)
+            if progress:
+                progress(rows.stop / n)
+        distance.flush()
+        time.flush()
+        del distance, time
+        write_manifest(staging, ids)
+
+
+def generate_dataset(out_dir: str, num_farms: int, num_markets: int, num_trucks: int, seed: int = 42,
+                     region=DEFAULT_REGION, network_dir: Optional[str] = None, block_rows: int = DEFAULT_BLOCK_ROWS,
+                     progress: Optional[Callable[[float], None]] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Seeded farms/markets/trucks CSVs in `out_dir` plus a binary road network store in `network_dir`
+    (default `<out_dir>/road_network`). The same seed always yields the same files."""
+    rng = np.random.default_rng(seed)
+    farms = generate_farms(rng, num_farms, region)
+    markets = generate_markets(rng, num_markets, region)
+    trucks = generate_trucks(rng, num_trucks, farms, markets)
+    os.makedirs(out_dir, exist_ok=True)
+    farms.to_csv(os.path.join(out_dir, 'farms.csv'), index=False)
+    markets.to_csv(os.path.join(out_dir, 'markets.csv'), index=False)
+    trucks.to_csv(os.path.join(out_dir, 'trucks.csv'), index=False)
+
+    locations = pd.concat([farms[['id', 'latitude', 'longitude']], markets[['id', 'latitude', 'longitude']]],
+                          ignore_index=True)
+    write_synthetic_network(locations, network_dir or os.path.join(out_dir, 'road_network'), rng, block_rows,
+                            progress)
+    return farms, markets, trucks
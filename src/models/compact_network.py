@@ -0,0 +1,127 @@
+# src/models/compact_network.py
+import hashlib
+import json
+import numpy as np
+from typing import Dict, Iterable, Mapping, Sequence, Union
+from src.models.data_models import RoadNetwork
+
+
+class CompactRoadNetwork:
+    """Dense road network: an id -> index table plus contiguous distance (km) and time (min) arrays."""
+
+    def __init__(self, ids: Sequence[str], distance: np.ndarray, time: np.ndarray):
+        self.ids = list(ids)
+        self._fingerprint = None
+        self.index = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.distance = distance if distance.dtype == np.float32 else distance.astype(np.float32)
+        self.time = time if time.dtype == np.int32 else time.astype(np.int32)
+        n = len(self.ids)
+        if self.distance.shape != (n, n) or self.time.shape != (n, n):
+            raise ValueError(f"Matrix shape must be ({n}, {n}), got {self.distance.shape} / {self.time.shape}")
+
+    @classmethod
+    def from_nested_dict(cls, matrix: Dict[str, Dict[str, Dict[str, float]]]) -> 'CompactRoadNetwork':
+        ids, seen = list(matrix.keys()), set(matrix.keys())
+        for row in matrix.values():
+            for dest_id in row:
+                if dest_id not in seen:
+                    seen.add(dest_id)
+                    ids.append(dest_id)
+        index = {loc_id: i for i, loc_id in enumerate(ids)}
+        distance = np.zeros((len(ids), len(ids)), dtype=np.float32)
+        time = np.zeros((len(ids), len(ids)), dtype=np.int32)
+        for origin_id, row in matrix.items():
+            i = index[origin_id]
+            for dest_id, arc in row.items():
+                j = index[dest_id]
+                distance[i, j] = arc.get('distance', 0)
+                time[i, j] = arc.get('time', 0)
+        return cls(ids, distance, time)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def matrix(self) -> 'NestedMatrixView':
+        return NestedMatrixView(self)
+
+    def fingerprint(self) -> str:
+        """Content hash of ids and arrays, computed once per instance."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256(json.dumps(self.ids).encode())
+            digest.update(np.ascontiguousarray(self.distance).data)
+            digest.update(np.ascontiguousarray(self.time).data)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def indices(self, loc_ids: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.index.get(loc_id, -1) for loc_id in loc_ids), dtype=np.int64)
+
+    def submatrix(self, loc_ids: Sequence[str], field: str = 'distance') -> np.ndarray:
+        """Gathers the square matrix for `loc_ids`; unknown ids get zero rows/columns like the old `.get()` chains."""
+        idx = self.indices(loc_ids)
+        source = self.distance if field == 'distance' else self.time
+        known = idx >= 0
+        out = np.zeros((len(idx), len(idx)), dtype=source.dtype)
+        out[np.ix_(known, known)] = source[np.ix_(idx[known], idx[known])]
+        return out
+
+    def subset(self, loc_ids: Sequence[str]) -> 'CompactRoadNetwork':
+        """Small standalone copy restricted to `loc_ids`, cheap to pickle into worker processes."""
+        return CompactRoadNetwork(loc_ids, self.submatrix(loc_ids, 'distance'), self.submatrix(loc_ids, 'time'))
+
+    def leg_values(self, from_idx: np.ndarray, to_idx: np.ndarray, field: str = 'distance') -> np.ndarray:
+        """Gathers arc values for paired index arrays; negative (unknown) indices give 0."""
+        source = self.distance if field == 'distance' else self.time
+        valid = (from_idx >= 0) & (to_idx >= 0)
+        out = np.zeros(len(from_idx), dtype=source.dtype)
+        out[valid] = source[from_idx[valid], to_idx[valid]]
+        return out
+
+    def route_legs(self, route: Sequence[str], field: str = 'distance') -> np.ndarray:
+        idx = self.indices(route)
+        return self.leg_values(idx[:-1], idx[1:], field)
+
+
+class NestedMatrixView(Mapping):
+    """Read-only `matrix[origin][dest]['distance'|'time']` adapter over a CompactRoadNetwork."""
+
+    def __init__(self, network: CompactRoadNetwork):
+        self.network = network
+
+    def __getitem__(self, origin_id: str) -> '_RowView':
+        return _RowView(self.network, self.network.index[origin_id])
+
+    def __iter__(self):
+        return iter(self.network.ids)
+
+    def __len__(self) -> int:
+        return len(self.network)
+
+
+class _RowView(Mapping):
+    def __init__(self, network: CompactRoadNetwork, row: int):
+        self.network, self.row = network, row
+
+    def __getitem__(self, dest_id: str) -> Dict[str, float]:
+        j = self.network.index[dest_id]
+        return {'distance': float(self.network.distance[self.row, j]), 'time': int(self.network.time[self.row, j])}
+
+    def __iter__(self):
+        return iter(self.network.ids)
+
+    def __len__(self) -> int:
+        return len(self.network)
+
+
+NetworkLike = Union[CompactRoadNetwork, NestedMatrixView, RoadNetwork, Mapping]
+
+
+def as_compact(road_network: NetworkLike) -> CompactRoadNetwork:
+    if isinstance(road_network, CompactRoadNetwork):
+        return road_network
+    if isinstance(road_network, NestedMatrixView):
+        return road_network.network
+    if isinstance(road_network, RoadNetwork):
+        return CompactRoadNetwork.from_nested_dict(road_network.matrix)
+    return CompactRoadNetwork.from_nested_dict(dict(road_network))
@@ -1,6 +1,6 @@
 # src/models/data_models.py
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import Annotated, List, Dict
 
 class Farm(BaseModel):
     id: str
@@ -29,4 +29,25 @@ class Truck(BaseModel):
     co2_emissions_g_per_km: float
 
 class RoadNetwork(BaseModel):
-    matrix: Dict[str, Dict[str, Dict[str, float]]]
\ No newline at end of file
+    matrix: Dict[str, Dict[str, Dict[str, float]]]
+
+class MarketDelta(BaseModel):
+    """Intra-day changes to the market list: new demands by market id, new markets and cancelled market ids."""
+    demand_changes: Dict[str, Annotated[float, Field(gt=0)]] = {}
+    added: List[Market] = []
+    removed: List[str] = []
+
+    def affected_ids(self) -> set:
+        return set(self.demand_changes) | set(self.removed) | {m.id for m in self.added}
+
+    def apply_to(self, markets: List[Market]) -> List[Market]:
+        """The market list after this delta; unchanged markets are passed through as they are."""
+        removed = set(self.removed)
+        updated = []
+        for market in markets:
+            if market.id in removed:
+                continue
+            if market.id in self.demand_changes:
+                market = Market(**{**market.model_dump(), 'demand_weight': self.demand_changes[market.id]})
+            updated.append(market)
+        return updated + list(self.added)
@@ -0,0 +1,102 @@
+# src/models/records.py
+from typing import Dict, Iterator, List, Sequence, Type, Union
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from src.models.data_models import Farm, Market, Truck
+
+
+class _Record:
+    """Slotted, attribute-compatible stand-in for an already validated pydantic model instance."""
+    __slots__ = ()
+    model: Type[BaseModel]
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __reduce__(self):
+        return self.__class__, tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ' '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.model_dump() == other.model_dump()
+
+    def model_dump(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_model(self) -> BaseModel:
+        return self.model.model_construct(**self.model_dump())
+
+
+class FarmRecord(_Record):
+    __slots__ = tuple(Farm.model_fields)
+    model = Farm
+
+
+class MarketRecord(_Record):
+    __slots__ = tuple(Market.model_fields)
+    model = Market
+
+
+class TruckRecord(_Record):
+    __slots__ = tuple(Truck.model_fields)
+    model = Truck
+
+
+RECORD_TYPES: Dict[Type[BaseModel], Type[_Record]] = {Farm: FarmRecord, Market: MarketRecord, Truck: TruckRecord}
+
+
+class ModelRecords(Sequence):
+    """Column-backed, read-only sequence of validated farms/markets/trucks.
+
+    Vector code reads `column(name)` directly; code written against `List[Market]` iterates lightweight
+    slotted records, built once on first access with plain Python scalars.
+    """
+
+    def __init__(self, model: Type[BaseModel], columns: Dict[str, np.ndarray]):
+        self.model = model
+        self.columns = columns
+        self._rows = None
+
+    @classmethod
+    def from_frame(cls, model: Type[BaseModel], frame: pd.DataFrame) -> 'ModelRecords':
+        return cls(model, {name: frame[name].to_numpy() for name in model.model_fields})
+
+    def _materialize(self) -> List[_Record]:
+        if self._rows is None:
+            record_type = RECORD_TYPES[self.model]
+            values = [self.columns[name].tolist() for name in self.model.model_fields]
+            self._rows = [record_type(*row) for row in zip(*values)]
+        return self._rows
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator[_Record]:
+        return iter(self._materialize())
+
+    def __add__(self, other) -> List:
+        # Keeps `farms + markets` working as it did for plain lists of models.
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List:
+        return list(other) + list(self)
+
+    def __getstate__(self):
+        return {'model': self.model, 'columns': self.columns}
+
+    def __setstate__(self, state):
+        self.model, self.columns, self._rows = state['model'], state['columns'], None
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
@@ -0,0 +1,98 @@
+# src/models/spatial_index.py
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from scipy.spatial import cKDTree
+from src.models.data_models import Farm, Market
+
+EARTH_RADIUS_KM = 6371.0
+Coordinates = Union[float, Sequence[float], np.ndarray]
+
+
+def unit_vectors(latitudes: Coordinates, longitudes: Coordinates) -> np.ndarray:
+    """Lat/long in degrees -> (n, 3) points on the unit sphere, where chord order matches great-circle order."""
+    lat, lon = np.radians(np.atleast_1d(latitudes)), np.radians(np.atleast_1d(longitudes))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def km_to_chord(km: float) -> float:
+    return float(2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2))
+
+
+def haversine_km(lat1: Coordinates, lon1: Coordinates, lat2: Coordinates, lon2: Coordinates) -> np.ndarray:
+    """Great-circle distance in km; broadcasts, so a column of origins against a row of destinations
+    gives a whole block of the distance matrix at once."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def nearest(points: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Position in `targets` of the nearest target to each of `points` (unit-sphere arrays, e.g. k-means centres)."""
+    return cKDTree(targets).query(points)[1]
+
+
+class SpatialIndex:
+    """KD-tree over location coordinates for nearest-neighbour, radius and nearest-depot queries.
+
+    Built once per set of locations. Queries take scalars or arrays of lat/long and return positions into
+    `ids` plus great-circle distances in km.
+    """
+
+    def __init__(self, ids: List[str], latitudes: np.ndarray, longitudes: np.ndarray,
+                 depot_ids: Iterable[str] = ()):
+        self.ids = list(ids)
+        self.position = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.tree = cKDTree(unit_vectors(self.latitudes, self.longitudes))
+
+        depot_positions = [self.position[d] for d in dict.fromkeys(depot_ids) if d in self.position]
+        self.is_depot = np.zeros(len(self.ids), dtype=bool)
+        self.is_depot[depot_positions] = True
+        self._depot_positions = np.array(depot_positions, dtype=np.int64)
+        self._depot_tree = cKDTree(self.tree.data[self._depot_positions]) if depot_positions else None
+
+    @classmethod
+    def from_locations(cls, farms: List[Farm], markets: List[Market],
+                       depot_ids: Optional[Iterable[str]] = None) -> 'SpatialIndex':
+        """Indexes farms then markets; depots default to all farms."""
+        locations = list(farms) + list(markets)
+        return cls([loc.id for loc in locations], np.array([loc.latitude for loc in locations]),
+                   np.array([loc.longitude for loc in locations]),
+                   [f.id for f in farms] if depot_ids is None else depot_ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def points(self, loc_ids: Sequence[str]) -> np.ndarray:
+        """Unit-sphere points of `loc_ids`, in that order."""
+        return self.tree.data[[self.position[loc_id] for loc_id in loc_ids]]
+
+    def knn(self, latitudes: Coordinates, longitudes: Coordinates, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, km) of the k nearest locations to each query point, both shaped (n_queries, k)."""
+        k = min(k, len(self.ids))
+        chord, positions = self.tree.query(unit_vectors(latitudes, longitudes), k=k)
+        return positions.reshape(-1, k), chord_to_km(chord).reshape(-1, k)
+
+    def neighbors(self, k: int) -> np.ndarray:
+        """k nearest other locations of every indexed location, shaped (len(self), k)."""
+        _, positions = self.tree.query(self.tree.data, k=min(k + 1, len(self.ids)))
+        return positions.reshape(len(self.ids), -1)[:, 1:]
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Positions of all locations within `radius_km` of one point, nearest first."""
+        center = unit_vectors(latitude, longitude)[0]
+        positions = np.array(self.tree.query_ball_point(center, km_to_chord(radius_km)), dtype=np.int64)
+        return positions[np.argsort(((self.tree.data[positions] - center) ** 2).sum(axis=1), kind='stable')]
+
+    def nearest_depot(self, latitudes: Coordinates, longitudes: Coordinates) -> Tuple[List[str], np.ndarray]:
+        """Closest depot id and its distance in km for each query point."""
+        if self._depot_tree is None:
+            raise ValueError("SpatialIndex has no depots to query.")
+        chord, nearest = self._depot_tree.query(unit_vectors(latitudes, longitudes))
+        return [self.ids[p] for p in self._depot_positions[nearest]], chord_to_km(chord)
+
@@ -0,0 +1,34 @@
+# src/models/time_windows.py
+from typing import Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 24 * 60
+# End value used for missing or unparseable windows, i.e. "no deadline".
+OPEN_WINDOW_END = 10 ** 7
+
+
+def parse_clock(value: str) -> int:
+    hours, minutes = value.strip().split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def parse_time_windows(windows: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parses 'HH:MM-HH:MM' strings into (start, end) minute-of-day int64 arrays in one vectorized pass.
+
+    Windows that wrap past midnight get `end + 1440`; missing/invalid windows become [0, OPEN_WINDOW_END].
+    """
+    parts = pd.Series(windows, dtype=object).astype(str).str.extract(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+    valid = parts.notna().all(axis=1).to_numpy()
+    values = parts.fillna(0).astype(np.int64).to_numpy()
+    start = values[:, 0] * 60 + values[:, 1]
+    end = values[:, 2] * 60 + values[:, 3]
+    end = np.where(end < start, end + MINUTES_PER_DAY, end)
+    return np.where(valid, start, 0), np.where(valid, end, OPEN_WINDOW_END)
+
+
+def format_minutes(minutes: int) -> str:
+    """Minute offset from midnight of day 0 as 'HH:MM', with a '(+Nd)' suffix on later days."""
+    days, minute_of_day = divmod(int(minutes), MINUTES_PER_DAY)
+    clock = f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+    return f"{clock} (+{days}d)" if days else clock
@@ -0,0 +1,117 @@
+# src/monitoring/metrics.py
+import contextvars
+from collections import deque
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+import pandas as pd
+
+METRICS_LOG_ENV = 'OPSDASH_METRICS_LOG'
+# Bounds memory of long-lived recorders such as the process-wide default.
+MAX_EVENTS = 10000
+logger = logging.getLogger('opsdash.metrics')
+
+
+def _configure_logger() -> None:
+    # One JSON object per line, appended to the file named by OPSDASH_METRICS_LOG (if set).
+    path = os.environ.get(METRICS_LOG_ENV)
+    if path and not logger.handlers:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+
+_configure_logger()
+
+
+class MetricsRecorder:
+    """Collects stage timings, counters and solver statistics for one run (e.g. one Streamlit rerun).
+
+    Every event is also emitted to the `opsdash.metrics` logger as a JSON line.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or f"{time.time():.6f}"
+        self.started_at = time.perf_counter()
+        self.timings: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self.counters: Dict[str, float] = {}
+        self.solver_runs: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+
+    def _emit(self, kind: str, **fields) -> None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({'run_id': self.run_id, 'kind': kind, **fields}, default=str))
+
+    @contextmanager
+    def timer(self, stage: str, **fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_timing(stage, time.perf_counter() - start, start, **fields)
+
+    def record_timing(self, stage: str, seconds: float, start: Optional[float] = None, **fields) -> None:
+        """Stores a duration measured elsewhere; `start` is a `time.perf_counter()` value (default: now - seconds)."""
+        start = time.perf_counter() - seconds if start is None else start
+        self.timings.append({'stage': stage, 'offset_s': start - self.started_at, 'seconds': seconds, **fields})
+        self._emit('timing', stage=stage, seconds=round(seconds, 6), **fields)
+
+    def count(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+        self._emit('counter', name=name, value=value)
+
+    def record_solver(self, stage: str, stats: Dict[str, Any]) -> None:
+        """Stores a solver's `search_stats`, including its (seconds, objective) improvement history."""
+        self.solver_runs.append({'stage': stage, **stats})
+        self._emit('solver', stage=stage, **stats)
+
+    def stage_summary(self) -> pd.DataFrame:
+        if not self.timings:
+            return pd.DataFrame(columns=['stage', 'calls', 'total_ms', 'max_ms'])
+        frame = pd.DataFrame(list(self.timings))
+        summary = frame.groupby('stage', sort=False)['seconds'].agg(['count', 'sum', 'max']).reset_index()
+        summary.columns = ['stage', 'calls', 'total_ms', 'max_ms']
+        summary[['total_ms', 'max_ms']] *= 1000
+        return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'run_id': self.run_id, 'timings': list(self.timings), 'counters': dict(self.counters),
+                'solver_runs': list(self.solver_runs)}
+
+
+_current: contextvars.ContextVar[MetricsRecorder] = contextvars.ContextVar('metrics_recorder',
+                                                                           default=MetricsRecorder('global'))
+
+
+def current_recorder() -> MetricsRecorder:
+    return _current.get()
+
+
+def start_run(run_id: Optional[str] = None) -> MetricsRecorder:
+    """Makes a fresh recorder current for the calling thread/context and returns it."""
+    recorder = MetricsRecorder(run_id)
+    _current.set(recorder)
+    return recorder
+
+
+def timed(stage: str) -> Callable:
+    """Decorator timing every call of the function under `stage` on the current recorder."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with current_recorder().timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timer(stage: str, **fields):
+    return current_recorder().timer(stage, **fields)
+
+
+def count(name: str, value: float = 1) -> None:
+    current_recorder().count(name, value)
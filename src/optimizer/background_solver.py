@@ -0,0 +1,92 @@
+# src/optimizer/background_solver.py
+import multiprocessing as mp
+import queue
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from src.models.data_models import Farm, Market, Truck
+from src.models.compact_network import NetworkLike, as_compact
+from src.optimizer.vrp_solver import VRPSolver, TimeWindowSettings, DEFAULT_TIME_LIMIT_SECONDS
+
+
+def _run_solve(markets, trucks, network, time_limit, initial_solution, updates, stop_event, farms=None,
+               time_windows=None):
+    start = time.perf_counter()
+    solver = VRPSolver(markets=markets, trucks=trucks, road_network=network, farms=farms, time_windows=time_windows)
+
+    def publish(solution: Dict[str, Any], objective: int):
+        updates.put(('progress', time.perf_counter() - start, objective, solution))
+
+    try:
+        result = solver.solve(time_limit, on_solution=publish, should_stop=stop_event.is_set,
+                              initial_solution=initial_solution)
+        updates.put(('done', time.perf_counter() - start, solver.search_stats['objective'], result))
+    except Exception as exc:
+        updates.put(('failed', time.perf_counter() - start, None, {"error": f"Solver crashed: {exc}"}))
+
+
+class BackgroundSolveJob:
+    """Runs VRPSolver.solve in a separate process and streams each improving solution back.
+
+    OR-Tools holds the GIL for most of the search, so a thread would freeze the Streamlit script;
+    a process keeps the UI responsive. Call `poll()` to pull updates and `stop()` to end early.
+    """
+
+    def __init__(self, markets: List[Market], trucks: List[Truck], road_network: NetworkLike,
+                 time_limit: int = DEFAULT_TIME_LIMIT_SECONDS, key: Optional[str] = None,
+                 initial_solution: Optional[Dict[str, Any]] = None, farms: Optional[List[Farm]] = None,
+                 time_windows: Optional[TimeWindowSettings] = None):
+        self.key = key
+        self.time_limit = time_limit
+        self.status = 'running'
+        self.best_solution: Optional[Dict[str, Any]] = None
+        self.best_objective: Optional[int] = None
+        self.history: List[Tuple[float, int]] = []
+        self.result: Optional[Dict[str, Any]] = None
+
+        # Ship only the arcs this solve needs, not a (possibly memory-mapped) full network.
+        network = as_compact(road_network).subset([trucks[0].home_depot_id] + [m.id for m in markets])
+        context = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+        self._updates = context.Queue()
+        self._stop_event = context.Event()
+        self._process = context.Process(
+            target=_run_solve, daemon=True,
+            args=(markets, trucks, network, time_limit, initial_solution, self._updates, self._stop_event, farms,
+                  time_windows)
+        )
+        self._process.start()
+
+    @property
+    def running(self) -> bool:
+        return self.status == 'running'
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                kind, elapsed, objective, solution = self._updates.get_nowait()
+            except queue.Empty:
+                return
+            if kind == 'progress':
+                self.history.append((elapsed, objective))
+                self.best_solution, self.best_objective = solution, objective
+            else:
+                self.result = solution
+                self.status = 'failed' if kind == 'failed' else ('stopped' if self._stop_event.is_set() else 'done')
+
+    def poll(self) -> 'BackgroundSolveJob':
+        if not self.running:
+            return self
+        self._drain()
+        if self.running and not self._process.is_alive():
+            self._drain()
+            if self.running:
+                self.status, self.result = 'failed', {"error": "Solver process exited unexpectedly."}
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def cancel(self) -> None:
+        self._stop_event.set()
+        if self._process.is_alive():
+            self._process.terminate()
+        self.status = 'stopped'
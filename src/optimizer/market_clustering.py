@@ -0,0 +1,104 @@
+# src/optimizer/market_clustering.py
+from typing import List, Optional, Tuple
+import numpy as np
+from src.models.data_models import Market, Truck
+from src.models.spatial_index import SpatialIndex, nearest
+from src.optimizer.settings import DEFAULT_MAX_CLUSTER_SIZE
+
+KMEANS_ITERATIONS = 25
+
+
+def kmeans(points: np.ndarray, k: int, weights: np.ndarray, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Weighted Lloyd iterations with k-means++ seeding; nearest-centroid lookups go through a KD-tree."""
+    rng = np.random.default_rng(seed)
+    centroids = [points[rng.integers(len(points))]]
+    nearest_sq = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        centroids.append(points[rng.choice(len(points), p=nearest_sq / nearest_sq.sum())
+                                if nearest_sq.sum() > 0 else rng.integers(len(points))])
+        nearest_sq = np.minimum(nearest_sq, ((points - centroids[-1]) ** 2).sum(axis=1))
+    centroids = np.array(centroids)
+
+    labels = np.full(len(points), -1)
+    for _ in range(KMEANS_ITERATIONS):
+        new_labels = nearest(points, centroids)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        centroids = update_centroids(points, labels, weights, centroids)
+    return centroids, labels
+
+
+def update_centroids(points: np.ndarray, labels: np.ndarray, weights: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    k = len(previous)
+    mass = np.bincount(labels, weights=weights, minlength=k)
+    sums = np.column_stack([np.bincount(labels, weights=weights * points[:, axis], minlength=k) for axis in range(3)])
+    # Empty clusters keep their old centre rather than collapsing to the origin.
+    return np.where(mass[:, None] > 0, sums / np.maximum(mass, 1e-12)[:, None], previous)
+
+
+def allocate_trucks(cluster_demand: np.ndarray, capacities: np.ndarray) -> np.ndarray:
+    """Gives every cluster one truck, then hands the rest out largest-first to the cluster short of the most
+    capacity. Returns the cluster index of each truck."""
+    truck_cluster = np.full(len(capacities), -1)
+    assigned = np.zeros(len(cluster_demand))
+    order = np.argsort(-capacities, kind='stable')
+    for truck, cluster in zip(order, np.argsort(-cluster_demand, kind='stable')):
+        truck_cluster[truck], assigned[cluster] = cluster, capacities[truck]
+    for truck in order[len(cluster_demand):]:
+        cluster = int(np.argmax(cluster_demand - assigned))
+        truck_cluster[truck] = cluster
+        assigned[cluster] += capacities[truck]
+    return truck_cluster
+
+
+def capacitated_assignment(points: np.ndarray, demands: np.ndarray, centroids: np.ndarray,
+                           capacity: np.ndarray) -> np.ndarray:
+    """Nearest feasible centroid per market; markets with the most to lose from a detour are placed first."""
+    chord = ((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+    preference = np.argsort(chord, axis=1, kind='stable')
+    ranked = np.take_along_axis(chord, preference, axis=1)
+    regret = ranked[:, 1] - ranked[:, 0] if len(centroids) > 1 else np.zeros(len(points))
+
+    remaining = capacity.astype(np.float64).copy()
+    labels = np.empty(len(points), dtype=np.int64)
+    for m in np.argsort(-regret, kind='stable'):
+        for c in preference[m]:
+            if remaining[c] >= demands[m]:
+                break
+        else:
+            c = int(np.argmax(remaining))
+        remaining[c] -= demands[m]
+        labels[m] = c
+    return labels
+
+
+def cluster_markets(markets: List[Market], trucks: List[Truck], max_cluster_size: int = DEFAULT_MAX_CLUSTER_SIZE,
+                    seed: int = 0, index: Optional[SpatialIndex] = None) -> List[Tuple[List[Market], List[Truck]]]:
+    """Splits a large instance into geographic groups of markets, each with trucks whose capacity covers it.
+
+    The number of groups is bounded by the fleet size, since every group needs at least one truck. `index` is
+    a `SpatialIndex` covering the markets (the map's, say); one over the markets is built when not given.
+    """
+    k = min(max(1, -(-len(markets) // max_cluster_size)), len(trucks))
+    if k <= 1:
+        return [(markets, trucks)]
+
+    index = index or SpatialIndex.from_locations([], markets)
+    points = index.points([m.id for m in markets])
+    demands = np.array([m.demand_weight for m in markets], dtype=np.float64)
+    capacities = np.array([t.capacity_weight for t in trucks], dtype=np.float64)
+
+    centroids, labels = kmeans(points, k, demands, seed)
+    for _ in range(2):
+        truck_cluster = allocate_trucks(np.bincount(labels, weights=demands, minlength=k), capacities)
+        labels = capacitated_assignment(points, demands, centroids,
+                                        np.bincount(truck_cluster, weights=capacities, minlength=k))
+        centroids = update_centroids(points, labels, demands, centroids)
+
+    groups = []
+    for c in range(k):
+        group_markets = [markets[i] for i in np.flatnonzero(labels == c)]
+        if group_markets:
+            groups.append((group_markets, [trucks[i] for i in np.flatnonzero(truck_cluster == c)]))
+    return groups
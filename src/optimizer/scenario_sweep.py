@@ -0,0 +1,123 @@
+# src/optimizer/scenario_sweep.py
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+from src.data_manager.config_manager import ConfigManager
+from src.calculator.cost_calculator import calculate_fleet_costs
+from src.calculator.route_table import RouteTable
+from src.models.data_models import Market, Truck
+from src.models.compact_network import CompactRoadNetwork
+from src.optimizer.solution_cache import SolutionCache
+from src.optimizer.settings import DEFAULT_TIME_LIMIT_SECONDS, solve_mode, solver_params
+from src.optimizer.vrp_solver import solve_routes
+
+
+class ScenarioGrid(BaseModel):
+    """Cartesian grid of what-if inputs; empty rate lists fall back to the value in config.json."""
+    truck_subsets: List[List[str]]
+    fuel_cost_per_liter: List[float] = []
+    maintenance_cost_per_km: List[float] = []
+    driver_wage_per_hour: List[float] = []
+    time_limits: List[int] = [DEFAULT_TIME_LIMIT_SECONDS]
+    multi_depot: List[bool] = [False]
+
+
+RoutingKey = Tuple[Tuple[str, ...], int, bool]
+
+
+def expand_grid(grid: ScenarioGrid, config: ConfigManager) -> List[Dict[str, Any]]:
+    rates = config.get_variable_costs()
+    axes = [
+        [tuple(subset) for subset in grid.truck_subsets],
+        grid.fuel_cost_per_liter or [rates['fuel_cost_per_liter']],
+        grid.maintenance_cost_per_km or [rates['maintenance_cost_per_km']],
+        grid.driver_wage_per_hour or [rates['driver_wage_per_hour']],
+        grid.time_limits,
+        grid.multi_depot,
+    ]
+    return [
+        {'scenario_id': i, 'truck_ids': subset, 'fuel_cost_per_liter': fuel, 'maintenance_cost_per_km': maintenance,
+         'driver_wage_per_hour': wage, 'time_limit': time_limit, 'multi_depot': multi_depot}
+        for i, (subset, fuel, maintenance, wage, time_limit, multi_depot) in enumerate(itertools.product(*axes))
+    ]
+
+
+def routing_key(scenario: Dict[str, Any]) -> RoutingKey:
+    # Cost rates never change the routes (the objective is pure distance), so they are not part of the key.
+    return scenario['truck_ids'], scenario['time_limit'], scenario['multi_depot']
+
+
+def _solve_routing(args: Tuple[List[Market], List[Truck], CompactRoadNetwork, int, str]) -> Dict[str, Any]:
+    markets, trucks, network, time_limit, mode = args
+    return solve_routes(markets, trucks, network, mode=mode, time_limit=time_limit, max_workers=1)
+
+
+def run_sweep(grid: ScenarioGrid, markets: List[Market], trucks: List[Truck], road_network: CompactRoadNetwork,
+              config: ConfigManager, max_workers: Optional[int] = None,
+              solution_cache: Optional[SolutionCache] = None) -> pd.DataFrame:
+    """Solves every distinct routing sub-problem of the grid once, then prices all scenarios against it."""
+    scenarios = expand_grid(grid, config)
+    truck_map = {t.id: t for t in trucks}
+    unknown = {truck_id for s in scenarios for truck_id in s['truck_ids'] if truck_id not in truck_map}
+    if unknown:
+        raise ValueError(f"Unknown truck ids in scenario grid: {sorted(unknown)}")
+
+    keys = list(dict.fromkeys(routing_key(s) for s in scenarios))
+    solutions: Dict[RoutingKey, Dict[str, Any]] = {}
+    pending, cache_keys = [], {}
+    for key in keys:
+        subset, time_limit, multi_depot = key
+        key_trucks = [truck_map[truck_id] for truck_id in subset]
+        if not key_trucks:
+            solutions[key] = {"error": "No trucks selected."}
+            continue
+        # Same mode choice and key as the dashboard and the service, so all of them share cached routes.
+        mode = solve_mode(len(markets), multi_depot)
+        cache_keys[key] = SolutionCache.make_key(markets, key_trucks, road_network,
+                                                 solver_params(mode, time_limit))
+        cached = solution_cache.get(cache_keys[key]) if solution_cache else None
+        if cached is not None:
+            solutions[key] = cached
+        else:
+            # Workers get only the arcs they need rather than a pickled copy of the full network.
+            loc_ids = list(dict.fromkeys([t.home_depot_id for t in key_trucks] + [m.id for m in markets]))
+            pending.append((key, (markets, key_trucks, road_network.subset(loc_ids), time_limit, mode)))
+
+    workers = min(len(pending), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_routing, [args for _, args in pending]))
+    else:
+        results = [_solve_routing(args) for _, args in pending]
+    for (key, _), solution in zip(pending, results):
+        solutions[key] = solution
+        if solution_cache and not solution.get("error"):
+            solution_cache.put(cache_keys[key], solution)
+
+    # Price every feasible scenario in one vectorized pass: routes are stacked per scenario and the
+    # scenario's rates are gathered onto its routes.
+    feasible = [s for s in scenarios if not solutions[routing_key(s)].get("error")]
+    routes = RouteTable.from_solutions([solutions[routing_key(s)] for s in feasible], road_network)
+    rates = {k: np.array([s[k] for s in feasible], dtype=np.float64)[routes.scenario]
+             for k in ('fuel_cost_per_liter', 'maintenance_cost_per_km', 'driver_wage_per_hour')}
+    fleet_costs = calculate_fleet_costs(routes, trucks, rates)
+    totals = fleet_costs.groupby('scenario').agg(
+        total_overall_cost=('total_cost', 'sum'), total_fuel_cost=('fuel_cost', 'sum'),
+        total_maintenance_cost=('maintenance_cost', 'sum'), total_driver_cost=('driver_cost', 'sum'),
+        trucks_used=('truck_id', 'size'), co2_kg=('co2_kg', 'sum'),
+    )
+    totals.index = [feasible[i]['scenario_id'] for i in totals.index]
+
+    rows = []
+    for scenario in scenarios:
+        solution = solutions[routing_key(scenario)]
+        row = {**scenario, 'truck_ids': ','.join(scenario['truck_ids']), 'num_trucks': len(scenario['truck_ids']),
+               'error': solution.get('error')}
+        if not solution.get("error"):
+            row.update(total_distance_km=solution['total_distance'], total_load_kg=solution['total_load'])
+        rows.append(row)
+    return pd.DataFrame(rows).join(totals, on='scenario_id')
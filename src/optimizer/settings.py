@@ -0,0 +1,46 @@
+# src/optimizer/settings.py
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pydantic import BaseModel
+from src.data_manager.config_manager import ConfigManager
+from src.models.data_models import Truck
+
+# Solver options live apart from vrp_solver so that pages can build cache keys without importing OR-Tools.
+DEFAULT_TIME_LIMIT_SECONDS = 30
+# Local search operators only look at this many nearest nodes once an instance is large enough for it to matter.
+DEFAULT_NUM_NEIGHBORS = 40
+# Instances with more markets are split by market_clustering and solved group by group.
+DEFAULT_MAX_CLUSTER_SIZE = 150
+
+
+class TimeWindowSettings(BaseModel):
+    """Options for the Time dimension. `late_penalty_per_minute` is in objective units (1/100 km)."""
+    start_time: str = "07:00"
+    service_minutes: int = 20
+    late_penalty_per_minute: int = 0
+    max_route_hours: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: ConfigManager, trucks: List[Truck], **overrides) -> 'TimeWindowSettings':
+        # Express the $/min lateness penalty in km of driving at the fleet's average variable cost per km.
+        rates = config.get_variable_costs()
+        avg_consumption = float(np.mean([t.avg_fuel_consumption_L_per_100km for t in trucks])) if trucks else 0.0
+        cost_per_km = avg_consumption / 100 * rates['fuel_cost_per_liter'] + rates['maintenance_cost_per_km']
+        penalty = config.get_param('optimization_constraints', 'penalty_late_delivery_per_minute', 0.0)
+        settings = {
+            'late_penalty_per_minute': int(round(penalty / cost_per_km * 100)) if cost_per_km > 0 else 0,
+            'max_route_hours': config.get_param('optimization_constraints', 'max_driving_hours_per_day'),
+        }
+        return cls(**{**settings, **overrides})
+
+
+def solve_mode(num_markets: int, multi_depot: bool = False) -> str:
+    # Past a few hundred markets a single dense model is too slow to build and search; split it up instead.
+    if multi_depot:
+        return 'multi_depot'
+    return 'clustered' if num_markets > DEFAULT_MAX_CLUSTER_SIZE else 'single_depot'
+
+
+def solver_params(mode: str, time_limit: int, time_windows: Optional[TimeWindowSettings] = None) -> Dict[str, Any]:
+    """The solver inputs that are part of a `SolutionCache` key, shared by the dashboard and the service."""
+    return {'mode': mode, 'time_limit': time_limit, 'time_windows': time_windows.model_dump() if time_windows else None}
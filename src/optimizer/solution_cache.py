@@ -0,0 +1,79 @@
+# src/optimizer/solution_cache.py
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+from src.models.data_models import Market, Truck
+from src.models.compact_network import CompactRoadNetwork
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get('OPSDASH_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'opsdash_solution_cache'))
+
+
+def hash_payload(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SolutionCache:
+    """Persistent, content-addressed store of solver outputs shared by every process using `cache_dir`."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = 500, max_bytes: int = 256 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(markets: List[Market], trucks: List[Truck], network: CompactRoadNetwork,
+                 solver_params: Dict[str, Any]) -> str:
+        # Truck order is part of the key: it fixes the vehicle numbering the solver sees.
+        return hash_payload({
+            'version': CACHE_VERSION,
+            'markets': [m.model_dump() for m in markets],
+            'trucks': [t.model_dump() for t in trucks],
+            'network': network.fingerprint(),
+            'solver': solver_params,
+        })
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                solution = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # mtime doubles as the LRU clock
+        except OSError:
+            pass  # evicted by another process since the read; the solution is still good
+        return solution
+
+    def put(self, key: str, solution: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(solution, f)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort(reverse=True)
+        total_bytes = 0
+        for position, (_, size, name) in enumerate(entries):
+            total_bytes += size
+            if position >= self.max_entries or total_bytes > self.max_bytes:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
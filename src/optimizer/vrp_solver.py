@@ -1,71 +1,239 @@
 # src/optimizer/vrp_solver.py
 from ortools.constraint_solver import routing_enums_pb2, pywrapcp
-from typing import List, Dict, Any
-from src.models.data_models import Market, Truck, RoadNetwork
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import os
+import numpy as np
+from src.models.data_models import Farm, Market, MarketDelta, Truck
+from src.models.compact_network import CompactRoadNetwork, NetworkLike, as_compact
+from src.models.spatial_index import SpatialIndex
+from src.models.time_windows import OPEN_WINDOW_END, parse_clock, parse_time_windows
+from src.optimizer.market_clustering import cluster_markets
+from src.optimizer.settings import (DEFAULT_MAX_CLUSTER_SIZE, DEFAULT_NUM_NEIGHBORS, DEFAULT_TIME_LIMIT_SECONDS,
+                                    TimeWindowSettings, solve_mode)
+from src.monitoring import metrics
+
+# Bounds the local search after an incremental update (improving 2-opt moves per changed route).
+DEFAULT_TWO_OPT_MOVES = 50
+IMPROVEMENT_EPSILON = 1e-6
 
 
 class VRPSolver:
-    def __init__(self, markets: List[Market], trucks: List[Truck], road_network: RoadNetwork):
+    def __init__(self, markets: List[Market], trucks: List[Truck], road_network: NetworkLike,
+                 farms: Optional[List[Farm]] = None, time_windows: Optional[TimeWindowSettings] = None,
+                 depot_id: Optional[str] = None):
         self.markets = markets
         self.trucks = trucks
-        self.road_network = road_network.matrix
+        # Every route starts and ends here; the first truck's home depot unless given.
+        self.depot_id = depot_id or trucks[0].home_depot_id
+        self.network = as_compact(road_network)
+        self.farms = farms or []
+        self.time_windows = time_windows
         self._build_data_model()
 
+    @metrics.timed('solver.build_model')
     def _build_data_model(self):
         self.data = {}
-        depot_id = self.trucks[0].home_depot_id
+        depot_id = self.depot_id
 
         self.locations = [depot_id] + [m.id for m in self.markets]
         self.location_map = {loc_id: i for i, loc_id in enumerate(self.locations)}
-        num_locations = len(self.locations)
 
-        self.data['distance_matrix'] = [[0] * num_locations for _ in range(num_locations)]
-        for from_node in self.locations:
-            for to_node in self.locations:
-                from_idx = self.location_map[from_node]
-                to_idx = self.location_map[to_node]
-                self.data['distance_matrix'][from_idx][to_idx] = int(
-                    self.road_network.get(from_node, {}).get(to_node, {}).get('distance', 0) * 100)
+        distance_km = self.network.submatrix(self.locations, 'distance').astype(np.float64)
+        self.distance_matrix = np.rint(distance_km * 100).astype(np.int64)
+        self.data['distance_matrix'] = self.distance_matrix.tolist()
 
         self.data['demands'] = [0] + [int(m.demand_weight) for m in self.markets]
         self.data['vehicle_capacities'] = [int(t.capacity_weight) for t in self.trucks]
         self.data['num_vehicles'] = len(self.trucks)
         self.data['depot'] = 0
 
-    def solve(self) -> Dict[str, Any]:
+        if self.time_windows:
+            self._build_time_data(depot_id)
+
+    def _build_time_data(self, depot_id: str):
+        settings = self.time_windows
+        service = np.full(len(self.locations), settings.service_minutes, dtype=np.int64)
+        service[0] = 0
+        travel = self.network.submatrix(self.locations, 'time').astype(np.int64)
+        # Transit out of a node = its service time + travel, so the dimension needs no callback.
+        self.data['time_matrix'] = (travel + service[:, None]).tolist()
+
+        farm_windows = {f.id: f.loading_time_window for f in self.farms}
+        starts, ends = parse_time_windows([farm_windows.get(depot_id, '')] +
+                                          [m.service_time_window for m in self.markets])
+        starts[0] = max(int(starts[0]), parse_clock(settings.start_time))
+        self.data['time_window_starts'], self.data['time_window_ends'] = starts.tolist(), ends.tolist()
+
+        route_hours = [t.driver_hours_limit if settings.max_route_hours is None
+                       else min(t.driver_hours_limit, settings.max_route_hours) for t in self.trucks]
+        self.data['max_route_minutes'] = [int(hours * 60) for hours in route_hours]
+
+    def _add_time_dimension(self, manager, routing):
+        time_transit_index = routing.RegisterTransitMatrix(self.data['time_matrix'])
+        routing.AddDimension(time_transit_index, OPEN_WINDOW_END, OPEN_WINDOW_END, False, 'Time')
+        time_dimension = routing.GetDimensionOrDie('Time')
+        starts, ends = self.data['time_window_starts'], self.data['time_window_ends']
+        penalty = self.time_windows.late_penalty_per_minute
+
+        for node in range(1, len(self.locations)):
+            cumul = time_dimension.CumulVar(manager.NodeToIndex(node))
+            cumul.SetMin(starts[node])  # arriving early means waiting, absorbed by the dimension slack
+            if penalty > 0 and ends[node] < OPEN_WINDOW_END:
+                time_dimension.SetCumulVarSoftUpperBound(manager.NodeToIndex(node), ends[node], penalty)
+
+        for vehicle in range(self.data['num_vehicles']):
+            time_dimension.CumulVar(routing.Start(vehicle)).SetRange(starts[0], ends[0])
+            time_dimension.SetSpanUpperBoundForVehicle(self.data['max_route_minutes'][vehicle], vehicle)
+            routing.AddVariableMinimizedByFinalizer(time_dimension.CumulVar(routing.Start(vehicle)))
+            routing.AddVariableMinimizedByFinalizer(time_dimension.CumulVar(routing.End(vehicle)))
+
+    def solve(self, time_limit: int = DEFAULT_TIME_LIMIT_SECONDS, use_matrix_evaluators: bool = True,
+              on_solution: Optional[Callable[[Dict[str, Any], int], None]] = None,
+              should_stop: Optional[Callable[[], bool]] = None,
+              initial_solution: Optional[Dict[str, Any]] = None,
+              num_neighbors: Optional[int] = None) -> Dict[str, Any]:
+        """`on_solution` receives every improving solution (formatted like the result) and its objective;
+        `should_stop` is polled by the search and ends it early, keeping the best solution so far.
+        `initial_solution` is a prior result in the same `routes` format to warm-start from.
+        `num_neighbors` restricts local search moves to each node's nearest neighbours."""
         manager = pywrapcp.RoutingIndexManager(len(self.data['distance_matrix']), self.data['num_vehicles'],
                                                self.data['depot'])
         routing = pywrapcp.RoutingModel(manager)
 
-        def distance_callback(from_index, to_index):
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return self.data['distance_matrix'][from_node][to_node]
+        if use_matrix_evaluators:
+            # Evaluated in C++ straight from the node-indexed tables, no Python call per arc.
+            transit_callback_index = routing.RegisterTransitMatrix(self.data['distance_matrix'])
+            demand_callback_index = routing.RegisterUnaryTransitVector(self.data['demands'])
+        else:
+            def distance_callback(from_index, to_index):
+                from_node = manager.IndexToNode(from_index)
+                to_node = manager.IndexToNode(to_index)
+                return self.data['distance_matrix'][from_node][to_node]
 
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
-        routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+            def demand_callback(from_index):
+                from_node = manager.IndexToNode(from_index)
+                return self.data['demands'][from_node]
 
-        def demand_callback(from_index):
-            from_node = manager.IndexToNode(from_index)
-            return self.data['demands'][from_node]
+            transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+            demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
 
-        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
         routing.AddDimensionWithVehicleCapacity(
             demand_callback_index, 0, self.data['vehicle_capacities'], True, 'Capacity'
         )
+        if self.time_windows:
+            self._add_time_dimension(manager, routing)
+
+        solutions_found, best_objective, history = [0], [None], []
+
+        def at_solution():
+            solutions_found[0] += 1
+            objective = routing.CostVar().Value()
+            if best_objective[0] is None or objective < best_objective[0]:
+                best_objective[0] = objective
+                history.append((routing.solver().WallTime() / 1000, objective))
+                if on_solution:
+                    on_solution(self._format_solution(manager, routing, _CurrentAssignment), objective)
+
+        routing.AddAtSolutionCallback(at_solution)
+        if should_stop:
+            stop_limit = routing.solver().CustomLimit(should_stop)
+            routing.AddSearchMonitor(stop_limit)
 
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
         search_parameters.first_solution_strategy = (routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC)
         search_parameters.local_search_metaheuristic = (routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH)
-        search_parameters.time_limit.FromSeconds(30)
+        search_parameters.time_limit.FromSeconds(time_limit)
+        if num_neighbors and num_neighbors < len(self.locations):
+            search_parameters.ls_operator_neighbors_ratio = num_neighbors / len(self.locations)
+            search_parameters.ls_operator_min_neighbors = num_neighbors
 
-        solution = routing.SolveWithParameters(search_parameters)
+        initial_assignment = None
+        if initial_solution and initial_solution.get('routes'):
+            routing.CloseModelWithParameters(search_parameters)
+            initial_assignment = routing.ReadAssignmentFromRoutes(self.warm_start_routes(initial_solution), True)
+
+        with metrics.timer('solver.search', nodes=len(self.locations), vehicles=self.data['num_vehicles']):
+            if initial_assignment:
+                solution = routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+            else:
+                solution = routing.SolveWithParameters(search_parameters)
+        self.search_stats = {
+            'warm_started': initial_assignment is not None,
+            'wall_time_ms': routing.solver().WallTime(), 'branches': routing.solver().Branches(),
+            'failures': routing.solver().Failures(), 'solutions_found': solutions_found[0],
+            'objective': solution.ObjectiveValue() if solution else None,
+            'history': history,
+        }
+        metrics.current_recorder().record_solver('solver.search', self.search_stats)
 
         if solution:
             return self._format_solution(manager, routing, solution)
         else:
             return {"error": "No solution found."}
 
+    def warm_start_routes(self, prior_solution: Dict[str, Any]) -> List[List[int]]:
+        """Maps a prior solution onto this model's nodes and vehicles, repairing it for the current data.
+
+        Markets that no longer exist are dropped, routes of removed trucks are released, overloaded
+        routes shed their most expensive stops, and every unplaced market is added by cheapest insertion.
+        """
+        distance = self.distance_matrix
+        demands, capacities = self.data['demands'], self.data['vehicle_capacities']
+        vehicle_of_truck = {t.id: v for v, t in enumerate(self.trucks)}
+        routes = [[] for _ in range(self.data['num_vehicles'])]
+        placed = set()
+
+        for truck_id, route_data in prior_solution.get('routes', {}).items():
+            vehicle = vehicle_of_truck.get(truck_id)
+            if vehicle is None:
+                continue
+            for loc_id in route_data['route']:
+                node = self.location_map.get(loc_id)
+                if node and node not in placed:
+                    routes[vehicle].append(node)
+                    placed.add(node)
+
+        loads = [sum(demands[node] for node in route) for route in routes]
+        for vehicle, route in enumerate(routes):
+            while loads[vehicle] > capacities[vehicle] and route:
+                node = route.pop(int(np.argmax(removal_savings(route, distance))))
+                loads[vehicle] -= demands[node]
+                placed.discard(node)
+
+        unplaced = sorted((n for n in range(1, len(self.locations)) if n not in placed), key=lambda n: -demands[n])
+        for node in unplaced:
+            cheapest_insertion(routes, loads, node, demands[node], capacities, distance)
+        return routes
+
+    def apply_delta(self, prior_solution: Dict[str, Any], delta: MarketDelta,
+                    max_two_opt_moves: int = DEFAULT_TWO_OPT_MOVES) -> Dict[str, Any]:
+        """Incrementally updates `prior_solution` for intra-day market changes (see `apply_market_delta`)
+        and brings this solver's markets and model up to date, so `solve(initial_solution=...)` can polish it.
+
+        Use `apply_market_delta` directly when no further solve is planned: it never builds the dense model.
+        """
+        solution = apply_market_delta(prior_solution, delta, self.markets, self.trucks, self.network,
+                                      max_two_opt_moves)
+        if not solution.get('error'):
+            self.markets = delta.apply_to(self.markets)
+            self._build_data_model()
+        return solution
+
+    @metrics.timed('solver.multi_depot')
+    def solve_multi_depot(self, time_limit: int = DEFAULT_TIME_LIMIT_SECONDS,
+                          max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Splits markets across the trucks' home depots and solves each depot in its own process."""
+        subproblems = []
+        for depot_id, depot_markets in assign_markets_to_depots(self.markets, self.trucks, self.network).items():
+            depot_trucks = [t for t in self.trucks if t.home_depot_id == depot_id]
+            if depot_markets:
+                sub_network = self.network.subset([depot_id] + [m.id for m in depot_markets])
+                subproblems.append((depot_markets, depot_trucks, sub_network, time_limit, self.farms,
+                                    self.time_windows, None, depot_id))
+        return merge_solutions(solve_subproblems(subproblems, max_workers))
+
     def _format_solution(self, manager, routing, solution) -> Dict[str, Any]:
         output = {'routes': {}, 'total_distance': 0, 'total_load': 0}
         for vehicle_id in range(self.data['num_vehicles']):
@@ -85,8 +253,311 @@ class VRPSolver:
                     'route': [self.locations[self.data['depot']]] + route_nodes + [self.locations[self.data['depot']]],
                     'distance_m': route_distance, 'load_kg': route_load
                 }
+                if self.time_windows:
+                    time_dimension = routing.GetDimensionOrDie('Time')
+                    output['routes'][truck_id]['start_min'] = solution.Value(
+                        time_dimension.CumulVar(routing.Start(vehicle_id)))
                 output['total_distance'] += route_distance
                 output['total_load'] += route_load
 
         output['total_distance'] /= 100
-        return output
\ No newline at end of file
+        return output
+
+
+class _CurrentAssignment:
+    """Stands in for an Assignment inside solution callbacks, where variables are already bound."""
+
+    @staticmethod
+    def Value(var) -> int:
+        return var.Value()
+
+
+def removal_savings(route: List[int], distance: np.ndarray, depot: int = 0) -> np.ndarray:
+    """Distance saved by removing each stop of a depot-to-depot route."""
+    path = np.array([depot] + route + [depot])
+    prev_nodes, nodes, next_nodes = path[:-2], path[1:-1], path[2:]
+    return distance[prev_nodes, nodes] + distance[nodes, next_nodes] - distance[prev_nodes, next_nodes]
+
+
+def best_insertion(routes: List[List[int]], loads: List[int], node: int, demand: int, capacities: List[int],
+                   distance: np.ndarray, depots: Optional[List[int]] = None) -> Optional[Tuple[float, int, int]]:
+    """Cheapest capacity-feasible (added distance, vehicle, position) for `node`, or None if no route has room.
+    Routes start and end at node 0 unless per-vehicle `depots` are given."""
+    best = None
+    for vehicle, route in enumerate(routes):
+        if loads[vehicle] + demand > capacities[vehicle]:
+            continue
+        depot = depots[vehicle] if depots else 0
+        path = np.array([depot] + route + [depot])
+        delta = distance[path[:-1], node] + distance[node, path[1:]] - distance[path[:-1], path[1:]]
+        position = int(np.argmin(delta))
+        if best is None or delta[position] < best[0]:
+            best = (float(delta[position]), vehicle, position)
+    return best
+
+
+def cheapest_insertion(routes: List[List[int]], loads: List[int], node: int, demand: int,
+                       capacities: List[int], distance: np.ndarray, depots: Optional[List[int]] = None) -> bool:
+    """Inserts `node` at its cheapest capacity-feasible position; returns False if no route has room."""
+    best = best_insertion(routes, loads, node, demand, capacities, distance, depots)
+    if best is None:
+        return False
+    _, vehicle, position = best
+    routes[vehicle].insert(position, node)
+    loads[vehicle] += demand
+    return True
+
+
+def two_opt(route: List[int], distance: np.ndarray, depot: int = 0,
+            max_moves: int = DEFAULT_TWO_OPT_MOVES) -> Tuple[List[int], int]:
+    """Best-improvement 2-opt on one depot-to-depot route, all candidate moves scored at once per step.
+
+    The reversed segment is re-costed in its new direction, so asymmetric distances are handled.
+    Returns the route and the number of improving moves made (at most `max_moves`).
+    """
+    moves = 0
+    while moves < max_moves and len(route) > 1:
+        path = np.array([depot] + route + [depot])
+        d = distance[np.ix_(path, path)].astype(np.float64)
+        steps = np.arange(len(path) - 1)
+        forward, backward = d[steps, steps + 1], d[steps + 1, steps]
+        cum_forward = np.concatenate([[0.0], np.cumsum(forward)])
+        cum_backward = np.concatenate([[0.0], np.cumsum(backward)])
+        # Replace arcs (i, i+1) and (j, j+1) by (i, j) and (i+1, j+1), reversing path[i+1..j].
+        i, j = np.triu_indices(len(path) - 1, k=2)
+        gain = (forward[i] + forward[j] - d[i, j] - d[i + 1, j + 1]
+                + (cum_forward[j] - cum_forward[i + 1]) - (cum_backward[j] - cum_backward[i + 1]))
+        best = int(np.argmax(gain)) if len(gain) else -1
+        if best < 0 or gain[best] <= IMPROVEMENT_EPSILON:
+            break
+        start, end = i[best], j[best]
+        route = route[:start] + route[start:end][::-1] + route[end:]
+        moves += 1
+    return route, moves
+
+
+def relocate(routes: List[List[int]], loads: List[int], nodes: List[int], demands: Dict[int, int],
+             capacities: List[int], distance: np.ndarray, depots: List[int]) -> set:
+    """Moves each of `nodes` to its cheapest position in any route if that shortens the plan.
+    Returns the vehicles whose routes changed."""
+    changed = set()
+    for node in nodes:
+        vehicle = next((v for v, route in enumerate(routes) if node in route), None)
+        if vehicle is None:
+            continue
+        position = routes[vehicle].index(node)
+        saving = float(removal_savings(routes[vehicle], distance, depots[vehicle])[position])
+        routes[vehicle].pop(position)
+        loads[vehicle] -= demands[node]
+        cost, new_vehicle, new_position = best_insertion(routes, loads, node, demands[node], capacities, distance,
+                                                         depots)
+        if cost < saving - IMPROVEMENT_EPSILON:
+            changed.update((vehicle, new_vehicle))
+            vehicle, position = new_vehicle, new_position
+        routes[vehicle].insert(position, node)
+        loads[vehicle] += demands[node]
+    return changed
+
+
+@metrics.timed('solver.incremental')
+def apply_market_delta(prior_solution: Dict[str, Any], delta: MarketDelta, markets: List[Market],
+                       trucks: List[Truck], road_network: NetworkLike,
+                       max_two_opt_moves: int = DEFAULT_TWO_OPT_MOVES) -> Dict[str, Any]:
+    """Repairs `prior_solution` (routes over `markets`, served by `trucks`) for `delta` instead of re-solving.
+
+    Cancelled markets are cut out of their routes; a market whose new demand overloads its truck is taken
+    out. Those, new markets and markets of trucks no longer in `trucks` are placed by cheapest insertion, then
+    relocated if a cheaper spot opened up, and only the routes that changed get a bounded 2-opt pass.
+    Untouched routes are returned as they were, so the work grows with the size of the delta rather than the
+    instance. Capacity is respected; time windows are not re-checked (the schedule reports any lateness).
+    Returns a solution in the solver's format, or {"error": ...} if the fleet has no room left.
+    """
+    network = as_compact(road_network)
+    distance = network.distance
+    affected, removed = delta.affected_ids(), set(delta.removed)
+    current = {m.id: m for m in markets if m.id in affected}
+    unknown = sorted((set(delta.demand_changes) | set(delta.removed)) - set(current))
+    duplicate = sorted(m.id for m in delta.added if m.id in current)
+    off_network = sorted(m.id for m in delta.added if m.id not in network.index)
+    if unknown or duplicate or off_network:
+        raise ValueError(f"Invalid market delta: unknown {unknown}, already present {duplicate}, "
+                         f"not in road network {off_network}")
+
+    prior_routes = prior_solution.get('routes', {})
+    depot_ids = {route_data['route'][0] for route_data in prior_routes.values()}
+    shared_depot = next(iter(depot_ids)) if len(depot_ids) == 1 else None
+    depots = [network.index[prior_routes[t.id]['route'][0] if t.id in prior_routes else shared_depot or t.home_depot_id]
+              for t in trucks]
+    routes = [network.indices(prior_routes[t.id]['route'][1:-1]).tolist() if t.id in prior_routes else []
+              for t in trucks]
+    loads = [int(prior_routes[t.id]['load_kg']) if t.id in prior_routes else 0 for t in trucks]
+    capacities = [int(t.capacity_weight) for t in trucks]
+    demands = {network.index[m.id]: int(delta.demand_changes.get(m.id, m.demand_weight))
+               for m in list(current.values()) + list(delta.added)}
+    vehicle_of = {node: vehicle for vehicle, route in enumerate(routes) for node in route if node in demands}
+    touched, unplaced = set(), [network.index[m.id] for m in delta.added]
+
+    # Routes of trucks that were dropped from the fleet are released whole.
+    active = {t.id for t in trucks}
+    for truck_id, route_data in prior_routes.items():
+        if truck_id not in active:
+            released = [loc_id for loc_id in route_data['route'][1:-1] if loc_id not in removed]
+            released_ids = set(released)
+            for market in markets:
+                if market.id in released_ids:
+                    demands[network.index[market.id]] = int(delta.demand_changes.get(market.id, market.demand_weight))
+            unplaced.extend(network.index[loc_id] for loc_id in released)
+
+    for market_id in delta.removed:
+        node = network.index[market_id]
+        vehicle = vehicle_of.get(node)
+        if vehicle is not None:
+            routes[vehicle].remove(node)
+            loads[vehicle] -= int(current[market_id].demand_weight)
+            touched.add(vehicle)
+    for market_id in delta.demand_changes:
+        node = network.index[market_id]
+        vehicle = vehicle_of.get(node)
+        if vehicle is None:
+            continue
+        loads[vehicle] += demands[node] - int(current[market_id].demand_weight)
+        touched.add(vehicle)
+        if loads[vehicle] > capacities[vehicle]:
+            routes[vehicle].remove(node)
+            loads[vehicle] -= demands[node]
+            unplaced.append(node)
+
+    failed = []
+    for node in sorted(unplaced, key=lambda n: -demands[n]):
+        best = best_insertion(routes, loads, node, demands[node], capacities, distance, depots)
+        if best is None:
+            failed.append(network.ids[node])
+            continue
+        _, vehicle, position = best
+        routes[vehicle].insert(position, node)
+        loads[vehicle] += demands[node]
+        touched.add(vehicle)
+    if failed:
+        return {"error": f"No spare truck capacity for {len(failed)} market(s) ({', '.join(failed[:5])}); "
+                         f"re-solve with more trucks."}
+
+    moved = [node for node in demands if network.ids[node] not in removed]
+    touched |= relocate(routes, loads, moved, demands, capacities, distance, depots)
+    two_opt_moves = 0
+    for vehicle in touched:
+        routes[vehicle], moves = two_opt(routes[vehicle], distance, depots[vehicle], max_two_opt_moves)
+        two_opt_moves += moves
+
+    output = {'routes': {}, 'total_distance': 0, 'total_load': 0}
+    for vehicle, truck in enumerate(trucks):
+        if not routes[vehicle]:
+            continue
+        if vehicle not in touched and truck.id in prior_routes:
+            output['routes'][truck.id] = prior_routes[truck.id]
+        else:
+            path = np.array([depots[vehicle]] + routes[vehicle] + [depots[vehicle]])
+            legs = distance[path[:-1], path[1:]].astype(np.float64)
+            output['routes'][truck.id] = {**prior_routes.get(truck.id, {}),
+                                          'route': [network.ids[node] for node in path],
+                                          'distance_m': int(np.rint(legs * 100).sum()), 'load_kg': loads[vehicle]}
+        output['total_distance'] += output['routes'][truck.id]['distance_m']
+        output['total_load'] += output['routes'][truck.id]['load_kg']
+    output['total_distance'] /= 100
+    metrics.current_recorder().record_solver('solver.incremental', {
+        'delta_markets': len(affected), 'routes_changed': len(touched), 'inserted': len(unplaced),
+        'two_opt_moves': two_opt_moves, 'objective': int(round(output['total_distance'] * 100)),
+        'total_distance_km': output['total_distance'],
+    })
+    return output
+
+
+def assign_markets_to_depots(markets: List[Market], trucks: List[Truck],
+                             network: CompactRoadNetwork) -> Dict[str, List[Market]]:
+    """Greedy nearest-depot assignment by round-trip distance, respecting each depot's fleet capacity."""
+    depot_ids = list(dict.fromkeys(t.home_depot_id for t in trucks))
+    remaining = np.array([sum(t.capacity_weight for t in trucks if t.home_depot_id == d) for d in depot_ids])
+    depot_idx, market_idx = network.indices(depot_ids), network.indices([m.id for m in markets])
+    round_trip = np.zeros((len(depot_ids), len(markets)))
+    known_d, known_m = depot_idx >= 0, market_idx >= 0
+    round_trip[np.ix_(known_d, known_m)] = (network.distance[np.ix_(depot_idx[known_d], market_idx[known_m])] +
+                                             network.distance[np.ix_(market_idx[known_m], depot_idx[known_d])].T)
+
+    assignment = {d: [] for d in depot_ids}
+    # Markets with the strongest preference (largest gap to their second choice) are placed first.
+    ranked = np.sort(round_trip, axis=0)
+    regret = ranked[1] - ranked[0] if len(depot_ids) > 1 else np.zeros(len(markets))
+    for m in np.argsort(-regret, kind='stable'):
+        demand = markets[m].demand_weight
+        for d in np.argsort(round_trip[:, m], kind='stable'):
+            if remaining[d] >= demand:
+                break
+        else:
+            d = int(np.argmax(remaining))
+        remaining[d] -= demand
+        assignment[depot_ids[d]].append(markets[m])
+    return assignment
+
+
+def _solve_subproblem(subproblem: Tuple) -> Dict[str, Any]:
+    markets, trucks, network, time_limit, farms, time_windows, num_neighbors, depot_id = subproblem
+    solver = VRPSolver(markets=markets, trucks=trucks, road_network=network, farms=farms, time_windows=time_windows,
+                       depot_id=depot_id)
+    return solver.solve(time_limit, num_neighbors=num_neighbors)
+
+
+def solve_subproblems(subproblems: List[Tuple], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    workers = min(len(subproblems), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [_solve_subproblem(sp) for sp in subproblems]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_solve_subproblem, subproblems))
+
+
+def merge_solutions(solutions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    output = {'routes': {}, 'total_distance': 0, 'total_load': 0}
+    for solution in solutions:
+        if solution.get('error'):
+            return solution
+        output['routes'].update(solution['routes'])
+        output['total_distance'] += solution['total_distance']
+        output['total_load'] += solution['total_load']
+    return output
+
+
+@metrics.timed('solver.clustered')
+def solve_clustered(markets: List[Market], trucks: List[Truck], road_network: NetworkLike,
+                    farms: Optional[List[Farm]] = None, time_windows: Optional[TimeWindowSettings] = None,
+                    time_limit: int = DEFAULT_TIME_LIMIT_SECONDS, max_cluster_size: int = DEFAULT_MAX_CLUSTER_SIZE,
+                    num_neighbors: Optional[int] = DEFAULT_NUM_NEIGHBORS,
+                    max_workers: Optional[int] = None, index: Optional[SpatialIndex] = None) -> Dict[str, Any]:
+    """Large-instance path: clusters markets by location into capacity-feasible groups, solves every group in
+    its own process against a network subset and stitches the routes together.
+
+    Unlike `VRPSolver`, no dense matrix over all markets is ever built, only one per cluster. `index` is an
+    existing `SpatialIndex` over the markets to cluster with.
+    """
+    network = as_compact(road_network)
+    # One depot for the whole fleet, as in a single-depot solve, whichever trucks a group happens to get.
+    depot_id = trucks[0].home_depot_id
+    subproblems = [
+        (group_markets, group_trucks, network.subset([depot_id] + [m.id for m in group_markets]), time_limit, farms,
+         time_windows, num_neighbors, depot_id)
+        for group_markets, group_trucks in cluster_markets(markets, trucks, max_cluster_size, index=index)
+    ]
+    return merge_solutions(solve_subproblems(subproblems, max_workers))
+
+
+def solve_routes(markets: List[Market], trucks: List[Truck], road_network: NetworkLike,
+                 farms: Optional[List[Farm]] = None, mode: Optional[str] = None,
+                 time_limit: int = DEFAULT_TIME_LIMIT_SECONDS, time_windows: Optional[TimeWindowSettings] = None,
+                 initial_solution: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Runs the solver for `mode` ('single_depot', 'multi_depot' or 'clustered'; chosen by size when None)."""
+    mode = mode or solve_mode(len(markets))
+    if mode == 'clustered':
+        return solve_clustered(markets, trucks, road_network, farms, time_windows, time_limit,
+                               max_workers=max_workers)
+    solver = VRPSolver(markets=markets, trucks=trucks, road_network=road_network, farms=farms,
+                       time_windows=time_windows)
+    if mode == 'multi_depot':
+        return solver.solve_multi_depot(time_limit, max_workers)
+    return solver.solve(time_limit, initial_solution=initial_solution)
@@ -1,51 +1,147 @@
 # src/pages/2_Transportation_Optimizer.py
+import logging
+import os
+import time
+import pandas as pd
 import streamlit as st
-from src.data_manager import input_loader, config_manager
-from src.optimizer.vrp_solver import VRPSolver
+from src.data_manager import session_data
+from src.optimizer.settings import TimeWindowSettings, DEFAULT_TIME_LIMIT_SECONDS, solve_mode, solver_params
+from src.optimizer.solution_cache import SolutionCache
 from src.calculator import cost_calculator, schedule_generator
-from src.visualizer.dashboard import create_transport_dashboard
-from src.models.data_models import Farm, Market, Truck, RoadNetwork
+from src.visualizer.dashboard import OBJECTIVE_LABEL, create_transport_dashboard, render_performance_panel
+from src.monitoring import metrics
 
 st.title("🚚 Transportation & Routing Optimization")
+recorder = metrics.start_run()
+logger = logging.getLogger(__name__)
+
+WARM_START_TIME_LIMIT_SECONDS = 10
+SCENARIO_RESULTS_PATH = 'data/scenario_results.parquet'
 
 
 def get_data():
     if st.session_state.get('data_loaded', False):
         st.info("Using custom data uploaded from the Home page.")
-        farms = [Farm(**row) for _, row in st.session_state['farms_df'].iterrows()]
-        markets = [Market(**row) for _, row in st.session_state['markets_df'].iterrows()]
-        trucks = [Truck(**row) for _, row in st.session_state['trucks_df'].iterrows()]
-        road_network = RoadNetwork(matrix=st.session_state['network_dict'])
     else:
         st.info("Using default sample data.")
-        farms = input_loader.load_farms('data/farms.csv')
-        markets = input_loader.load_markets('data/markets.csv')
-        trucks = input_loader.load_trucks('data/trucks.csv')
-        road_network = input_loader.load_road_network('data/road_network_matrix.json')
-    config = config_manager.ConfigManager('data/config.json')
-    return farms, markets, trucks, road_network, config
+    # Loaded once per file content and shared across reruns and sessions.
+    return (*session_data.session_dataset(), session_data.load_config())
+
+
+with metrics.timer('page.get_data'):
+    farms, markets, trucks, road_network, config = get_data()
+solution_cache = SolutionCache()
+
+
+def build_schedules(solution, road_network, markets, farms, time_windows):
+    if time_windows is None:
+        return schedule_generator.build_schedule_frame(solution, road_network, markets, farms)
+    return schedule_generator.build_schedule_frame(solution, road_network, markets, farms, time_windows.start_time,
+                                                   time_windows.service_minutes, wait_for_windows=True)
+
+
+def finalize_plan(cache_key, solution, road_network, markets, farms, time_windows=None):
+    route_metrics, schedules = None, None
+    if not solution.get("error"):
+        route_metrics = cost_calculator.compute_route_metrics(solution, road_network)
+        schedules = build_schedules(solution, road_network, markets, farms, time_windows)
+    st.session_state['route_plan'] = (cache_key, solution, route_metrics, schedules)
+    return solution, route_metrics, schedules
 
 
-farms, markets, trucks, road_network, config = get_data()
+def plan_routes(farms, trucks, markets, road_network, active_truck_ids, multi_depot=False, background=False,
+                warm_start=True, enforce_time_windows=False):
+    """Routing half of the pipeline; only inputs that change the routes are part of its key.
+
+    Returns (solution, route_metrics, schedules, job); `job` is set while a background search is still
+    running, in which case `solution` is the best found so far (or None before the first one).
+    """
+    active_trucks = [t for t in trucks if t.id in active_truck_ids]
+    if not active_trucks: return {"error": "No trucks selected."}, None, None, None
+
+    time_windows = TimeWindowSettings.from_config(config, active_trucks) if enforce_time_windows else None
+    mode = solve_mode(len(markets), multi_depot)
+    cache_key = SolutionCache.make_key(markets, active_trucks, road_network,
+                                       solver_params(mode, DEFAULT_TIME_LIMIT_SECONDS, time_windows))
+    route_plan = st.session_state.get('route_plan')
+    if route_plan and route_plan[0] == cache_key:
+        metrics.count('routes.session_hit')
+        return (*route_plan[1:], None)
+
+    # Small what-if edits (a truck toggled, a few markets changed) start from the plan on screen.
+    prior_solution = route_plan[1] if warm_start and mode == 'single_depot' and route_plan else None
+    if prior_solution and prior_solution.get("error"):
+        prior_solution = None
+    time_limit = WARM_START_TIME_LIMIT_SECONDS if prior_solution else DEFAULT_TIME_LIMIT_SECONDS
+    # The key describes a full-length cold solve. A warm-started result depends on the plan it started from
+    # and had a shorter budget, so it stays in this session's route_plan and is never written to the cache.
+    persist = prior_solution is None
+
+    solution = solution_cache.get(cache_key)
+    metrics.count('routes.cache_hit' if solution is not None else 'routes.cache_miss')
+    # OR-Tools is only imported once a solve is actually needed; cached plans render without it.
+    if solution is None and background and mode == 'single_depot':
+        from src.optimizer.background_solver import BackgroundSolveJob
+        job = st.session_state.get('solve_job')
+        if job is None or job.key != cache_key:
+            if job: job.cancel()
+            job = BackgroundSolveJob(markets, active_trucks, road_network, time_limit, key=cache_key,
+                                     initial_solution=prior_solution, farms=farms, time_windows=time_windows)
+            st.session_state['solve_job'] = job
+        if job.poll().running:
+            best = job.best_solution
+            if best is None: return None, None, None, job
+            return (best, cost_calculator.compute_route_metrics(best, road_network),
+                    build_schedules(best, road_network, markets, farms, time_windows), job)
+        solution = job.result
+        # An early-stopped search is "good enough" for this session but not the answer to cache.
+        if job.status == 'done' and persist and not solution.get("error"):
+            solution_cache.put(cache_key, solution)
+    elif solution is None:
+        from src.optimizer.vrp_solver import solve_routes
+        logger.info("Running %s transportation optimization for %d markets", mode, len(markets))
+        solution = solve_routes(markets, active_trucks, road_network, farms, mode, time_limit, time_windows,
+                                initial_solution=prior_solution)
+        if persist and not solution.get("error"):
+            solution_cache.put(cache_key, solution)
+    if time_windows and solution.get("error") == "No solution found.":
+        solution = {"error": "No solution satisfies the delivery windows and driver-hour limits. "
+                             "Add trucks or disable time-window enforcement."}
+
+    return (*finalize_plan(cache_key, solution, road_network, markets, farms, time_windows), None)
 
 
 @st.cache_data
-def run_optimization(_trucks, _markets, _road_network, _config, active_truck_ids, fuel_cost_per_liter):
-    print("--- RUNNING TRANSPORTATION OPTIMIZATION ---")
-    active_trucks = [t for t in _trucks if t.id in active_truck_ids]
+def load_sweep_results(path, modified_time):
+    return pd.read_parquet(path)
 
-    _config.config['variable_costs']['fuel_cost_per_liter'] = fuel_cost_per_liter
 
-    if not active_trucks: return {"error": "No trucks selected."}, {}, {}
+def render_sweep_results(path):
+    sweep_df = load_sweep_results(path, os.path.getmtime(path))
+    feasible = sweep_df[sweep_df['error'].isna()]
+    st.caption(f"{len(sweep_df)} scenarios from `{path}` ({len(sweep_df) - len(feasible)} infeasible).")
+    if feasible.empty: return
+    subsets = st.multiselect("Truck subsets", options=sorted(feasible['truck_ids'].unique()))
+    if subsets: feasible = feasible[feasible['truck_ids'].isin(subsets)]
+    st.dataframe(feasible.sort_values('total_overall_cost').drop(columns=['error']), hide_index=True)
+    if feasible['fuel_cost_per_liter'].nunique() > 1:
+        st.subheader("Total Cost vs Fuel Price")
+        st.line_chart(feasible.pivot_table(index='fuel_cost_per_liter', columns='truck_ids',
+                                           values='total_overall_cost', aggfunc='min'))
 
-    solver = VRPSolver(markets=_markets, trucks=active_trucks, road_network=_road_network)
-    solution = solver.solve()
 
-    costs, schedules = {}, {}
-    if not solution.get("error"):
-        costs = cost_calculator.calculate_all_costs(solution, active_trucks, _road_network.matrix, _config)
-        schedules = schedule_generator.generate_schedules(solution, _road_network.matrix)
-    return solution, costs, schedules
+def render_search_progress(job):
+    st.header("⏳ Search in Progress")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Improving Solutions", f"{len(job.history)}")
+    best = job.best_solution
+    col2.metric("Best Distance", f"{best['total_distance']:,.2f} km" if best is not None else "—")
+    col3.metric("Elapsed", f"{job.history[-1][0] if job.history else 0:,.1f} s of {job.time_limit} s")
+    if job.history:
+        history_df = pd.DataFrame(job.history, columns=["Elapsed (s)", OBJECTIVE_LABEL])
+        st.line_chart(history_df.set_index("Elapsed (s)")[OBJECTIVE_LABEL])
+    if st.button("Stop and use best solution so far"):
+        job.stop()
 
 
 st.sidebar.header("Scenario Controls")
@@ -56,7 +152,63 @@ fuel_cost_input = st.sidebar.slider(
     config.get_param('variable_costs', 'fuel_cost_per_liter'), 0.05
 )
 
-solution, costs, schedules = run_optimization(trucks, markets, road_network, config, tuple(active_trucks_input),
-                                              fuel_cost_input)
+multi_depot_input = st.sidebar.checkbox(
+    "Multi-depot decomposition", value=False,
+    help="Dispatch each truck from its own home depot and solve the depots in parallel."
+)
+
+background_input = st.sidebar.checkbox(
+    "Stream best-so-far solutions", value=False,
+    help="Solve in a background process and render improving routes while the search runs (single-depot mode)."
+)
+
+warm_start_input = st.sidebar.checkbox(
+    "Warm-start from current plan", value=True,
+    help=f"Repair the routes on screen for the new scenario and search from them ({WARM_START_TIME_LIMIT_SECONDS} s)."
+)
+
+time_windows_input = st.sidebar.checkbox(
+    "Enforce time windows & driver hours", value=False,
+    help="Model market delivery windows, farm loading windows and the maximum shift length in the solver."
+)
+
+lightweight_map_input = st.sidebar.checkbox(
+    "Lightweight map", value=False,
+    help="Clustered markers and one simplified route layer, cached per solution. "
+         "Switched on automatically for large networks."
+)
+
+performance_input = st.sidebar.checkbox(
+    "Show performance panel", value=False,
+    help="Per-stage timings, cache counters and solver statistics for this rerun."
+)
+
+solution, route_metrics, schedules, solve_job = plan_routes(
+    farms, trucks, markets, road_network, tuple(active_trucks_input), multi_depot_input, background_input,
+    warm_start_input, time_windows_input
+)
+if solve_job is not None:
+    render_search_progress(solve_job)
+
+if solution is None:
+    st.info("Searching for a first feasible solution...")
+else:
+    costs, fleet_costs = {}, None
+    if not solution.get("error"):
+        # Cost-only inputs re-price the cached routes instead of re-solving them.
+        rates = {**config.get_variable_costs(), 'fuel_cost_per_liter': fuel_cost_input}
+        fleet_costs = cost_calculator.calculate_fleet_costs(route_metrics, trucks, rates)
+        costs = cost_calculator.costs_to_dict(fleet_costs)
+    create_transport_dashboard(solution, costs, schedules, farms, markets, trucks, fleet_costs,
+                               lightweight_map=True if lightweight_map_input else None)
+
+if os.path.exists(SCENARIO_RESULTS_PATH):
+    with st.expander("📚 Scenario Sweep Results"):
+        render_sweep_results(SCENARIO_RESULTS_PATH)
+
+if performance_input:
+    render_performance_panel(recorder)
 
-create_transport_dashboard(solution, costs, schedules, farms, markets, trucks)
\ No newline at end of file
+if solve_job is not None:
+    time.sleep(1)
+    st.rerun()
\ No newline at end of file
@@ -1,8 +1,11 @@
 # src/pages/3_Inventory_Optimization.py
 import streamlit as st
-import pandas as pd
 import numpy as np
-from scipy.stats import norm
+from src.calculator.inventory import (DEFAULT_HOLDING_COST_PER_KG_DAY, DEFAULT_SERVICE_LEVELS, inventory_policy_table,
+                                      service_level_tradeoff)
+from src.calculator.demand_simulation import DEFAULT_NUM_SCENARIOS, DEFAULT_SIMULATION_CACHE_DIR, simulate_demand
+from src.data_manager.session_data import session_fleet, session_markets_frame
+from src.optimizer.solution_cache import SolutionCache
 
 st.title("📦 Inventory Optimization")
 st.markdown("This module helps determine the optimal inventory levels to balance stockout risks and holding costs.")
@@ -11,13 +14,12 @@ st.markdown("This module helps determine the optimal inventory levels to balance
 def get_market_data():
     if st.session_state.get('data_loaded', False):
         st.info("Using custom data uploaded from the Home page.")
-        return st.session_state['markets_df']
     else:
         st.info("Using default sample data.")
-        try:
-            return pd.read_csv('data/markets.csv')
-        except FileNotFoundError:
-            return None
+    try:
+        return session_markets_frame()
+    except FileNotFoundError:
+        return None
 
 
 markets_df = get_market_data()
@@ -26,32 +28,65 @@ if markets_df is None:
     st.error("Market data not found. Please upload it or run the data generation script.")
     st.stop()
 
-st.header("Safety Stock & Reorder Point Calculator")
-selected_market = st.selectbox("Select a Market/Product to Analyze", options=markets_df['id'])
+st.header("Fleet-Wide Inventory Policies")
+col1, col2 = st.columns(2)
+service_level = col1.slider("Desired Service Level (%)", 80.0, 99.9, 95.0, 0.1) / 100
+holding_cost = col2.number_input("Holding Cost ($ per kg per day)", min_value=0.0,
+                                 value=DEFAULT_HOLDING_COST_PER_KG_DAY, step=0.01, format="%.3f")
 
-if selected_market:
-    market_data = markets_df[markets_df['id'] == selected_market].iloc[0]
-    avg_demand = market_data['demand_weight']
-    demand_std_dev = avg_demand * market_data['demand_variability']
-    lead_time = market_data['lead_time_days']
+policy_df = inventory_policy_table(markets_df, service_level, holding_cost)
+col1, col2, col3 = st.columns(3)
+col1.metric("Markets", f"{len(policy_df):,}")
+col2.metric("Total Safety Stock", f"{policy_df['safety_stock'].sum():,.0f} kg")
+col3.metric("Safety Stock Holding Cost", f"${policy_df['holding_cost_per_day'].sum():,.2f} / day")
+st.dataframe(policy_df.round(2), hide_index=True)
 
-    st.subheader(f"Inputs for: {selected_market}")
+st.header("Service-Level Trade-off")
+levels = np.union1d(DEFAULT_SERVICE_LEVELS, [round(service_level, 3)])
+tradeoff_df = service_level_tradeoff(markets_df, levels, holding_cost).set_index('service_level')
+col1, col2 = st.columns(2)
+col1.caption("Network holding cost of safety stock ($/day)")
+col1.line_chart(tradeoff_df['total_holding_cost_per_day'])
+col2.caption("Expected shortage per replenishment cycle (kg)")
+col2.line_chart(tradeoff_df['total_expected_shortage'])
+
+st.header("Delivery Risk Under Demand Uncertainty")
+route_plan = st.session_state.get('route_plan')
+if not route_plan or route_plan[1] is None or route_plan[1].get("error"):
+    st.info("Optimize routes on the Transportation page to see how they hold up when market demand varies.")
+else:
+    num_scenarios = st.select_slider("Demand scenarios", options=[1_000, 5_000, 10_000, 50_000, 100_000],
+                                     value=DEFAULT_NUM_SCENARIOS)
+    markets, trucks = session_fleet()
+    # Cached on disk per routes and demand inputs; a rerun with the same plan reads the result back.
+    truck_risk, market_risk = simulate_demand(route_plan[1], markets, trucks, num_scenarios,
+                                              cache=SolutionCache(DEFAULT_SIMULATION_CACHE_DIR))
     col1, col2, col3 = st.columns(3)
-    col1.metric("Avg Daily Demand", f"{avg_demand:,.0f} kg")
-    col2.metric("Demand Std Dev", f"{demand_std_dev:,.0f} kg")
-    col3.metric("Supplier Lead Time", f"{lead_time} days")
+    col1.metric("Trucks Likely to Overflow (>5%)", f"{(truck_risk['overflow_probability'] > 0.05).sum()} "
+                                                   f"of {len(truck_risk)}")
+    col2.metric("Expected Stockout", f"{market_risk['expected_stockout_kg'].sum():,.0f} kg")
+    col3.metric("Markets at Risk", f"{(market_risk['stockout_probability'] > 0).sum()} of {len(market_risk)}")
+    st.caption(f"{num_scenarios:,} demand draws per market (mean = demand, std = demand x variability) "
+               "against the routes from the Transportation page; full trucks serve stops in route order.")
+    st.dataframe(truck_risk.sort_values('overflow_probability', ascending=False).round(3), hide_index=True)
+    st.dataframe(market_risk.sort_values('expected_stockout_kg', ascending=False).round(3), hide_index=True)
 
-    st.subheader("Strategic Decisions")
-    service_level = st.slider("Desired Service Level (%)", 80, 100, 95, 1) / 100
+st.header("Market Detail")
+selected_market = st.selectbox("Select a Market/Product to Analyze", options=policy_df['market_id'])
 
-    z_score = norm.ppf(service_level)
-    safety_stock = z_score * demand_std_dev * np.sqrt(lead_time)
-    reorder_point = (avg_demand * lead_time) + safety_stock
+if selected_market:
+    market_data = policy_df[policy_df['market_id'] == selected_market].iloc[0]
+
+    st.subheader(f"Inputs for: {selected_market}")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Avg Daily Demand", f"{market_data['avg_daily_demand_kg']:,.0f} kg")
+    col2.metric("Demand Std Dev", f"{market_data['demand_std_kg']:,.0f} kg")
+    col3.metric("Supplier Lead Time", f"{market_data['lead_time_days']} days")
 
     st.subheader("Recommendations")
     col1, col2 = st.columns(2)
-    col1.metric("Calculated Safety Stock", f"{safety_stock:,.2f} kg")
-    col2.metric("Calculated Reorder Point", f"{reorder_point:,.2f} kg")
+    col1.metric("Calculated Safety Stock", f"{market_data['safety_stock']:,.2f} kg")
+    col2.metric("Calculated Reorder Point", f"{market_data['reorder_point']:,.2f} kg")
 
     st.success(
-        f"**Insight:** To achieve a **{service_level:.0%} service level** for **{selected_market}**, maintain a safety stock of **{safety_stock:,.0f} kg** and reorder when inventory hits **{reorder_point:,.0f} kg**.")
\ No newline at end of file
+        f"**Insight:** To achieve a **{service_level:.1%} service level** for **{selected_market}**, maintain a safety stock of **{market_data['safety_stock']:,.0f} kg** and reorder when inventory hits **{market_data['reorder_point']:,.0f} kg**.")
@@ -0,0 +1,158 @@
+# src/service/jobs.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from src.data_manager.datasets import dataset_digest
+from src.monitoring.metrics import MetricsRecorder
+from src.optimizer.solution_cache import hash_payload
+from src.service.pipeline import JobRequest, run_pipeline
+
+DEFAULT_MAX_QUEUED = 32
+# Finished jobs (and their results) kept for polling; the oldest are dropped first.
+MAX_FINISHED_JOBS = 256
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class UnknownDatasetError(KeyError):
+    pass
+
+
+class Job:
+    def __init__(self, job_id: str, request: JobRequest, key: str, future: Future):
+        self.id = job_id
+        self.request = request
+        self.key = key
+        self.future = future
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.future.cancelled():
+            return 'cancelled'
+        if self.future.done():
+            return 'failed' if self.future.exception() is not None else 'done'
+        return 'running' if self.future.running() else 'queued'
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        output = {'job_id': self.id, 'status': self.status, 'submitted_at': self.submitted_at,
+                  'finished_at': self.finished_at, 'request': self.request.model_dump()}
+        if self.status == 'failed':
+            output['error'] = f"{type(self.future.exception()).__name__}: {self.future.exception()}"
+        elif self.status == 'done' and include_result:
+            output['result'] = self.future.result()
+        return output
+
+
+class JobManager:
+    """Runs pipeline jobs on a fixed pool of worker processes behind a bounded queue.
+
+    Solves are CPU-bound and OR-Tools holds the GIL, so every job gets a process of its own; submissions beyond
+    `max_workers + max_queued` in-flight jobs are refused with `QueueFullError` instead of piling up. A request
+    identical to one still in flight (same parameters, same dataset content) joins that job.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queued: int = DEFAULT_MAX_QUEUED):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self.datasets: Dict[str, str] = {}
+        self.recorder = MetricsRecorder('service')
+        self._lock = threading.Lock()
+
+    def register_dataset(self, data_dir: str) -> str:
+        """Makes `data_dir` addressable by its content hash, which is returned."""
+        dataset_id = dataset_digest(data_dir)
+        with self._lock:
+            self.datasets[dataset_id] = os.path.abspath(data_dir)
+        return dataset_id
+
+    def resolve(self, request: JobRequest) -> JobRequest:
+        if request.data_dir is not None or request.dataset_id is None:
+            return request
+        data_dir = self.datasets.get(request.dataset_id)
+        # The id is a content hash: a registered directory whose files have since changed no longer matches it.
+        if data_dir is None or not os.path.isdir(data_dir) or dataset_digest(data_dir) != request.dataset_id:
+            raise UnknownDatasetError(request.dataset_id)
+        return request.model_copy(update={'data_dir': data_dir})
+
+    def _in_flight(self) -> List[Job]:
+        return [job for job in self.jobs.values() if not job.future.done()]
+
+    def submit(self, request: JobRequest) -> Job:
+        request = self.resolve(request)
+        if request.data_dir is None:
+            raise ValueError("A job needs either data_dir or dataset_id.")
+        key = hash_payload({'request': request.model_dump(exclude={'dataset_id'}),
+                            'dataset': dataset_digest(request.data_dir)})
+        with self._lock:
+            in_flight = self._in_flight()
+            for job in in_flight:
+                if job.key == key:
+                    self.recorder.count('jobs.joined')
+                    return job
+            if len(in_flight) >= self.max_workers + self.max_queued:
+                self.recorder.count('jobs.rejected')
+                raise QueueFullError(f"{len(in_flight)} jobs in flight; try again later.")
+            job = Job(uuid.uuid4().hex, request, key, self.pool.submit(run_pipeline, request))
+            self.jobs[job.id] = job
+            self._evict_finished()
+        self.recorder.count('jobs.submitted')
+        job.future.add_done_callback(lambda future, job=job: self._finished(job))
+        return job
+
+    def _finished(self, job: Job) -> None:
+        job.finished_at = time.time()
+        self.recorder.count(f"jobs.{job.status}")
+        if job.status == 'done':
+            self.recorder.record_timing('service.job', job.finished_at - job.submitted_at, mode=job.request.mode)
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.future.done()]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        # Snapshot under the lock: `submit` adds to and evicts from `jobs` while requests iterate it.
+        with self._lock:
+            return list(self.jobs.values())
+
+    def registered_datasets(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self.datasets)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            try:
+                job.future.exception(timeout=timeout)
+            except (TimeoutError, CancelledError):
+                pass
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a job that has not started yet; running solves are left to finish."""
+        job = self.jobs.get(job_id)
+        return job is not None and job.future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        statuses = [job.status for job in self.list_jobs()]
+        return {'max_workers': self.max_workers, 'max_queued': self.max_queued,
+                'queued': statuses.count('queued'), 'running': statuses.count('running'),
+                'finished': len(statuses) - statuses.count('queued') - statuses.count('running'),
+                'datasets': len(self.datasets)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,99 @@
+# src/service/pipeline.py
+import functools
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+from src.calculator import cost_calculator, schedule_generator
+from src.calculator.demand_simulation import DEFAULT_SIMULATION_CACHE_DIR, simulate_demand
+from src.data_manager.config_manager import ConfigManager
+from src.data_manager.datasets import Dataset, dataset_digest, load_dataset
+from src.monitoring import metrics
+from src.optimizer.settings import DEFAULT_TIME_LIMIT_SECONDS, TimeWindowSettings, solve_mode, solver_params
+from src.optimizer.solution_cache import SolutionCache
+from src.models.data_models import MarketDelta
+from src.optimizer.vrp_solver import apply_market_delta, solve_routes
+
+
+class JobRequest(BaseModel):
+    """One run of load -> solve -> costs -> schedules. The service resolves `dataset_id` to `data_dir`.
+
+    With a `delta`, the dataset's (cached) solution is repaired for the intra-day market changes instead of
+    re-solving everything.
+    """
+    data_dir: Optional[str] = None
+    dataset_id: Optional[str] = None
+    truck_ids: Optional[List[str]] = None
+    mode: Literal['auto', 'single_depot', 'multi_depot', 'clustered'] = 'auto'
+    time_limit: int = Field(DEFAULT_TIME_LIMIT_SECONDS, gt=0)
+    enforce_time_windows: bool = False
+    cost_overrides: Dict[str, float] = {}
+    include_schedules: bool = True
+    use_cache: bool = True
+    delta: Optional[MarketDelta] = None
+    demand_scenarios: int = Field(0, ge=0)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_dataset(data_dir: str, digest: str) -> Tuple[Dataset, ConfigManager]:
+    # Per worker process: repeated jobs on the same files skip loading and validation.
+    return load_dataset(data_dir)
+
+
+def run_pipeline(request: JobRequest, max_workers: Optional[int] = 1) -> Dict[str, Any]:
+    """Runs the dashboard's routing pipeline headlessly and returns a JSON-serializable result.
+
+    `max_workers` bounds the processes a multi-depot or clustered solve may fan out to; the service keeps it
+    at 1 so each job occupies one core of its worker pool. Solutions go through the same `SolutionCache`
+    (and keys) as the dashboard, so either one can reuse routes the other has solved.
+    """
+    if request.data_dir is None:
+        raise ValueError("JobRequest needs a data_dir (or a dataset_id resolved by the service).")
+    recorder = metrics.start_run()
+    with metrics.timer('service.load'):
+        digest = dataset_digest(request.data_dir)
+        (farms, markets, trucks, road_network), config = _cached_dataset(request.data_dir, digest)
+
+    if request.truck_ids is not None:
+        selected = set(request.truck_ids)
+        trucks = [t for t in trucks if t.id in selected]
+    result: Dict[str, Any] = {'dataset_id': digest}
+    if not trucks:
+        return {**result, 'solution': {'error': "No trucks selected."}, 'metrics': recorder.snapshot()}
+
+    time_windows = TimeWindowSettings.from_config(config, trucks) if request.enforce_time_windows else None
+    mode = solve_mode(len(markets)) if request.mode == 'auto' else request.mode
+    cache_key = SolutionCache.make_key(markets, trucks, road_network,
+                                       solver_params(mode, request.time_limit, time_windows))
+    solution_cache = SolutionCache() if request.use_cache else None
+    solution = solution_cache.get(cache_key) if solution_cache else None
+    metrics.count('routes.cache_hit' if solution is not None else 'routes.cache_miss')
+    if solution is None:
+        solution = solve_routes(markets, trucks, road_network, farms, mode, request.time_limit, time_windows,
+                                max_workers=max_workers)
+        if solution_cache and not solution.get('error'):
+            solution_cache.put(cache_key, solution)
+    if request.delta is not None and not solution.get('error'):
+        # Repaired routes are not cached: the key describes the uploaded markets, not the delta.
+        solution = apply_market_delta(solution, request.delta, markets, trucks, road_network)
+        markets = request.delta.apply_to(markets)
+    result.update({'cache_key': cache_key, 'mode': mode, 'solution': solution})
+
+    if not solution.get('error'):
+        route_metrics = cost_calculator.compute_route_metrics(solution, road_network)
+        result['costs'] = cost_calculator.calculate_all_costs(solution, trucks, road_network, config,
+                                                              request.cost_overrides, route_metrics)
+        if request.include_schedules:
+            if time_windows is None:
+                schedules = schedule_generator.build_schedule_frame(solution, road_network, markets, farms)
+            else:
+                schedules = schedule_generator.build_schedule_frame(
+                    solution, road_network, markets, farms, time_windows.start_time, time_windows.service_minutes,
+                    wait_for_windows=True)
+            result['schedules'] = schedules.to_dict(orient='records')
+        if request.demand_scenarios:
+            truck_risk, market_risk = simulate_demand(
+                solution, markets, trucks, request.demand_scenarios, max_workers=max_workers,
+                cache=SolutionCache(DEFAULT_SIMULATION_CACHE_DIR) if request.use_cache else None)
+            result['demand_risk'] = {'trucks': truck_risk.to_dict(orient='records'),
+                                     'markets': market_risk.to_dict(orient='records')}
+    result['metrics'] = recorder.snapshot()
+    return result
@@ -0,0 +1,126 @@
+# src/service/server.py
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from pydantic import ValidationError
+from src.service.jobs import DEFAULT_MAX_QUEUED, JobManager, QueueFullError, UnknownDatasetError
+from src.service.pipeline import JobRequest
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Longest a GET /jobs/<id>?wait=... request may block.
+MAX_WAIT_SECONDS = 60
+logger = logging.getLogger(__name__)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON routes:
+
+        GET    /health                 pool and queue occupancy
+        GET    /metrics                service counters and per-stage timings
+        GET    /datasets               registered datasets
+        POST   /datasets               {"path": dir} -> {"dataset_id": content hash}
+        POST   /jobs                   JobRequest -> 202 {"job_id", "status"}; 429 when the queue is full
+        GET    /jobs/<id>[?wait=s]     status, plus the result once done
+        DELETE /jobs/<id>              cancel a job that has not started
+    """
+    manager: JobManager
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _route(self) -> Tuple[str, str, Dict[str, list]]:
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/', 1)
+        return parts[0], parts[1] if len(parts) > 1 else '', parse_qs(url.query)
+
+    def do_GET(self):
+        resource, job_id, query = self._route()
+        if resource == 'health':
+            self._send(200, {'status': 'ok', **self.manager.stats()})
+        elif resource == 'metrics':
+            recorder = self.manager.recorder
+            self._send(200, {'stats': self.manager.stats(), 'counters': dict(recorder.counters),
+                             'stages': recorder.stage_summary().to_dict(orient='records')})
+        elif resource == 'datasets':
+            self._send(200, {'datasets': self.manager.registered_datasets()})
+        elif resource == 'jobs' and job_id:
+            try:
+                wait = min(float(query.get('wait', [0])[0]), MAX_WAIT_SECONDS)
+            except ValueError:
+                self._send(400, {'error': f"wait must be a number of seconds, got {query['wait'][0]!r}"})
+                return
+            job = self.manager.wait(job_id, wait) if wait > 0 else self.manager.get(job_id)
+            if job is None:
+                self._send(404, {'error': f"Unknown job {job_id}"})
+            else:
+                self._send(200, job.to_dict())
+        elif resource == 'jobs':
+            self._send(200, {'jobs': [job.to_dict(include_result=False) for job in self.manager.list_jobs()]})
+        else:
+            self._send(404, {'error': f"No route for {self.path}"})
+
+    def do_POST(self):
+        resource, _, _ = self._route()
+        try:
+            payload = self._read_json()
+            if resource == 'datasets':
+                self._send(201, {'dataset_id': self.manager.register_dataset(payload['path']), 'path': payload['path']})
+            elif resource == 'jobs':
+                job = self.manager.submit(JobRequest(**payload))
+                self._send(202, {'job_id': job.id, 'status': job.status}, {'Location': f"/jobs/{job.id}"})
+            else:
+                self._send(404, {'error': f"No route for {self.path}"})
+        except QueueFullError as e:
+            self._send(429, {'error': str(e)}, {'Retry-After': '5'})
+        except UnknownDatasetError as e:
+            self._send(404, {'error': f"Unknown or changed dataset {e.args[0]}; register its directory again."})
+        except ValidationError as e:
+            self._send(400, {'error': json.loads(e.json(include_url=False))})
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            self._send(400, {'error': f"{type(e).__name__}: {e}"})
+
+    def do_DELETE(self):
+        resource, job_id, _ = self._route()
+        if resource != 'jobs' or self.manager.get(job_id) is None:
+            self._send(404, {'error': f"Unknown job {job_id}"})
+        elif self.manager.cancel(job_id):
+            self._send(200, {'job_id': job_id, 'status': 'cancelled'})
+        else:
+            self._send(409, {'job_id': job_id, 'status': self.manager.get(job_id).status,
+                             'error': "Job already started"})
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def create_server(manager: JobManager, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    handler = type('BoundServiceHandler', (ServiceHandler,), {'manager': manager})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: Optional[int] = None,
+          max_queued: int = DEFAULT_MAX_QUEUED) -> None:
+    manager = JobManager(max_workers, max_queued)
+    server = create_server(manager, host, port)
+    logger.info("Serving on http://%s:%d with %d workers", host, port, manager.max_workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.shutdown(wait=False)
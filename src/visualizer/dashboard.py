@@ -1,19 +1,54 @@
 # src/visualizer/dashboard.py
 import streamlit as st
 import pandas as pd
-from typing import Dict, List
-from streamlit_folium import st_folium
-from src.visualizer.map_plotter import MapPlotter
+from typing import Dict, List, Optional
+import streamlit.components.v1 as components
+from src.optimizer.solution_cache import hash_payload
 from src.models.data_models import Farm, Market, Truck
+from src.calculator.cost_calculator import calculate_fleet_costs
+from src.calculator.route_table import RouteTable
+from src.calculator.schedule_generator import format_schedule
+from src.monitoring.metrics import MetricsRecorder, timed, timer
 
+# The solver objective is not a distance once time windows add lateness penalties and span costs.
+OBJECTIVE_LABEL = "Objective (1/100 km units)"
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def render_route_map(map_key: str, _solution: Dict, _farms: List[Farm], _markets: List[Market],
+                     _trucks: List[Truck], lightweight: Optional[bool] = None) -> str:
+    """Route map as standalone HTML, cached by `map_key` and mode so reruns with unchanged routes skip
+    building and serializing it."""
+    # folium is imported on first use so that pages and reruns that reuse a rendered map never load it.
+    from src.visualizer.map_plotter import MapPlotter
+    with timer('visualizer.map_build'):
+        map_plotter = MapPlotter(_farms, _markets, _trucks, lightweight=lightweight)
+        map_plotter.add_markers()
+        map_plotter.plot_routes(_solution)
+        return map_plotter.render_html()
+
+
+def route_map_key(solution: Dict, farms: List[Farm], markets: List[Market], trucks: List[Truck]) -> str:
+    locations = [(loc.id, loc.latitude, loc.longitude) for loc in farms + markets]
+    # Depot markers come from the trucks' home depots, not from the routes.
+    depots = sorted((t.id, t.home_depot_id) for t in trucks)
+    return hash_payload({'routes': {t: r['route'] for t, r in solution.get('routes', {}).items()},
+                         'locations': locations, 'depots': depots})
+
+
+@timed('visualizer.dashboard')
 def create_transport_dashboard(
-    solution: Dict, costs: Dict, schedules: Dict,
-    farms: List[Farm], markets: List[Market], trucks: List[Truck]
+    solution: Dict, costs: Dict, schedules: Optional[pd.DataFrame],
+    farms: List[Farm], markets: List[Market], trucks: List[Truck],
+    fleet_costs: Optional[pd.DataFrame] = None, lightweight_map: Optional[bool] = None
 ):
     if solution.get("error"):
         st.error(f"Optimization Failed: {solution['error']}")
         return
 
+    if fleet_costs is None:
+        fleet_costs = calculate_fleet_costs(RouteTable.from_solution(solution), trucks)
+
     summary = costs.get('summary', {})
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Cost", f"${summary.get('total_overall_cost', 0):,.2f}")
@@ -22,39 +57,26 @@ def create_transport_dashboard(
     col4.metric("Total Load Delivered", f"{solution.get('total_load', 0):,.0f} kg")
 
     st.header("🗺️ Optimized Routes Map")
-    map_plotter = MapPlotter(farms, markets, trucks)
-    map_plotter.add_markers()
-    map_plotter.plot_routes(solution)
-    st_folium(map_plotter.map, width=None, height=500)
+    html = render_route_map(route_map_key(solution, farms, markets, trucks), solution, farms, markets, trucks,
+                            lightweight_map)
+    with timer('visualizer.map_render'):
+        components.html(html, height=500)
 
     st.header("🌍 Sustainability Insights")
-    total_co2 = 0
-    truck_map = {t.id: t for t in trucks}
-    for truck_id, route_data in solution.get('routes', {}).items():
-        truck = truck_map.get(truck_id)
-        if truck:
-            distance_km = route_data['distance_m'] / 100
-            total_co2 += distance_km * truck.co2_emissions_g_per_km
-    st.metric("Estimated Carbon Footprint", f"{total_co2 / 1000:,.2f} kg CO₂")
+    st.metric("Estimated Carbon Footprint", f"{fleet_costs['co2_kg'].sum():,.2f} kg CO₂")
 
     st.header("📊 Performance Breakdown")
     st.subheader("Per-Truck Performance")
-    performance_data = []
-    active_trucks_map = {t.id: t for t in trucks if t.id in solution.get('routes', {})}
-    for truck_id, route_data in solution.get('routes', {}).items():
-        truck_obj = active_trucks_map.get(truck_id)
-        if truck_obj:
-            utilization = (route_data['load_kg'] / truck_obj.capacity_weight) * 100
-            performance_data.append({
-                "Truck ID": truck_id,
-                "Number of Stops": len(route_data['route']) - 2,
-                "Route Distance (km)": round(route_data['distance_m'] / 100, 2),
-                "Total Load (kg)": route_data['load_kg'],
-                "Capacity Utilization (%)": round(utilization, 2),
-                "Total Cost ($)": round(costs.get(truck_id, {}).get('total_cost', 0), 2),
-                "Cost per Km ($)": round(costs.get(truck_id, {}).get('cost_per_km', 0), 2),
-            })
-    if performance_data: st.dataframe(pd.DataFrame(performance_data))
+    performance_data = pd.DataFrame({
+        "Truck ID": fleet_costs['truck_id'],
+        "Number of Stops": fleet_costs['num_stops'],
+        "Route Distance (km)": fleet_costs['distance_km'].round(2),
+        "Total Load (kg)": fleet_costs['load_kg'],
+        "Capacity Utilization (%)": fleet_costs['utilization_pct'].round(2),
+        "Total Cost ($)": [round(costs.get(t, {}).get('total_cost', 0), 2) for t in fleet_costs['truck_id']],
+        "Cost per Km ($)": [round(costs.get(t, {}).get('cost_per_km', 0), 2) for t in fleet_costs['truck_id']],
+    })
+    if not performance_data.empty: st.dataframe(performance_data)
     else: st.info("No routes generated.")
 
     tab1, tab2 = st.tabs(["Cost Analysis", "Delivery Schedules"])
@@ -71,7 +93,44 @@ def create_transport_dashboard(
         st.bar_chart(cost_df)
     with tab2:
         st.subheader("Schedules per Truck")
-        if not schedules: st.warning("No schedules generated.")
-        for truck_id, schedule_data in schedules.items():
-            with st.expander(f"View schedule for {truck_id}"):
-                st.dataframe(pd.DataFrame(schedule_data))
\ No newline at end of file
+        if schedules is None or schedules.empty:
+            st.warning("No schedules generated.")
+        else:
+            late_stops = schedules[schedules['lateness_minutes'] > 0]
+            col1, col2 = st.columns(2)
+            col1.metric("Stops Outside Time Window", f"{len(late_stops)} of {len(schedules)}")
+            col2.metric("Total Lateness", f"{late_stops['lateness_minutes'].sum():,.0f} min")
+            selected_truck = st.selectbox("View schedule for", options=list(schedules['truck_id'].unique()))
+            st.dataframe(format_schedule(schedules, selected_truck), hide_index=True)
+
+
+def render_performance_panel(recorder: MetricsRecorder):
+    st.header("⚙️ Performance")
+    summary = recorder.stage_summary()
+    if summary.empty:
+        st.info("Nothing was timed in this run.")
+    else:
+        st.dataframe(summary.round({'total_ms': 1, 'max_ms': 1}), hide_index=True)
+    if recorder.counters:
+        st.dataframe(pd.DataFrame(list(recorder.counters.items()), columns=["Counter", "Value"]), hide_index=True)
+    searches = [run for run in recorder.solver_runs if run['stage'] == 'solver.search']
+    repairs = [run for run in recorder.solver_runs if run['stage'] == 'solver.incremental']
+    if not searches and not repairs:
+        st.caption("No solver search ran in this rerun (routes came from the session or solution cache).")
+    for run in searches:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Search Time", f"{run['wall_time_ms'] / 1000:,.2f} s")
+        col2.metric("Branches", f"{run['branches']:,}")
+        col3.metric("Solutions Found", f"{run['solutions_found']:,}")
+        col4.metric(OBJECTIVE_LABEL, f"{run['objective']:,}" if run['objective'] is not None else "—")
+        if run.get('history'):
+            history_df = pd.DataFrame(run['history'], columns=["Elapsed (s)", OBJECTIVE_LABEL])
+            st.line_chart(history_df.set_index("Elapsed (s)")[OBJECTIVE_LABEL])
+    for run in repairs:
+        st.caption("Incremental repair of the previous routes for market changes")
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Changed Markets", f"{run['delta_markets']:,}")
+        col2.metric("Routes Changed", f"{run['routes_changed']:,}")
+        col3.metric("Markets Inserted", f"{run['inserted']:,}")
+        col4.metric("2-opt Moves", f"{run['two_opt_moves']:,}")
+        col5.metric("Total Distance", f"{run['total_distance_km']:,.2f} km")
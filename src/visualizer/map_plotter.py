@@ -1,27 +1,82 @@
 # src/visualizer/map_plotter.py
 import folium
-from typing import Dict, List
+import numpy as np
+from folium.plugins import FastMarkerCluster
+from typing import Dict, List, Optional
 from src.models.data_models import Farm, Market, Truck
+from src.models.spatial_index import SpatialIndex
+
+# Above this many locations the map switches to clustered markers and one simplified GeoJSON route layer.
+LIGHTWEIGHT_LOCATION_THRESHOLD = 500
+# Route vertices closer than this (degrees) to the simplified line are dropped in lightweight mode.
+SIMPLIFY_TOLERANCE_DEG = 0.01
+COORDINATE_DECIMALS = 5
+ROUTE_COLORS = ['red', 'purple', 'orange', 'darkred', 'cadetblue', 'darkgreen']
+
+
+def simplify_polyline(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker on an (n, 2) array with an explicit stack; distances per segment are vectorized."""
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1:last] - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack += [(first, split), (split, last)]
+    return points[keep]
 
 
 class MapPlotter:
-    def __init__(self, farms: List[Farm], markets: List[Market], trucks: List[Truck]):
+    def __init__(self, farms: List[Farm], markets: List[Market], trucks: List[Truck],
+                 lightweight: Optional[bool] = None):
         self.all_locations = {loc.id: loc for loc in farms + markets}
+        self.lightweight = len(self.all_locations) > LIGHTWEIGHT_LOCATION_THRESHOLD if lightweight is None else lightweight
         self.truck_depots = {t.id: t.home_depot_id for t in trucks}
+        self.index = SpatialIndex.from_locations(farms, markets, [f.id for f in farms] + list(self.truck_depots.values()))
         self.map = folium.Map(location=[0, 0], zoom_start=2)
 
     def add_markers(self):
-        for loc_id, loc in self.all_locations.items():
-            is_depot = any(depot_id == loc_id for depot_id in self.truck_depots.values())
-            if isinstance(loc, Farm) or is_depot:
+        if self.lightweight:
+            return self._add_clustered_markers()
+        for loc_id, is_depot in zip(self.index.ids, self.index.is_depot):
+            loc = self.all_locations[loc_id]
+            if is_depot:
                 popup, icon = f"Depot/Farm: {loc.id}", folium.Icon(color='green', icon='home')
             else:
                 popup, icon = f"Market: {loc.id}<br>Demand: {loc.demand_weight} kg", folium.Icon(color='blue',
                                                                                                  icon='shopping-cart')
             folium.Marker(location=[loc.latitude, loc.longitude], popup=popup, icon=icon).add_to(self.map)
 
+    def _add_clustered_markers(self):
+        # Depots stay individual markers; markets go into one client-side cluster layer with no per-marker HTML.
+        for position in np.flatnonzero(self.index.is_depot):
+            folium.Marker(location=[self.index.latitudes[position], self.index.longitudes[position]],
+                          popup=f"Depot/Farm: {self.index.ids[position]}",
+                          icon=folium.Icon(color='green', icon='home')).add_to(self.map)
+        markets = ~self.index.is_depot
+        points = np.round(np.column_stack([self.index.latitudes[markets], self.index.longitudes[markets]]),
+                          COORDINATE_DECIMALS)
+        FastMarkerCluster(points.tolist(), name="Markets").add_to(self.map)
+
     def plot_routes(self, solution: Dict):
-        colors = ['red', 'purple', 'orange', 'darkred', 'cadetblue', 'darkgreen']
+        if self.lightweight:
+            return self._plot_routes_geojson(solution)
+        colors = ROUTE_COLORS
         color_index, all_route_points = 0, []
 
         for truck_id, route_data in solution.get('routes', {}).items():
@@ -41,4 +96,33 @@ class MapPlotter:
                 color_index += 1
 
         if all_route_points:
-            self.map.fit_bounds(all_route_points, padding=(20, 20))
\ No newline at end of file
+            self.map.fit_bounds(all_route_points, padding=(20, 20))
+
+    def _plot_routes_geojson(self, solution: Dict):
+        """All routes as a single simplified GeoJSON layer instead of one PolyLine per truck."""
+        features, bounds = [], []
+        for route_index, (truck_id, route_data) in enumerate(solution.get('routes', {}).items()):
+            positions = [self.index.position[n] for n in route_data['route'] if n in self.index.position]
+            if not positions:
+                continue
+            points = np.column_stack([self.index.latitudes[positions], self.index.longitudes[positions]])
+            bounds += [points.min(axis=0), points.max(axis=0)]
+            points = np.round(simplify_polyline(points, SIMPLIFY_TOLERANCE_DEG), COORDINATE_DECIMALS)
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': points[:, ::-1].tolist()},
+                'properties': {'truck_id': truck_id, 'distance_km': round(route_data['distance_m'] / 100, 2),
+                               'color': ROUTE_COLORS[route_index % len(ROUTE_COLORS)]},
+            })
+        if not features:
+            return
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features}, name="Routes",
+            style_function=lambda feature: {'color': feature['properties']['color'], 'weight': 3, 'opacity': 0.8},
+            tooltip=folium.GeoJsonTooltip(fields=['truck_id', 'distance_km'], aliases=['Truck', 'Distance (km)']),
+        ).add_to(self.map)
+        bounds = np.array(bounds)
+        self.map.fit_bounds([bounds.min(axis=0).tolist(), bounds.max(axis=0).tolist()], padding=(20, 20))
+
+    def render_html(self) -> str:
+        return self.map.get_root().render()
@@ -0,0 +1,41 @@
+# tests/conftest.py
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.compact_network import CompactRoadNetwork
+from src.models.data_models import Market, Truck
+
+
+@pytest.fixture
+def nested_matrix():
+    # Asymmetric on purpose: A -> B differs from B -> A.
+    return {
+        'A': {'A': {'distance': 0, 'time': 0}, 'B': {'distance': 10, 'time': 12}, 'C': {'distance': 20, 'time': 25}},
+        'B': {'A': {'distance': 11, 'time': 13}, 'B': {'distance': 0, 'time': 0}, 'C': {'distance': 5, 'time': 6}},
+        'C': {'A': {'distance': 21, 'time': 24}, 'B': {'distance': 6, 'time': 7}, 'C': {'distance': 0, 'time': 0}},
+    }
+
+
+@pytest.fixture
+def network(nested_matrix):
+    return CompactRoadNetwork.from_nested_dict(nested_matrix)
+
+
+@pytest.fixture
+def make_market():
+    def make(market_id, demand=100.0, window='06:00-20:00', variability=0.2, latitude=0.0, longitude=0.0):
+        return Market(id=market_id, latitude=latitude, longitude=longitude, demand_weight=demand,
+                      service_time_window=window, demand_variability=variability, lead_time_days=3)
+    return make
+
+
+@pytest.fixture
+def make_truck():
+    def make(truck_id, capacity=1000.0, depot='A'):
+        return Truck(id=truck_id, capacity_weight=capacity, capacity_volume=50, fuel_type='Diesel',
+                     avg_fuel_consumption_L_per_100km=30, driver_hours_limit=10, home_depot_id=depot,
+                     co2_emissions_g_per_km=800)
+    return make
@@ -0,0 +1,52 @@
+# tests/test_background_solver.py
+import time
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.optimizer.background_solver import BackgroundSolveJob
+
+TIME_LIMIT = 60
+
+
+@pytest.fixture(scope='module')
+def instance(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('background'))
+    generate_dataset(data_dir, num_farms=1, num_markets=40, num_trucks=8, seed=6)
+    (_, markets, trucks, network), _ = load_dataset(data_dir)
+    return [m.to_model() for m in markets], [t.to_model() for t in trucks], network
+
+
+def poll_until(job, condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition(job.poll()):
+        assert time.monotonic() < deadline, "background solve did not get there in time"
+        time.sleep(0.05)
+    return job
+
+
+def test_poll_streams_improving_solutions_and_stop_keeps_the_best(instance):
+    markets, trucks, network = instance
+    started = time.monotonic()
+    job = BackgroundSolveJob(markets, trucks, network, time_limit=TIME_LIMIT)
+    poll_until(job, lambda j: len(j.history) >= 2)
+    assert job.running and job.best_solution['routes']
+    objectives = [objective for _, objective in job.history]
+    assert objectives == sorted(objectives, reverse=True) and len(set(objectives)) == len(objectives)
+
+    job.stop()
+    poll_until(job, lambda j: not j.running)
+    assert job.status == 'stopped'
+    assert time.monotonic() - started < TIME_LIMIT
+    served = sorted(loc for data in job.result['routes'].values() for loc in data['route'][1:-1])
+    assert served == sorted(m.id for m in markets)
+    assert round(job.result['total_distance'] * 100) <= job.history[-1][1]
+
+
+def test_cancel_terminates_the_process(instance):
+    markets, trucks, network = instance
+    job = BackgroundSolveJob(markets, trucks, network, time_limit=TIME_LIMIT)
+    poll_until(job, lambda j: j.history)
+    job.cancel()
+    job._process.join(timeout=10)
+    assert not job._process.is_alive()
+    assert job.status == 'stopped' and not job.poll().running
@@ -0,0 +1,65 @@
+# tests/test_bulk_validation.py
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from src.data_manager.bulk_validation import RecordValidationError, validate_csv, validate_frame, validate_records
+from src.models.data_models import Market, Truck
+
+MARKETS = pd.DataFrame({
+    'id': ['M0', 'M1', np.nan, 'M3', 'M4', 7, 'M6'],
+    'latitude': [1.0, 2.0, 3.0, 'north', 5.0, 6.0, 7.0],
+    'longitude': [1.0] * 7,
+    'demand_weight': [10.0, 0.0, 5.0, 5.0, 5.0, 5.0, 5.0],
+    'service_time_window': ['08:00-10:00'] * 6 + [np.nan],
+    'demand_variability': [0.2] * 7,
+    'lead_time_days': [3, 3, 3, 3, 2.5, 3, 3],
+}, dtype=object)
+
+
+def _pydantic_rejects(row):
+    try:
+        Market(**{k: v for k, v in row.items() if not (isinstance(v, float) and np.isnan(v))})
+    except ValidationError:
+        return True
+    return False
+
+
+def test_error_rows_match_per_row_pydantic():
+    records, errors = validate_frame(MARKETS, Market)
+    rejected = [i for i, row in enumerate(MARKETS.to_dict(orient='records')) if _pydantic_rejects(row)]
+    assert sorted(errors['row'].unique()) == rejected == [1, 2, 3, 4, 5, 6]
+    assert [m.id for m in records] == ['M0']
+
+
+def test_errors_name_the_column_and_reason():
+    _, errors = validate_frame(MARKETS, Market)
+    reasons = {(r.row, r.column): r.error for r in errors.itertuples()}
+    assert reasons[(1, 'demand_weight')] == "must be greater than 0"
+    assert reasons[(2, 'id')] == "missing value"
+    assert reasons[(3, 'latitude')].startswith("expected a number")
+    assert reasons[(4, 'lead_time_days')] == "expected a whole number"
+    assert reasons[(5, 'id')] == "expected a string"
+    assert reasons[(6, 'service_time_window')] == "missing value"
+
+
+def test_valid_records_keep_model_types():
+    records, errors = validate_frame(MARKETS.iloc[[0]], Market)
+    assert errors.empty
+    market = records[0]
+    assert market.to_model() == Market(**MARKETS.iloc[0].to_dict())
+    assert isinstance(market.lead_time_days, (int, np.integer))
+
+
+def test_numeric_id_column_from_csv_is_rejected():
+    csv = (b"id,capacity_weight,capacity_volume,fuel_type,avg_fuel_consumption_L_per_100km,driver_hours_limit,"
+           b"home_depot_id,co2_emissions_g_per_km\n1,8000,30,Diesel,30,10,F1,800\n")
+    records, errors = validate_csv(csv, Truck)
+    assert len(records) == 0 and errors['error'].tolist() == ["expected a string"]
+
+
+def test_missing_column_and_strict_loader():
+    _, errors = validate_frame(MARKETS.drop(columns=['lead_time_days']), Market)
+    assert errors[['column', 'error']].values.tolist() == [['lead_time_days', 'missing column']]
+    with pytest.raises(RecordValidationError):
+        validate_records(MARKETS, Market)
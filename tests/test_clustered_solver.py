@@ -0,0 +1,44 @@
+# tests/test_clustered_solver.py
+import numpy as np
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.optimizer.market_clustering import cluster_markets
+from src.optimizer.vrp_solver import solve_clustered
+
+
+@pytest.fixture(scope='module')
+def instance(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('clustered'))
+    generate_dataset(data_dir, num_farms=4, num_markets=60, num_trucks=12, seed=5)
+    (farms, markets, trucks, network), _ = load_dataset(data_dir)
+    return list(farms), list(markets), list(trucks), network
+
+
+def test_clusters_partition_markets_within_fleet_capacity(instance):
+    _, markets, trucks, _ = instance
+    groups = cluster_markets(markets, trucks, max_cluster_size=20)
+    assert len(groups) > 1
+    assert sorted(m.id for group, _ in groups for m in group) == sorted(m.id for m in markets)
+    assert sorted(t.id for _, fleet in groups for t in fleet) == sorted(t.id for t in trucks)
+    for group, fleet in groups:
+        assert sum(m.demand_weight for m in group) <= sum(t.capacity_weight for t in fleet)
+
+
+def test_clustered_routes_are_costed_on_real_network_legs(instance):
+    farms, markets, trucks, network = instance
+    assert len({t.home_depot_id for t in trucks}) > 1
+    solution = solve_clustered(markets, trucks, network, farms, time_limit=1, max_cluster_size=20, max_workers=1)
+    assert not solution.get('error')
+
+    served = [stop for r in solution['routes'].values() for stop in r['route'][1:-1]]
+    assert sorted(served) == sorted(m.id for m in markets)
+    capacity = {t.id: t.capacity_weight for t in trucks}
+    demand = {m.id: m.demand_weight for m in markets}
+    for truck_id, route_data in solution['routes'].items():
+        route = route_data['route']
+        assert route[0] == route[-1] == trucks[0].home_depot_id
+        legs = network.route_legs(route).astype(np.float64)
+        assert route_data['distance_m'] == int(np.rint(legs * 100).sum())
+        assert sum(int(demand[m]) for m in route[1:-1]) == route_data['load_kg'] <= capacity[truck_id]
+    assert solution['total_distance'] == pytest.approx(sum(r['distance_m'] for r in solution['routes'].values()) / 100)
@@ -0,0 +1,35 @@
+# tests/test_compact_network.py
+import numpy as np
+import pytest
+from src.models.compact_network import CompactRoadNetwork, as_compact
+
+
+def test_from_nested_dict_matches_nested_lookups(nested_matrix, network):
+    for origin, row in nested_matrix.items():
+        for dest, arc in row.items():
+            assert network.matrix[origin][dest] == {'distance': arc['distance'], 'time': arc['time']}
+
+
+def test_submatrix_follows_requested_order_and_zeroes_unknown_ids(network):
+    out = network.submatrix(['C', 'missing', 'A'])
+    np.testing.assert_array_equal(out, [[0, 0, 21], [0, 0, 0], [20, 0, 0]])
+    assert network.submatrix(['B', 'C'], 'time').tolist() == [[0, 6], [7, 0]]
+
+
+def test_route_legs_are_directed(network):
+    np.testing.assert_array_equal(network.route_legs(['A', 'B', 'C', 'A']), [10, 5, 21])
+    np.testing.assert_array_equal(network.route_legs(['A', 'C', 'B', 'A'], 'time'), [25, 7, 13])
+    np.testing.assert_array_equal(network.route_legs(['A', 'missing', 'B']), [0, 0])
+
+
+def test_subset_keeps_arcs_and_fingerprint_tracks_content(network):
+    subset = network.subset(['B', 'C'])
+    assert subset.ids == ['B', 'C']
+    assert subset.matrix['C']['B'] == network.matrix['C']['B']
+    assert network.fingerprint() == as_compact(network.matrix).fingerprint()
+    assert subset.fingerprint() != network.fingerprint()
+
+
+def test_shape_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        CompactRoadNetwork(['A', 'B'], np.zeros((2, 3)), np.zeros((2, 2)))
@@ -0,0 +1,89 @@
+# tests/test_cost_calculator.py
+import json
+import numpy as np
+import pytest
+from src.calculator.cost_calculator import calculate_all_costs, calculate_fleet_costs, compute_route_metrics
+from src.calculator.route_table import RouteTable
+from src.data_manager.config_manager import ConfigManager
+
+RATES = {'fuel_cost_per_liter': 1.75, 'maintenance_cost_per_km': 0.15, 'driver_wage_per_hour': 28.0}
+
+
+def per_truck_costs(solution, trucks, road_network, rates):
+    """The original route-by-route calculation over the nested matrix, kept as the reference."""
+    truck_map = {t.id: t for t in trucks}
+    costs, summary = {}, {'total_overall_cost': 0.0, 'total_fuel_cost': 0.0, 'total_maintenance_cost': 0.0,
+                          'total_driver_cost': 0.0}
+    for truck_id, route_data in solution['routes'].items():
+        truck = truck_map.get(truck_id)
+        if not truck:
+            continue
+        route = route_data['route']
+        minutes = sum(road_network[a][b]['time'] for a, b in zip(route[:-1], route[1:]))
+        distance_km = route_data['distance_m'] / 100
+        fuel = (distance_km / 100) * truck.avg_fuel_consumption_L_per_100km * rates['fuel_cost_per_liter']
+        maintenance = distance_km * rates['maintenance_cost_per_km']
+        driver = (minutes / 60) * rates['driver_wage_per_hour']
+        total = fuel + maintenance + driver
+        costs[truck_id] = {'total_cost': total, 'fuel_cost': fuel, 'maintenance_cost': maintenance,
+                           'driver_cost': driver, 'cost_per_km': total / distance_km if distance_km > 0 else 0}
+        for key, value in zip(summary, (total, fuel, maintenance, driver)):
+            summary[key] += value
+    costs['summary'] = summary
+    return costs
+
+
+@pytest.fixture
+def trucks(make_truck):
+    fleet = [make_truck('T1'), make_truck('T2'), make_truck('T3')]
+    fleet[1] = fleet[1].model_copy(update={'avg_fuel_consumption_L_per_100km': 22.5})
+    return fleet
+
+
+def solution_for(routes):
+    # distance_m is in the solver's 1/100 km units.
+    return {'routes': {truck_id: {'route': route, 'distance_m': 100 * len(route) + 7, 'load_kg': 10 * len(route)}
+                       for truck_id, route in routes.items()}}
+
+
+SOLUTIONS = [
+    solution_for({'T1': ['A', 'B', 'C', 'A'], 'T2': ['A', 'C', 'A'], 'T9': ['A', 'B', 'A']}),
+    solution_for({'T2': ['A', 'B', 'A'], 'T3': ['A', 'C', 'B', 'A']}),
+]
+
+
+def assert_costs_match(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert actual[key] == pytest.approx(values, rel=1e-12)
+
+
+def test_vectorized_costs_match_the_per_truck_calculation(nested_matrix, network, trucks, tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'variable_costs': RATES}))
+    for solution in SOLUTIONS:
+        expected = per_truck_costs(solution, trucks, nested_matrix, RATES)
+        assert_costs_match(calculate_all_costs(solution, trucks, network, ConfigManager(str(config_path))), expected)
+
+
+def test_per_route_rate_arrays_match_one_scalar_run_per_scenario(nested_matrix, network, trucks):
+    scenario_rates = [RATES, {'fuel_cost_per_liter': 2.4, 'maintenance_cost_per_km': 0.2, 'driver_wage_per_hour': 31.0}]
+    table = RouteTable.from_solutions(SOLUTIONS, network)
+    rates = {key: np.array([r[key] for r in scenario_rates])[table.scenario] for key in RATES}
+    stacked = calculate_fleet_costs(table, trucks, rates)
+    for position, (solution, scalar_rates) in enumerate(zip(SOLUTIONS, scenario_rates)):
+        single = calculate_fleet_costs(compute_route_metrics(solution, network), trucks, scalar_rates)
+        rows = stacked[stacked['scenario'] == position].reset_index(drop=True)
+        np.testing.assert_allclose(rows['total_cost'], single['total_cost'], rtol=1e-12)
+        reference = per_truck_costs(solution, trucks, nested_matrix, scalar_rates)
+        assert rows['truck_id'].tolist() == [t for t in reference if t != 'summary']
+        np.testing.assert_allclose(rows['total_cost'], [reference[t]['total_cost'] for t in rows['truck_id']],
+                                   rtol=1e-12)
+
+
+def test_fleet_figures_without_rates(network, trucks):
+    frame = calculate_fleet_costs(compute_route_metrics(SOLUTIONS[0], network), trucks)
+    assert 'total_cost' not in frame.columns
+    assert frame['truck_id'].tolist() == ['T1', 'T2']
+    np.testing.assert_allclose(frame['co2_kg'], frame['distance_km'] * 800 / 1000)
+    np.testing.assert_allclose(frame['utilization_pct'], frame['load_kg'] / 1000 * 100)
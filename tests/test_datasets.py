@@ -0,0 +1,36 @@
+# tests/test_datasets.py
+import json
+from src.data_manager import datasets
+from src.data_manager.config_manager import ConfigManager
+from src.data_manager.synthetic_data import generate_dataset
+
+
+def test_file_digests_follow_rewrites_in_a_bounded_cache(tmp_path):
+    path = tmp_path / 'markets.csv'
+    path.write_text('id\nM1\n')
+    before = datasets.file_digest(str(path))
+    path.write_text('id\nM10\n')
+    assert datasets.file_digest(str(path)) != before
+    assert datasets._hash_file.cache_info().maxsize == datasets.DIGEST_CACHE_SIZE
+
+
+def test_dataset_config_wins_over_the_bundled_one(tmp_path):
+    assert datasets.config_path(str(tmp_path)) == datasets.CONFIG_PATH
+    own = tmp_path / 'config.json'
+    own.write_text(json.dumps({'fuel_price_per_liter': 2.0}))
+    assert datasets.config_path(str(tmp_path)) == str(own)
+
+
+def test_generated_dataset_loads_from_another_directory(tmp_path, monkeypatch):
+    data_dir = tmp_path / 'generated'
+    generate_dataset(str(data_dir), num_farms=1, num_markets=4, num_trucks=2, seed=3)
+    digest = datasets.dataset_digest(str(data_dir))
+    elsewhere = tmp_path / 'elsewhere'
+    (elsewhere / 'data').mkdir(parents=True)
+    # A stray data/config.json in the working directory must not stand in for the bundled one.
+    (elsewhere / 'data' / 'config.json').write_text(json.dumps({'variable_costs': {'fuel_cost_per_liter': 99.0}}))
+    monkeypatch.chdir(elsewhere)
+    (_, markets, _, _), config = datasets.load_dataset(str(data_dir))
+    assert len(markets) == 4
+    assert config.get_variable_costs() == ConfigManager(datasets.CONFIG_PATH).get_variable_costs()
+    assert datasets.dataset_digest(str(data_dir)) == digest
@@ -0,0 +1,76 @@
+# tests/test_demand_simulation.py
+import numpy as np
+import pandas as pd
+import pytest
+from src.calculator import demand_simulation
+from src.calculator.demand_simulation import RouteStops, simulate_demand
+from src.monitoring import metrics
+from src.optimizer.solution_cache import SolutionCache
+
+
+@pytest.fixture
+def plan(make_market, make_truck):
+    markets = [make_market('M1', demand=300, variability=0.5), make_market('M2', demand=250, variability=0.3),
+               make_market('M3', demand=400, variability=0.4), make_market('M4', demand=100, variability=0.1)]
+    trucks = [make_truck('T1', capacity=600), make_truck('T2', capacity=520)]
+    solution = {'routes': {'T1': {'route': ['A', 'M1', 'M2', 'A']}, 'T2': {'route': ['A', 'M3', 'M4', 'A']}}}
+    return solution, markets, trucks
+
+
+def reference(stops, num_scenarios, seed, batch_size):
+    """Scenario-by-scenario replay of the same draws: trucks unload stop by stop until they run empty."""
+    sizes = [min(batch_size, num_scenarios - start) for start in range(0, num_scenarios, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    draws = np.vstack([np.random.default_rng(s).standard_normal((n, len(stops.route))) for s, n in zip(seeds, sizes)])
+    overflows, stockouts = np.zeros(len(stops.truck_ids)), np.zeros(len(stops.route))
+    stockout_kg = np.zeros(len(stops.route))
+    for row in draws:
+        demand = np.maximum(stops.mean + stops.std * row, 0)
+        on_board = stops.capacity.copy()
+        for stop, truck in enumerate(stops.route):
+            delivered = min(demand[stop], on_board[truck])
+            on_board[truck] -= delivered
+            if demand[stop] - delivered > 1e-9:
+                stockouts[stop] += 1
+                stockout_kg[stop] += demand[stop] - delivered
+        for truck in range(len(stops.truck_ids)):
+            overflows[truck] += demand[stops.route == truck].sum() > stops.capacity[truck]
+    return overflows / num_scenarios, stockouts / num_scenarios, stockout_kg / num_scenarios
+
+
+def test_risk_matches_a_stop_by_stop_replay(plan, monkeypatch):
+    solution, markets, trucks = plan
+    monkeypatch.setattr(demand_simulation, 'BATCH_ELEMENTS', 1000)
+    truck_risk, market_risk = simulate_demand(solution, markets, trucks, num_scenarios=2000, seed=7)
+    stops = RouteStops.from_solution(solution, markets, trucks)
+    overflow, stockout, stockout_kg = reference(stops, 2000, 7, 1000 // len(stops.route))
+    np.testing.assert_allclose(truck_risk['overflow_probability'], overflow)
+    np.testing.assert_allclose(market_risk['stockout_probability'], stockout)
+    np.testing.assert_allclose(market_risk['expected_stockout_kg'], stockout_kg)
+    # Later stops bear the shortfall of an overloaded truck.
+    risk = market_risk.set_index('market_id')['stockout_probability']
+    assert risk['M2'] > risk['M1'] > 0 and risk['M4'] > 0
+    assert truck_risk['planned_load_kg'].tolist() == [550, 500]
+
+
+def test_results_do_not_depend_on_worker_count(plan, monkeypatch):
+    solution, markets, trucks = plan
+    monkeypatch.setattr(demand_simulation, 'BATCH_ELEMENTS', 400)
+    serial = simulate_demand(solution, markets, trucks, num_scenarios=1000, seed=3, max_workers=1)
+    monkeypatch.setattr(demand_simulation, 'PARALLEL_MIN_ELEMENTS', 0)
+    parallel = simulate_demand(solution, markets, trucks, num_scenarios=1000, seed=3, max_workers=2)
+    for a, b in zip(serial, parallel):
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_cached_results_skip_the_simulation(plan, tmp_path):
+    solution, markets, trucks = plan
+    cache = SolutionCache(str(tmp_path))
+    recorder = metrics.start_run()
+    first = simulate_demand(solution, markets, trucks, num_scenarios=500, cache=cache)
+    second = simulate_demand(solution, markets, trucks, num_scenarios=500, cache=cache)
+    assert recorder.counters == {'simulation.cache_miss': 1, 'simulation.cache_hit': 1}
+    for a, b in zip(first, second):
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+    simulate_demand(solution, markets, trucks, num_scenarios=500, seed=1, cache=cache)
+    assert recorder.counters['simulation.cache_miss'] == 2
@@ -0,0 +1,55 @@
+# tests/test_inventory.py
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import integrate
+from scipy.stats import norm
+from src.calculator.inventory import (DEFAULT_SERVICE_LEVELS, compute_inventory_policies, inventory_policy_table,
+                                      service_level_tradeoff)
+
+MARKETS = pd.DataFrame({'id': ['M1', 'M2', 'M3'], 'demand_weight': [950.0, 120.0, 2400.0],
+                        'demand_variability': [0.34, 0.1, 0.25], 'lead_time_days': [5, 1, 3]})
+
+
+def scalar_policy(avg_demand, variability, lead_time, service_level):
+    """The Inventory page's original one-market calculation."""
+    safety_stock = norm.ppf(service_level) * avg_demand * variability * np.sqrt(lead_time)
+    return safety_stock, avg_demand * lead_time + safety_stock
+
+
+def test_policies_match_the_per_market_formula():
+    policies = compute_inventory_policies(MARKETS['demand_weight'], MARKETS['demand_weight'] *
+                                          MARKETS['demand_variability'], MARKETS['lead_time_days'],
+                                          DEFAULT_SERVICE_LEVELS, holding_cost_per_kg_day=0.05)
+    assert policies['safety_stock'].shape == (len(MARKETS), len(DEFAULT_SERVICE_LEVELS))
+    for i, market in enumerate(MARKETS.itertuples()):
+        for j, level in enumerate(DEFAULT_SERVICE_LEVELS):
+            safety_stock, reorder_point = scalar_policy(market.demand_weight, market.demand_variability,
+                                                        market.lead_time_days, level)
+            assert policies['safety_stock'][i, j] == pytest.approx(safety_stock, rel=1e-12)
+            assert policies['reorder_point'][i, j] == pytest.approx(reorder_point, rel=1e-12)
+            assert policies['holding_cost_per_day'][i, j] == pytest.approx(safety_stock * 0.05, rel=1e-12)
+
+
+@pytest.mark.parametrize('service_level', [0.8, 0.95, 0.999])
+def test_expected_shortage_is_the_normal_loss_at_the_reorder_point(service_level):
+    mean, std, lead_time = 500.0, 80.0, 4
+    policies = compute_inventory_policies([mean], [std], [lead_time], [service_level])
+    reorder_point = policies['reorder_point'][0, 0]
+    lead_time_mean, lead_time_std = mean * lead_time, std * np.sqrt(lead_time)
+    # E[(D - ROP)+] for lead-time demand D ~ N(mean * L, std * sqrt(L)).
+    shortage, _ = integrate.quad(lambda d: (d - reorder_point) * norm.pdf(d, lead_time_mean, lead_time_std),
+                                 reorder_point, lead_time_mean + 12 * lead_time_std)
+    assert policies['expected_shortage'][0, 0] == pytest.approx(shortage, rel=1e-6)
+
+
+def test_tradeoff_totals_and_table():
+    tradeoff = service_level_tradeoff(MARKETS)
+    assert tradeoff['service_level'].tolist() == DEFAULT_SERVICE_LEVELS.tolist()
+    assert tradeoff['total_safety_stock'].is_monotonic_increasing
+    assert tradeoff['total_expected_shortage'].is_monotonic_decreasing
+    table = inventory_policy_table(MARKETS, 0.95)
+    row = tradeoff[tradeoff['service_level'] == 0.95].iloc[0]
+    for name in ('safety_stock', 'holding_cost_per_day', 'expected_shortage'):
+        assert table[name].sum() == pytest.approx(row[f'total_{name}'], rel=1e-12)
+    assert table.loc[0, 'safety_stock'] == pytest.approx(scalar_policy(950.0, 0.34, 5, 0.95)[0], rel=1e-12)
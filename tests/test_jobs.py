@@ -0,0 +1,132 @@
+# tests/test_jobs.py
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+import pytest
+from src.data_manager.synthetic_data import generate_dataset
+from src.service import jobs
+from src.service.jobs import JobManager, QueueFullError, UnknownDatasetError
+from src.service.pipeline import JobRequest
+from src.service.server import create_server
+
+
+class HeldPool:
+    """Stands in for the process pool: futures stay pending until the test settles them."""
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        for future in self.futures:
+            future.cancel()
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('jobs'))
+    generate_dataset(path, num_farms=1, num_markets=5, num_trucks=2, seed=1)
+    return path
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1, max_queued=1)
+    manager.pool.shutdown()
+    manager.pool = HeldPool()
+    yield manager
+    manager.shutdown()
+
+
+def test_identical_requests_join_the_job_in_flight(manager, data_dir):
+    first = manager.submit(JobRequest(data_dir=data_dir))
+    dataset_id = manager.register_dataset(data_dir)
+    assert manager.submit(JobRequest(dataset_id=dataset_id)) is first
+    other = manager.submit(JobRequest(data_dir=data_dir, mode='clustered'))
+    assert other is not first and len(manager.pool.futures) == 2
+    assert manager.recorder.counters['jobs.joined'] == 1
+
+    first.future.set_result({'ok': True})
+    assert manager.submit(JobRequest(data_dir=data_dir)) is not first
+
+
+def test_submissions_beyond_workers_plus_queue_are_refused(manager, data_dir):
+    manager.submit(JobRequest(data_dir=data_dir))
+    manager.submit(JobRequest(data_dir=data_dir, time_limit=5))
+    with pytest.raises(QueueFullError):
+        manager.submit(JobRequest(data_dir=data_dir, time_limit=6))
+    manager.pool.futures[0].set_result({})
+    assert manager.submit(JobRequest(data_dir=data_dir, time_limit=6)).status == 'queued'
+
+
+def test_changed_dataset_id_is_unknown(manager, data_dir, tmp_path):
+    generate_dataset(str(tmp_path), num_farms=1, num_markets=5, num_trucks=2, seed=2)
+    dataset_id = manager.register_dataset(str(tmp_path))
+    with open(os.path.join(tmp_path, 'markets.csv'), 'a') as f:
+        f.write('\n')
+    with pytest.raises(UnknownDatasetError):
+        manager.submit(JobRequest(dataset_id=dataset_id))
+
+
+@pytest.fixture
+def service(manager):
+    server = create_server(manager, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def call(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data, {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.load(e)
+
+
+def test_server_answers_429_when_the_queue_is_full(service, data_dir):
+    assert call(f"{service}/jobs", {'data_dir': data_dir})[0] == 202
+    assert call(f"{service}/jobs", {'data_dir': data_dir})[0] == 202  # joins the first job
+    assert call(f"{service}/jobs", {'data_dir': data_dir, 'time_limit': 5})[0] == 202
+    status, headers, _ = call(f"{service}/jobs", {'data_dir': data_dir, 'time_limit': 6})
+    assert status == 429 and headers['Retry-After'] == '5'
+
+
+def test_non_numeric_wait_is_a_bad_request(service, data_dir):
+    _, _, body = call(f"{service}/jobs", {'data_dir': data_dir})
+    status, _, body = call(f"{service}/jobs/{body['job_id']}?wait=soon")
+    assert status == 400 and 'wait' in body['error']
+
+
+def test_job_listings_tolerate_concurrent_submissions(manager, data_dir, monkeypatch):
+    monkeypatch.setattr(jobs, 'MAX_FINISHED_JOBS', 2)
+    manager.max_queued = 1000
+    errors, done = [], threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                manager.stats()
+                [job.to_dict(include_result=False) for job in manager.list_jobs()]
+            except RuntimeError as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for time_limit in range(1, 400):
+            manager.submit(JobRequest(data_dir=data_dir, time_limit=time_limit)).future.set_result({})
+    finally:
+        done.set()
+        reader.join()
+    assert not errors and len(manager.list_jobs()) <= 3
+
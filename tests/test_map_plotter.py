@@ -0,0 +1,37 @@
+# tests/test_map_plotter.py
+import numpy as np
+from src.visualizer.dashboard import route_map_key
+from src.visualizer.map_plotter import simplify_polyline
+
+
+def test_collinear_points_collapse_to_the_endpoints():
+    points = np.column_stack([np.linspace(0, 10, 11), np.linspace(5, 25, 11)])
+    np.testing.assert_array_equal(simplify_polyline(points, 1e-9), points[[0, -1]])
+
+
+def test_points_beyond_the_tolerance_are_kept():
+    points = np.array([[0, 0], [1, 0.4], [2, 0.9], [3, 1.5], [4, 0]], dtype=float)
+    simplified = simplify_polyline(points, tolerance=0.5)
+    np.testing.assert_array_equal(simplified, points[[0, 3, 4]])
+    # A tolerance below every deviation keeps all points; one above them all keeps only the endpoints.
+    assert len(simplify_polyline(points, tolerance=0.01)) == len(points)
+    np.testing.assert_array_equal(simplify_polyline(points, tolerance=2.0), points[[0, -1]])
+
+
+def test_zero_length_segments_are_handled():
+    # A closed loop: the first and last points coincide, so distances are measured from that point.
+    loop = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]], dtype=float)
+    np.testing.assert_array_equal(simplify_polyline(loop, 0.8), loop[[0, 2, 4]])
+    np.testing.assert_array_equal(simplify_polyline(loop, 0.5), loop)
+    repeated = np.array([[2, 2], [2, 2], [2, 2]], dtype=float)
+    np.testing.assert_array_equal(simplify_polyline(repeated, 0.1), repeated[[0, -1]])
+    assert len(simplify_polyline(loop[:2], 0.1)) == 2
+
+
+def test_map_key_follows_depot_changes(make_market, make_truck):
+    solution = {'routes': {'T1': {'route': ['A', 'M1', 'A']}}}
+    markets = [make_market('M1')]
+    key = route_map_key(solution, [], markets, [make_truck('T1', depot='A'), make_truck('T2', depot='A')])
+    assert key == route_map_key(solution, [], markets, [make_truck('T2', depot='A'), make_truck('T1', depot='A')])
+    assert key != route_map_key(solution, [], markets, [make_truck('T1', depot='A'), make_truck('T2', depot='B')])
+    assert key != route_map_key(solution, [], markets, [make_truck('T1', depot='A')])
@@ -0,0 +1,100 @@
+# tests/test_market_delta.py
+import itertools
+import numpy as np
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.models.data_models import Market, MarketDelta
+from src.monitoring import metrics
+from src.optimizer.vrp_solver import apply_market_delta, relocate, solve_routes, two_opt
+
+
+def route_length(route, distance, depot=0):
+    path = [depot] + route + [depot]
+    return float(sum(distance[a, b] for a, b in zip(path[:-1], path[1:])))
+
+
+@pytest.fixture
+def asymmetric():
+    rng = np.random.default_rng(3)
+    distance = rng.uniform(1, 100, size=(9, 9))
+    np.fill_diagonal(distance, 0)
+    return distance
+
+
+def test_two_opt_never_lengthens_and_keeps_the_stops(asymmetric):
+    route = list(range(1, 9))
+    improved, moves = two_opt(route, asymmetric)
+    assert sorted(improved) == route and moves > 0
+    assert route_length(improved, asymmetric) < route_length(route, asymmetric)
+    # Best improvement stops at a 2-opt local optimum.
+    assert two_opt(improved, asymmetric)[1] == 0
+    assert two_opt(route, asymmetric, max_moves=1)[1] == 1
+
+
+def test_two_opt_reaches_the_optimum_of_a_small_route(asymmetric):
+    route = [1, 2, 3, 4]
+    best = min(route_length(list(p), asymmetric) for p in itertools.permutations(route))
+    improved, _ = two_opt(route, asymmetric)
+    assert route_length(improved, asymmetric) >= best - 1e-9
+
+
+def test_relocate_respects_capacity(asymmetric):
+    routes, loads, capacities = [[1, 2, 3], [4, 5, 6, 7, 8]], [30, 50], [30, 60]
+    demands = {node: 10 for node in range(1, 9)}
+    before = sum(route_length(r, asymmetric) for r in routes)
+    relocate(routes, loads, list(range(1, 9)), demands, capacities, asymmetric, [0, 0])
+    assert sorted(itertools.chain(*routes)) == list(range(1, 9))
+    assert loads == [sum(demands[n] for n in r) for r in routes]
+    assert all(load <= cap for load, cap in zip(loads, capacities))
+    assert sum(route_length(r, asymmetric) for r in routes) <= before
+
+
+@pytest.fixture(scope='module')
+def instance(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('delta'))
+    generate_dataset(data_dir, num_farms=1, num_markets=24, num_trucks=6, seed=4)
+    (_, markets, trucks, network), _ = load_dataset(data_dir)
+    markets, trucks = [m.to_model() for m in markets], [t.to_model() for t in trucks]
+    prior = solve_routes(markets[:-1], trucks, network, mode='single_depot', time_limit=1)
+    assert not prior.get('error')
+    return markets, trucks, network, prior
+
+
+def check_solution(solution, markets, trucks, network):
+    served = [loc for data in solution['routes'].values() for loc in data['route'][1:-1]]
+    assert sorted(served) == sorted(m.id for m in markets)
+    demand = {m.id: m.demand_weight for m in markets}
+    capacity = {t.id: t.capacity_weight for t in trucks}
+    for truck_id, data in solution['routes'].items():
+        assert data['load_kg'] == sum(int(demand[loc]) for loc in data['route'][1:-1]) <= capacity[truck_id]
+        legs = network.route_legs(data['route'])
+        assert data['distance_m'] == int(np.rint(legs * 100).sum())
+
+
+def test_delta_serves_each_market_once_within_capacity(instance):
+    markets, trucks, network, prior = instance
+    delta = MarketDelta(demand_changes={markets[0].id: markets[0].demand_weight * 2, markets[1].id: 1.0},
+                        added=[markets[-1]], removed=[markets[2].id])
+    recorder = metrics.start_run()
+    solution = apply_market_delta(prior, delta, markets[:-1], trucks, network)
+    assert not solution.get('error')
+    check_solution(solution, delta.apply_to(markets[:-1]), trucks, network)
+    # The performance panel shows the repaired plan's distance from this record.
+    run = recorder.solver_runs[-1]
+    assert run['stage'] == 'solver.incremental' and run['total_distance_km'] == solution['total_distance']
+
+
+def test_delta_rejects_unknown_and_duplicate_markets(instance):
+    markets, trucks, network, prior = instance
+    with pytest.raises(ValueError, match='unknown'):
+        apply_market_delta(prior, MarketDelta(removed=['nope']), markets[:-1], trucks, network)
+    with pytest.raises(ValueError, match='already present'):
+        apply_market_delta(prior, MarketDelta(added=[markets[0]]), markets[:-1], trucks, network)
+
+
+def test_delta_reports_a_fleet_without_room(instance):
+    markets, trucks, network, prior = instance
+    huge = Market(**{**markets[-1].model_dump(), 'demand_weight': max(t.capacity_weight for t in trucks) + 1})
+    solution = apply_market_delta(prior, MarketDelta(added=[huge]), markets[:-1], trucks, network)
+    assert 'No spare truck capacity' in solution['error']
@@ -0,0 +1,59 @@
+# tests/test_multi_depot.py
+import numpy as np
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.models.compact_network import CompactRoadNetwork
+from src.optimizer.vrp_solver import VRPSolver, assign_markets_to_depots, merge_solutions
+
+
+@pytest.fixture
+def line_network():
+    # Locations on a line; distances are the gaps between positions.
+    positions = {'D1': 0, 'D2': 10, 'M1': 1, 'M2': 2, 'M3': 9, 'M4': 4}
+    return CompactRoadNetwork.from_nested_dict({
+        a: {b: {'distance': abs(x - y), 'time': abs(x - y)} for b, y in positions.items()}
+        for a, x in positions.items()})
+
+
+def test_markets_with_the_strongest_preference_are_placed_first(line_network, make_market, make_truck):
+    markets = [make_market(m, demand=100) for m in ('M1', 'M2', 'M3', 'M4')]
+    trucks = [make_truck('T1', capacity=200, depot='D1'), make_truck('T2', capacity=300, depot='D2')]
+    assignment = assign_markets_to_depots(markets, trucks, line_network)
+    # M4 is nearer D1 too, but it loses less by going to D2 than M2 would, so D1's room goes to M2.
+    assert {d: sorted(m.id for m in group) for d, group in assignment.items()} == \
+        {'D1': ['M1', 'M2'], 'D2': ['M3', 'M4']}
+
+
+def test_assignment_respects_each_depots_fleet_capacity(line_network, make_market, make_truck):
+    markets = [make_market(m, demand=150) for m in ('M1', 'M2', 'M4', 'M3')]
+    trucks = [make_truck('T1', capacity=300, depot='D1'), make_truck('T2', capacity=300, depot='D2')]
+    assignment = assign_markets_to_depots(markets, trucks, line_network)
+    assert sorted(m.id for group in assignment.values() for m in group) == ['M1', 'M2', 'M3', 'M4']
+    assert all(sum(m.demand_weight for m in group) <= 300 for group in assignment.values())
+
+
+def test_merged_totals_are_the_sums_of_the_sub_solutions():
+    first = {'routes': {'T1': {'distance_m': 1000, 'load_kg': 5}}, 'total_distance': 10.0, 'total_load': 5}
+    second = {'routes': {'T2': {'distance_m': 2050, 'load_kg': 7}}, 'total_distance': 20.5, 'total_load': 7}
+    merged = merge_solutions([first, second])
+    assert merged == {'routes': {**first['routes'], **second['routes']}, 'total_distance': 30.5, 'total_load': 12}
+    assert merge_solutions([first, {'error': 'infeasible'}]) == {'error': 'infeasible'}
+
+
+def test_multi_depot_solve_routes_every_market_from_its_trucks_depot(tmp_path):
+    generate_dataset(str(tmp_path), num_farms=3, num_markets=24, num_trucks=9, seed=2)
+    (_, markets, trucks, network), _ = load_dataset(str(tmp_path))
+    markets, trucks = [m.to_model() for m in markets], [t.to_model() for t in trucks]
+    assert len({t.home_depot_id for t in trucks}) > 1
+    solution = VRPSolver(markets, trucks, network).solve_multi_depot(time_limit=1, max_workers=1)
+    assert not solution.get('error')
+    truck_map = {t.id: t for t in trucks}
+    served = [loc for data in solution['routes'].values() for loc in data['route'][1:-1]]
+    assert sorted(served) == sorted(m.id for m in markets)
+    for truck_id, data in solution['routes'].items():
+        assert data['route'][0] == data['route'][-1] == truck_map[truck_id].home_depot_id
+        assert data['load_kg'] <= truck_map[truck_id].capacity_weight
+        assert data['distance_m'] == int(np.rint(network.route_legs(data['route']) * 100).sum())
+    assert solution['total_distance'] == pytest.approx(sum(d['distance_m'] for d in solution['routes'].values()) / 100)
+    assert solution['total_load'] == sum(d['load_kg'] for d in solution['routes'].values())
@@ -0,0 +1,56 @@
+# tests/test_network_store.py
+import os
+import numpy as np
+import pytest
+from src.data_manager.network_store import (DISTANCE_FILE, is_network_store, load_network_store, save_network_store,
+                                            staged_store)
+
+
+def test_round_trip_is_memory_mapped(network, tmp_path):
+    path = str(tmp_path / 'store')
+    save_network_store(network, path)
+    loaded = load_network_store(path)
+    assert isinstance(loaded.distance, np.memmap)
+    assert loaded.ids == network.ids
+    assert loaded.fingerprint() == network.fingerprint()
+
+
+def test_interrupted_rewrite_keeps_the_old_store(network, tmp_path):
+    path = str(tmp_path / 'store')
+    save_network_store(network, path)
+    with pytest.raises(KeyboardInterrupt):
+        with staged_store(path) as staging:
+            np.save(os.path.join(staging, DISTANCE_FILE), np.ones((5, 5), dtype=np.float32))
+            raise KeyboardInterrupt
+    assert load_network_store(path).fingerprint() == network.fingerprint()
+    assert os.listdir(tmp_path) == ['store']
+
+
+def test_rewrite_replaces_the_whole_store(network, tmp_path):
+    path = str(tmp_path / 'store')
+    save_network_store(network, path)
+    smaller = network.subset(['A', 'B'])
+    save_network_store(smaller, path)
+    assert is_network_store(path)
+    assert load_network_store(path).fingerprint() == smaller.fingerprint()
+    assert sorted(os.listdir(tmp_path)) == ['store']
+
+
+def test_unfinished_store_is_not_picked_up(tmp_path):
+    os.makedirs(tmp_path / 'store')
+    np.save(tmp_path / 'store' / DISTANCE_FILE, np.zeros((2, 2), dtype=np.float32))
+    assert not is_network_store(str(tmp_path / 'store'))
+
+
+def test_failed_swap_restores_the_old_store(network, tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    save_network_store(network, path)
+
+    def refuse(src, dst):
+        raise PermissionError(13, "Access is denied", dst)
+
+    monkeypatch.setattr(os, 'replace', refuse)
+    with pytest.raises(PermissionError):
+        save_network_store(network.subset(['A', 'B']), path)
+    assert load_network_store(path).fingerprint() == network.fingerprint()
+    assert os.listdir(tmp_path) == ['store']
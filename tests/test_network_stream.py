@@ -0,0 +1,32 @@
+# tests/test_network_stream.py
+import io
+import json
+from src.data_manager.network_store import load_network_store
+from src.data_manager.network_stream import ingest_json_network, iter_network_records
+from src.models.compact_network import CompactRoadNetwork
+
+
+def test_streamed_ingest_matches_nested_dict_conversion(nested_matrix, network):
+    streamed = ingest_json_network(io.BytesIO(json.dumps(nested_matrix).encode()))
+    assert streamed.ids == network.ids
+    assert streamed.fingerprint() == network.fingerprint()
+
+
+def test_destination_only_ids_are_indexed():
+    matrix = {'A': {'B': {'distance': 2.5, 'time': 3}}}
+    streamed = ingest_json_network(io.BytesIO(json.dumps(matrix).encode()))
+    assert streamed.fingerprint() == CompactRoadNetwork.from_nested_dict(matrix).fingerprint()
+    assert streamed.matrix['A']['B'] == {'distance': 2.5, 'time': 3}
+
+
+def test_ingest_into_store_reports_progress(nested_matrix, network, tmp_path):
+    fractions = []
+    ingest_json_network(io.BytesIO(json.dumps(nested_matrix).encode()), out_dir=str(tmp_path / 'store'),
+                        progress=lambda fraction, message: fractions.append(fraction))
+    assert load_network_store(str(tmp_path / 'store')).fingerprint() == network.fingerprint()
+    assert fractions[-1] == 1.0 and fractions == sorted(fractions)
+
+
+def test_records_default_missing_fields_to_zero():
+    records = list(iter_network_records(io.BytesIO(b'{"A": {"B": {"distance": 4}, "C": {"time": 9}}}')))
+    assert records == [('A', 'B', 4.0, 0), ('A', 'C', 0.0, 9)]
@@ -0,0 +1,47 @@
+# tests/test_scenario_sweep.py
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.optimizer import scenario_sweep
+from src.optimizer.scenario_sweep import ScenarioGrid, run_sweep
+from src.optimizer.settings import solver_params
+from src.optimizer.solution_cache import SolutionCache
+
+
+@pytest.fixture(scope='module')
+def sample():
+    (farms, markets, trucks, network), config = load_dataset('data')
+    return list(markets), list(trucks), network, config
+
+
+def _fake_solutions(monkeypatch, calls):
+    def fake_solve_routes(markets, trucks, network, mode=None, time_limit=None, max_workers=None):
+        calls.append(mode)
+        route = [trucks[0].home_depot_id] + [m.id for m in markets] + [trucks[0].home_depot_id]
+        return {'routes': {trucks[0].id: {'route': route, 'distance_m': 100, 'load_kg': 1}},
+                'total_distance': 1.0, 'total_load': 1}
+    monkeypatch.setattr(scenario_sweep, 'solve_routes', fake_solve_routes)
+
+
+def test_sweep_writes_the_keys_the_dashboard_reads(sample, monkeypatch, tmp_path):
+    markets, trucks, network, config = sample
+    calls = []
+    _fake_solutions(monkeypatch, calls)
+    cache = SolutionCache(str(tmp_path))
+    grid = ScenarioGrid(truck_subsets=[[t.id for t in trucks]], time_limits=[3], fuel_cost_per_liter=[1.5, 2.0])
+    results = run_sweep(grid, markets, trucks, network, config, max_workers=1, solution_cache=cache)
+    assert calls == ['single_depot']
+    assert len(results) == 2 and results['error'].isna().all()
+    assert cache.get(SolutionCache.make_key(markets, trucks, network, solver_params('single_depot', 3))) is not None
+
+    run_sweep(grid, markets, trucks, network, config, max_workers=1, solution_cache=cache)
+    assert calls == ['single_depot']
+
+
+def test_large_sweeps_use_the_same_mode_as_the_dashboard(sample, monkeypatch):
+    markets, trucks, network, config = sample
+    calls = []
+    _fake_solutions(monkeypatch, calls)
+    monkeypatch.setattr('src.optimizer.settings.DEFAULT_MAX_CLUSTER_SIZE', len(markets) - 1)
+    grid = ScenarioGrid(truck_subsets=[[t.id for t in trucks]], time_limits=[3], multi_depot=[False, True])
+    run_sweep(grid, markets, trucks, network, config, max_workers=1)
+    assert calls == ['clustered', 'multi_depot']
@@ -0,0 +1,64 @@
+# tests/test_schedule_generator.py
+import numpy as np
+from src.calculator.schedule_generator import build_schedule_frame
+from src.models.compact_network import CompactRoadNetwork
+
+
+def _solution(*routes, start_min=None):
+    output = {'routes': {}}
+    for i, route in enumerate(routes):
+        output['routes'][f'T{i}'] = {'route': route, 'distance_m': 0, 'load_kg': 0}
+        if start_min is not None:
+            output['routes'][f'T{i}']['start_min'] = start_min
+    return output
+
+
+def test_arrivals_accumulate_travel_and_service(network, make_market):
+    markets = [make_market('B', window='07:00-07:15'), make_market('C')]
+    frame = build_schedule_frame(_solution(['A', 'B', 'C', 'A']), network, markets, start_time='07:00',
+                                 service_minutes=20)
+    # A->B 12 min, serve 20, B->C 6 min, serve 20, C->A 24 min.
+    assert frame['arrival_min'].tolist() == [420, 432, 458, 502]
+    assert frame['departure_min'].tolist() == [420, 452, 478, 502]
+    assert frame['lateness_minutes'].tolist() == [0, 0, 0, 0]
+    assert frame.loc[1, 'slack_minutes'] == 3
+    assert frame['stop'].tolist() == [1, 2, 3, 4]
+
+
+def test_routes_are_timed_independently(network, make_market):
+    frame = build_schedule_frame(_solution(['A', 'B', 'A'], ['A', 'C', 'A']), network, [make_market('B')],
+                                 start_time='07:00', service_minutes=0)
+    assert frame.groupby('truck_id')['arrival_min'].apply(list).to_dict() == {'T0': [420, 432, 445],
+                                                                              'T1': [420, 445, 469]}
+
+
+def test_late_arrival_is_reported(network, make_market):
+    frame = build_schedule_frame(_solution(['A', 'C', 'A']), network, [make_market('C', window='06:00-07:10')],
+                                 start_time='07:00')
+    assert frame.loc[1, 'lateness_minutes'] == 15
+
+
+def test_waiting_matches_a_stop_by_stop_simulation(make_market):
+    rng = np.random.default_rng(3)
+    ids = ['D'] + [f'M{i}' for i in range(12)]
+    time = rng.integers(5, 60, size=(len(ids), len(ids)))
+    network = CompactRoadNetwork(ids, np.zeros(time.shape), time)
+    opens = rng.integers(7 * 60, 15 * 60, size=len(ids) - 1)
+    markets = [make_market(m, window=f'{o // 60:02d}:{o % 60:02d}-23:00') for m, o in zip(ids[1:], opens)]
+    routes = [['D'] + list(rng.permutation(ids[1:7])) + ['D'], ['D'] + list(rng.permutation(ids[7:])) + ['D']]
+    frame = build_schedule_frame(_solution(*routes, start_min=400), network, markets, service_minutes=15,
+                                 wait_for_windows=True)
+
+    window_open = dict(zip(ids[1:], opens))
+    expected = []
+    for route in routes:
+        clock = 400
+        expected.append(clock)
+        for prev, node in zip(route[:-1], route[1:]):
+            service = 15 if prev != 'D' else 0
+            clock = max(clock + service + time[ids.index(prev), ids.index(node)], window_open.get(node, 0))
+            expected.append(clock)
+    assert frame['arrival_min'].tolist() == expected
+    arrived = frame['arrival_min'].to_numpy()
+    assert (frame['wait_minutes'] >= 0).all()
+    assert (arrived[frame['window_start_min'] > 0] >= frame['window_start_min'][frame['window_start_min'] > 0]).all()
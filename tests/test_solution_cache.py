@@ -0,0 +1,63 @@
+# tests/test_solution_cache.py
+import json
+import os
+from src.optimizer import solution_cache
+from src.optimizer.solution_cache import SolutionCache
+
+SOLUTION = {'routes': {'T1': {'route': ['F', 'M1', 'F'], 'distance_m': 1200, 'load_kg': 10}},
+            'total_distance': 12.0, 'total_load': 10}
+
+
+def _age(cache, key, seconds_ago):
+    path = cache._path(key)
+    stamp = os.stat(path).st_mtime - seconds_ago
+    os.utime(path, (stamp, stamp))
+
+
+def test_round_trip_and_miss(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    cache.put('a', SOLUTION)
+    assert cache.get('a') == SOLUTION
+    assert cache.get('missing') is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = SolutionCache(str(tmp_path), max_entries=2)
+    cache.put('old', SOLUTION)
+    cache.put('used', SOLUTION)
+    _age(cache, 'old', 100)
+    _age(cache, 'used', 200)
+    assert cache.get('used') is not None  # a hit refreshes the entry
+    cache.put('new', SOLUTION)
+    assert sorted(os.listdir(tmp_path)) == ['new.json', 'used.json']
+
+
+def test_eviction_by_size(tmp_path):
+    size = len(json.dumps(SOLUTION))
+    cache = SolutionCache(str(tmp_path), max_bytes=2 * size)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, SOLUTION)
+        _age(cache, key, 100 - i)
+    cache.put('d', SOLUTION)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_get_survives_concurrent_eviction(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path))
+    cache.put('a', SOLUTION)
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(solution_cache.os, 'utime', evicted)
+    assert cache.get('a') == SOLUTION
+
+
+def test_eviction_tolerates_files_already_removed(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path), max_entries=1)
+    cache.put('a', SOLUTION)
+
+    def already_removed(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(solution_cache.os, 'remove', already_removed)
+    cache.put('b', SOLUTION)
+    assert cache.get('b') == SOLUTION
@@ -0,0 +1,48 @@
+# tests/test_spatial_index.py
+import numpy as np
+import pytest
+from src.models.spatial_index import SpatialIndex, haversine_km
+from src.optimizer.market_clustering import cluster_markets
+
+
+@pytest.fixture
+def locations():
+    rng = np.random.default_rng(0)
+    return [f'L{i}' for i in range(200)], rng.uniform(30, 48, 200), rng.uniform(-120, -75, 200)
+
+
+def test_knn_matches_brute_force_great_circle(locations):
+    ids, lat, lon = locations
+    index = SpatialIndex(ids, lat, lon)
+    positions, km = index.knn(lat[:5], lon[:5], k=4)
+    for q in range(5):
+        exact = haversine_km(lat[q], lon[q], lat, lon)
+        np.testing.assert_array_equal(positions[q], np.argsort(exact, kind='stable')[:4])
+        np.testing.assert_allclose(km[q], np.sort(exact)[:4], atol=1e-6)
+
+
+def test_neighbors_exclude_self(locations):
+    index = SpatialIndex(*locations)
+    neighbors = index.neighbors(3)
+    assert neighbors.shape == (200, 3)
+    assert not (neighbors == np.arange(200)[:, None]).any()
+
+
+def test_radius_and_nearest_depot(locations):
+    ids, lat, lon = locations
+    index = SpatialIndex(ids, lat, lon, depot_ids=['L10', 'L20'])
+    exact = haversine_km(lat[0], lon[0], lat, lon)
+    assert sorted(index.within_radius(lat[0], lon[0], 300).tolist()) == np.flatnonzero(exact <= 300).tolist()
+    depot, km = index.nearest_depot(lat[0], lon[0])
+    assert depot == ['L10' if exact[10] < exact[20] else 'L20']
+    assert km[0] == pytest.approx(min(exact[10], exact[20]))
+
+
+def test_clustering_reuses_a_shared_index(locations, make_market, make_truck):
+    ids, lat, lon = locations
+    markets = [make_market(i, latitude=a, longitude=o) for i, a, o in zip(ids, lat, lon)]
+    trucks = [make_truck(f'T{i}', capacity=4000) for i in range(8)]
+    shared = SpatialIndex(['DEPOT'] + ids, np.r_[40.0, lat], np.r_[-100.0, lon])
+    own = cluster_markets(markets, trucks, max_cluster_size=50)
+    reused = cluster_markets(markets, trucks, max_cluster_size=50, index=shared)
+    assert [[m.id for m in group] for group, _ in own] == [[m.id for m in group] for group, _ in reused]
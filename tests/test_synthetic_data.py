@@ -0,0 +1,27 @@
+# tests/test_synthetic_data.py
+import filecmp
+import os
+import numpy as np
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+
+
+def test_same_seed_gives_the_same_files(tmp_path):
+    first, second = str(tmp_path / 'a'), str(tmp_path / 'b')
+    generate_dataset(first, 3, 40, 4, seed=9, block_rows=7)
+    generate_dataset(second, 3, 40, 4, seed=9, block_rows=16)
+    for name in ('farms.csv', 'markets.csv', 'trucks.csv'):
+        assert filecmp.cmp(os.path.join(first, name), os.path.join(second, name), shallow=False)
+    (_, _, _, network_a), _ = load_dataset(first)
+    (_, _, _, network_b), _ = load_dataset(second)
+    assert network_a.fingerprint() == network_b.fingerprint()
+
+
+def test_generated_network_covers_every_location(tmp_path):
+    farms, markets, trucks = generate_dataset(str(tmp_path), 3, 25, 4, seed=1)
+    (_, _, _, network), _ = load_dataset(str(tmp_path))
+    assert network.ids == farms['id'].tolist() + markets['id'].tolist()
+    assert set(trucks['home_depot_id']) <= set(farms['id'])
+    off_diagonal = ~np.eye(len(network), dtype=bool)
+    assert (network.distance[off_diagonal] > 0).all()
+    assert (np.diag(network.distance) == 0).all()
@@ -0,0 +1,25 @@
+# tests/test_time_windows.py
+import numpy as np
+from src.models.time_windows import OPEN_WINDOW_END, format_minutes, parse_time_windows
+
+
+def test_windows_parse_to_minutes_of_day():
+    start, end = parse_time_windows(['08:00-12:30', ' 9:05 - 10:00 '])
+    assert start.tolist() == [480, 545]
+    assert end.tolist() == [750, 600]
+
+
+def test_window_past_midnight_ends_the_next_day():
+    start, end = parse_time_windows(['22:00-02:00'])
+    assert (start[0], end[0]) == (22 * 60, 26 * 60)
+
+
+def test_missing_or_invalid_windows_are_open():
+    start, end = parse_time_windows(['', None, 'noon-ish', np.nan])
+    assert start.tolist() == [0, 0, 0, 0]
+    assert end.tolist() == [OPEN_WINDOW_END] * 4
+
+
+def test_format_minutes_marks_later_days():
+    assert format_minutes(7 * 60 + 5) == '07:05'
+    assert format_minutes(24 * 60 + 90) == '01:30 (+1d)'
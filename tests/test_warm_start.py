@@ -0,0 +1,57 @@
+# tests/test_warm_start.py
+import pytest
+from src.data_manager.datasets import load_dataset
+from src.data_manager.synthetic_data import generate_dataset
+from src.models.data_models import Market
+from src.optimizer.vrp_solver import VRPSolver
+
+
+@pytest.fixture(scope='module')
+def instance(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('warm_start'))
+    generate_dataset(data_dir, num_farms=1, num_markets=20, num_trucks=5, seed=8)
+    (_, markets, trucks, network), _ = load_dataset(data_dir)
+    markets, trucks = [m.to_model() for m in markets], [t.to_model() for t in trucks]
+    prior = VRPSolver(markets[:-1], trucks, network).solve(time_limit=1)
+    assert not prior.get('error')
+    return markets, trucks, network, prior
+
+
+def test_prior_routes_are_repaired_for_the_new_scenario(instance):
+    markets, trucks, network, prior = instance
+    dropped_truck, kept = list(prior['routes'])[:2]
+    cancelled = prior['routes'][dropped_truck]['route'][1]
+    fleet = [t for t in trucks if t.id != dropped_truck]
+    added = markets[-1]
+    # One stop grows until its route is over capacity, so that route has to shed stops.
+    grown_id = prior['routes'][kept]['route'][1]
+    load = prior['routes'][kept]['load_kg']
+    grown = next(m for m in markets if m.id == grown_id)
+    capacity = {t.id: t.capacity_weight for t in trucks}
+    grown = Market(**{**grown.model_dump(), 'demand_weight': grown.demand_weight + capacity[kept] - load + 1})
+    scenario = [grown if m.id == grown_id else m for m in markets[:-1] if m.id != cancelled] + [added]
+    solver = VRPSolver(scenario, fleet, network)
+
+    routes = solver.warm_start_routes(prior)
+    assert len(routes) == len(fleet)
+    nodes = sorted(node for route in routes for node in route)
+    assert nodes == list(range(1, len(solver.locations)))
+    assert solver.location_map[added.id] in nodes and cancelled not in solver.location_map
+    demands, capacities = solver.data['demands'], solver.data['vehicle_capacities']
+    assert all(sum(demands[n] for n in route) <= cap for route, cap in zip(routes, capacities))
+    # The other trucks keep all their stops and may pick up the ones shed by the overloaded route.
+    for vehicle, truck in enumerate(fleet):
+        if truck.id in prior['routes'] and truck.id != kept:
+            assert set(prior['routes'][truck.id]['route'][1:-1]) <= {solver.locations[n] for n in routes[vehicle]}
+
+
+
+def test_repaired_routes_are_accepted_as_an_initial_assignment(instance):
+    markets, trucks, network, prior = instance
+    dropped_truck = next(iter(prior['routes']))
+    solver = VRPSolver(markets, [t for t in trucks if t.id != dropped_truck], network)
+    solution = solver.solve(time_limit=1, initial_solution=prior)
+    # ReadAssignmentFromRoutes returns None for routes it rejects, and the search then starts cold.
+    assert solver.search_stats['warm_started']
+    served = sorted(loc for data in solution['routes'].values() for loc in data['route'][1:-1])
+    assert served == sorted(m.id for m in markets)